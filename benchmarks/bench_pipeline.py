@@ -0,0 +1,328 @@
+"""
+End-to-end pipeline benchmark: per-stage latency and FPS for each execution mode.
+
+Runs the real gesture and face detectors over recorded clips (or synthetic
+frames) and writes the results as JSON, so runs on different commits can
+be compared.
+
+Run with: python -m benchmarks.bench_pipeline --source clip.mp4 --output results.json
+
+With --allocations, the memory allocated on top of the steady state while
+each frame is processed is traced as well (this slows every stage down, so
+compare timings from runs without it); --no-pool shows the same figure for
+the unpooled frame path.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+from src.config import EXECUTION_MODES
+from src.controllers.face_controller import FaceController
+from src.controllers.gesture_controller import GestureController
+from src.pipeline.detectors import DetectorOrchestrator
+from src.pipeline.processes import ProcessOrchestrator
+from src.pipeline.sources import open_source
+from src.pipeline.threaded import ThreadedPipeline
+from src.utils.actions import ActionDispatcher
+from src.utils.audio import AudioController, MockAudioBackend
+from src.utils.frames import FramePool, FrameScaler
+from src.utils.renderer import Overlay
+from src.utils.stats import LatencyTracker
+
+STAGES = ("capture", "convert", "gesture", "face", "handle", "draw", "display", "total")
+
+
+class TimedSource:
+    """Wraps a frame source, timing reads and stopping after a number of frames."""
+    def __init__(self, source, harness, max_frames=None):
+        self.source = source
+        self.harness = harness
+        self.remaining = max_frames
+
+    @property
+    def timestamp(self):
+        return self.source.timestamp
+
+    def isOpened(self):
+        return self.source.isOpened() and (self.remaining is None or self.remaining > 0)
+
+    def read(self, image=None):
+        if self.remaining is not None:
+            if self.remaining <= 0:
+                return False, None
+            self.remaining -= 1
+        with self.harness.timer("capture"):
+            return self.source.read(image=image)
+
+    def release(self):
+        self.source.release()
+
+
+class TimedScaler:
+    """Wraps a FrameScaler so colour conversion is timed."""
+    def __init__(self, frame_scaler, harness):
+        self.frame_scaler = frame_scaler
+        self.harness = harness
+
+    def clone(self):
+        return TimedScaler(self.frame_scaler.clone(), self.harness)
+
+    def to_rgb(self, frame, dst=None):
+        with self.harness.timer("convert"):
+            return self.frame_scaler.to_rgb(frame, dst=dst)
+
+
+class TimedDetector:
+    """Wraps a controller so inference and result handling are timed separately."""
+    def __init__(self, name, controller, harness):
+        self.name = name
+        self.controller = controller
+        self.harness = harness
+
+    def detect(self, rgb_frame, timestamp=None):
+        with self.harness.timer(self.name):
+            return self.controller.detect(rgb_frame, timestamp)
+
+    def unpack_result(self, packed):
+        return self.controller.unpack_result(packed)
+
+    def handle_result(self, frame, result, overlay=None, timestamp=None):
+        with self.harness.timer("handle"):
+            return self.controller.handle_result(frame, result, overlay, timestamp)
+
+
+class BenchmarkHarness:
+    """
+    Stands in for MediaController: owns the timed detectors, draws and optionally displays.
+    """
+    def __init__(self, detectors, frame_scaler, display=False, warmup=0, allocations=False):
+        self.tracker = LatencyTracker(window=None)
+        self.detectors = {name: TimedDetector(name, controller, self) for name, controller in detectors.items()}
+        self.control_modes = dict.fromkeys(self.detectors, True)
+        self.control_modes["voice"] = False
+        self.frame_scaler = TimedScaler(frame_scaler, self)
+        self.governor = None
+        self.voice_controller = None
+        self.display = display
+        self.warmup = warmup
+        self.allocations = allocations
+        self.frame_peaks = []  # Bytes allocated above the previous frame's level, per frame
+        self._traced = 0
+        self.frames = 0
+        self.start = time.perf_counter()
+
+    def timer(self, stage):
+        return self.tracker.timer(stage)
+
+    def is_active(self, name):
+        return self.control_modes.get(name, False)
+
+    def render(self, frame, overlay=None):
+        """Draw the overlay and optionally show the frame; called once per processed frame."""
+        with self.timer("draw"):
+            (overlay or Overlay()).render(frame)
+        if self.display:
+            with self.timer("display"):
+                cv2.imshow("Benchmark", frame)
+                cv2.waitKey(1)
+
+        if self.allocations and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            self.frame_peaks.append(peak - self._traced)
+            tracemalloc.reset_peak()
+            self._traced = current
+
+        self.frames += 1
+        if self.frames == self.warmup:
+            # Discard warm-up samples (model initialisation, first allocations)
+            self.tracker.clear()
+            self.frame_peaks.clear()
+            self.start = time.perf_counter()
+        return True
+
+    def results(self):
+        """Return FPS and per-stage latency summaries for the timed frames."""
+        frames = self.frames - min(self.frames, self.warmup)
+        seconds = time.perf_counter() - self.start
+        report = self.tracker.report()
+        results = {
+            "frames": frames,
+            "seconds": seconds,
+            "fps": frames / seconds if seconds > 0 else 0.0,
+            "stages": {stage: report[stage] for stage in STAGES if report.get(stage)}
+        }
+        if self.frame_peaks:
+            peaks = np.array(self.frame_peaks) / 1024
+            results["allocated_kb_per_frame"] = {
+                "p50": float(np.percentile(peaks, 50)),
+                "p95": float(np.percentile(peaks, 95)),
+                "max": float(peaks.max())
+            }
+        return results
+
+
+def run_loop(harness, source, orchestrator=None, pool=None):
+    """
+    The serial / parallel main loop, instrumented per stage.
+
+    With a pool, frames are read, mirrored and converted into pooled buffers
+    and one conversion is shared by every detector, as the application does.
+    Without one, every frame is copied, and in serial mode every detector
+    converts its own copy as well.
+    """
+    while source.isOpened():
+        start = time.perf_counter()
+        if pool is not None:
+            ret, buffer = pool.read(source)
+            frame = buffer.frame if ret else None
+        else:
+            ret, frame = source.read()
+            frame = cv2.flip(frame, 1) if ret else None
+        if not ret:
+            break
+        timestamp = source.timestamp
+        overlay = Overlay()
+
+        if pool is not None:
+            rgb_frame = pool.to_rgb(buffer)
+            if orchestrator is not None:
+                results = orchestrator.detect_rgb(rgb_frame, list(harness.detectors), timestamp)
+                record_worker_inference(harness, orchestrator)
+            else:
+                results = {name: detector.detect(rgb_frame, timestamp) for name, detector in harness.detectors.items()}
+        elif orchestrator is not None:
+            rgb_frame = harness.frame_scaler.to_rgb(frame)
+            results = orchestrator.detect_rgb(rgb_frame, list(harness.detectors), timestamp)
+            record_worker_inference(harness, orchestrator)
+        else:
+            results = {
+                name: detector.detect(harness.frame_scaler.to_rgb(frame), timestamp)
+                for name, detector in harness.detectors.items()
+            }
+
+        for name, detector in harness.detectors.items():
+            if name in results:
+                frame, _ = detector.handle_result(frame, results[name], overlay, timestamp)
+        harness.render(frame, overlay)
+        if pool is not None:
+            buffer.release()
+        harness.tracker.record("total", time.perf_counter() - start)
+
+
+def record_worker_inference(harness, orchestrator):
+    """Record inference timed inside worker processes, which TimedDetector cannot see."""
+    for name, seconds in getattr(orchestrator, "inference_seconds", {}).items():
+        harness.tracker.record(name, seconds)
+
+
+def bench_mode(mode, source_spec, detectors, frame_scaler, args):
+    """Run one execution mode over one source and return its results."""
+    harness = BenchmarkHarness(detectors, frame_scaler, display=args.display, warmup=args.warmup,
+                               allocations=args.allocations)
+    source = TimedSource(open_source(source_spec), harness, args.frames)
+    if args.allocations:
+        tracemalloc.start()
+    try:
+        if mode == "threaded":
+            # Capture-to-display latency ("total") is measured by the pipeline itself
+            ThreadedPipeline(harness, latency=harness.tracker).run(source)
+        else:
+            orchestrator = None
+            if mode == "parallel":
+                orchestrator = DetectorOrchestrator(harness.detectors)
+            elif mode == "process":
+                # Models load in the workers before timing starts
+                orchestrator = ProcessOrchestrator(harness.detectors)
+                orchestrator.wait_until_ready(list(harness.detectors))
+            pool = None if args.no_pool else FramePool(frame_scaler=harness.frame_scaler)
+            try:
+                run_loop(harness, source, orchestrator, pool)
+            finally:
+                if orchestrator is not None:
+                    orchestrator.shutdown()
+    finally:
+        source.release()
+        if args.allocations:
+            tracemalloc.stop()
+    return harness.results()
+
+
+def git_commit():
+    """Return the current commit hash, or None outside a git checkout."""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--source", nargs="+", default=["synthetic"],
+                        help="video files, image directories or 'synthetic'")
+    parser.add_argument("--modes", nargs="+", choices=EXECUTION_MODES, default=list(EXECUTION_MODES))
+    parser.add_argument("--frames", type=int, default=None, help="maximum frames per source and mode")
+    parser.add_argument("--warmup", type=int, default=10, help="frames excluded from the statistics")
+    parser.add_argument("--resolution", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"), default=None,
+                        help="inference resolution (default: full frame)")
+    parser.add_argument("--display", action="store_true", help="also time cv2.imshow")
+    parser.add_argument("--allocations", action="store_true", help="trace memory allocated per frame")
+    parser.add_argument("--no-pool", action="store_true",
+                        help="serial/parallel: copy every frame instead of using pooled buffers")
+    parser.add_argument("--output", default=None, help="write results as JSON to this file")
+    args = parser.parse_args(argv)
+
+    frame_scaler = FrameScaler(tuple(args.resolution) if args.resolution else None)
+    dispatcher = ActionDispatcher(AudioController(MockAudioBackend()), dry_run=True)
+    detectors = {
+        "gesture": GestureController(dispatcher.audio_controller, frame_scaler=frame_scaler, dispatcher=dispatcher),
+        "face": FaceController(frame_scaler=frame_scaler, dispatcher=dispatcher)
+    }
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "platform": platform.platform(),
+        "resolution": args.resolution,
+        "pooled": not args.no_pool,
+        "results": {}
+    }
+    for source_spec in args.source:
+        report["results"][source_spec] = {}
+        for mode in args.modes:
+            results = bench_mode(mode, source_spec, detectors, frame_scaler, args)
+            report["results"][source_spec][mode] = results
+            total = results["stages"].get("total", {})
+            print(f"{source_spec} [{mode}]: {results['fps']:.1f} FPS, "
+                  f"p50={total.get('p50_ms', 0):.1f}ms p95={total.get('p95_ms', 0):.1f}ms "
+                  f"p99={total.get('p99_ms', 0):.1f}ms", file=sys.stderr)
+            for stage, summary in results["stages"].items():
+                print(f"  {stage:8s} p50={summary['p50_ms']:.2f}ms p95={summary['p95_ms']:.2f}ms",
+                      file=sys.stderr)
+            if "allocated_kb_per_frame" in results:
+                allocated = results["allocated_kb_per_frame"]
+                print(f"  allocated per frame p50={allocated['p50']:.1f}KB max={allocated['max']:.1f}KB",
+                      file=sys.stderr)
+
+    dispatcher.stop()
+    if args.display:
+        cv2.destroyAllWindows()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Render-only benchmark: per-landmark drawing versus the batched Overlay renderer.
+
+Run with: python -m benchmarks.bench_render
+"""
+import argparse
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from src.utils.renderer import Overlay
+
+
+def make_hand(rng):
+    """Return 21 random landmarks shaped like MediaPipe's normalized landmarks."""
+    center = rng.uniform(0.3, 0.7, size=2)
+    points = center + rng.normal(scale=0.08, size=(21, 2))
+    return [SimpleNamespace(x=float(x), y=float(y), z=0.0) for x, y in points]
+
+
+def draw_legacy_skeleton(frame, hand_landmarks):
+    """The original per-landmark drawing code, kept as the baseline."""
+    height, width, _ = frame.shape
+    landmarks_list = []
+    for landmark in hand_landmarks:
+        x = int(landmark.x * width)
+        y = int(landmark.y * height)
+        cv2.circle(frame, (x, y), 5, (0, 255, 0), -1)
+        landmarks_list.append((x, y))
+
+    connections = [
+        (0, 1), (1, 2), (2, 3), (3, 4),
+        (0, 5), (5, 6), (6, 7), (7, 8),
+        (0, 9), (9, 10), (10, 11), (11, 12),
+        (0, 13), (13, 14), (14, 15), (15, 16),
+        (0, 17), (17, 18), (18, 19), (19, 20),
+        (5, 9), (9, 13), (13, 17)
+    ]
+    for start_idx, end_idx in connections:
+        if start_idx < len(landmarks_list) and end_idx < len(landmarks_list):
+            cv2.line(frame, landmarks_list[start_idx], landmarks_list[end_idx], (255, 255, 255), 2)
+
+
+def draw_legacy(frame, hands, status_text, box):
+    """Baseline: skeleton, face box and status text drawn call by call."""
+    height, width, _ = frame.shape
+    for hand_landmarks in hands:
+        draw_legacy_skeleton(frame, hand_landmarks)
+
+    if box is not None:
+        x, y = int(box[0] * width), int(box[1] * height)
+        w, h = int(box[2] * width), int(box[3] * height)
+        cv2.rectangle(frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+    for i, text in enumerate(status_text):
+        cv2.putText(frame, text, (10, height - 30 - i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+
+
+def draw_batched(frame, hands, status_text, box):
+    """Draw the same content through a single Overlay render pass."""
+    height = frame.shape[0]
+    overlay = Overlay()
+    for hand_landmarks in hands:
+        overlay.add_hand(hand_landmarks)
+    if box is not None:
+        overlay.add_box(*box)
+    for i, text in enumerate(status_text):
+        overlay.add_text(text, (10, height - 30 - i * 30), 0.7, (255, 255, 255))
+    overlay.render(frame)
+
+
+def bench(draw, frame, samples, status_text, box, repeats=5):
+    """Return the best mean time per frame over several runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for hands in samples:
+            draw(frame, hands, status_text, box)
+        best = min(best, (time.perf_counter() - start) / len(samples))
+    return 1000 * best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--hands", type=int, default=1)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    frame = np.zeros((args.height, args.width, 3), dtype=np.uint8)
+    samples = [[make_hand(rng) for _ in range(args.hands)] for _ in range(args.frames)]
+    status_text = ["Voice: OFF", "Face: ON", "Gesture: ON"]
+    box = (0.4, 0.2, 0.2, 0.3)
+
+    cases = [
+        ("skeleton only", [], None),
+        ("full overlay", status_text, box)
+    ]
+    for label, texts, face_box in cases:
+        # Warm up both paths once before timing
+        draw_legacy(frame, samples[0], texts, face_box)
+        draw_batched(frame, samples[0], texts, face_box)
+
+        legacy_ms = bench(draw_legacy, frame, samples, texts, face_box)
+        batched_ms = bench(draw_batched, frame, samples, texts, face_box)
+        print(f"{label}:")
+        print(f"  legacy:  {legacy_ms:.3f} ms/frame")
+        print(f"  batched: {batched_ms:.3f} ms/frame ({legacy_ms / batched_ms:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
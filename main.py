@@ -1,124 +1,434 @@
-"""
-Main module for the Gesture Media Controller application.
-"""
-import cv2
-import time
-
-from src.config import DEFAULT_CONTROL_MODES
-from src.utils.audio import AudioController
-from src.controllers.gesture_controller import GestureController
-from src.controllers.face_controller import FaceController
-from src.controllers.voice_controller import VoiceController
-
-
-class MediaController:
-    """
-    Main class that integrates all controller modules.
-    """
-    def __init__(self):
-        """Initialize the media controller with all sub-controllers."""
-        # Initialize audio controller first as it's needed by other controllers
-        self.audio_controller = AudioController()
-        
-        # Initialize the specific controllers
-        self.gesture_controller = GestureController(self.audio_controller)
-        self.face_controller = FaceController()
-        self.voice_controller = VoiceController(self.audio_controller)
-        
-        # Control mode settings
-        self.control_modes = DEFAULT_CONTROL_MODES.copy()
-        
-    def run(self):
-        """
-        Run the main application loop.
-        """
-        cap = cv2.VideoCapture(0)
-        if not cap.isOpened():
-            print("Error: Could not open video capture device.")
-            return
-            
-        print("Starting Media Controller...")
-        print("Press 'q' to quit, 'g' to toggle gesture control,")
-        print("'f' to toggle face control, 'v' to toggle voice control.")
-        
-        running = True
-        while running and cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                print("Error: Failed to capture frame.")
-                break
-                
-            # Flip frame horizontally for a mirror effect
-            frame = cv2.flip(frame, 1)
-            
-            # Process with active controllers
-            if self.control_modes["gesture"]:
-                frame, gesture = self.gesture_controller.process_frame(frame)
-            
-            if self.control_modes["face"]:
-                frame, _ = self.face_controller.process_frame(frame)
-                
-            if self.control_modes["voice"]:
-                self.voice_controller.listen_for_commands()
-                
-            # Display control mode status
-            self._display_status(frame)
-            
-            # Show the frame
-            cv2.imshow('Media Controller', frame)
-            
-            # Handle keyboard input
-            running = self._handle_keyboard_input()
-                
-        # Cleanup
-        cap.release()
-        cv2.destroyAllWindows()
-    
-    def _display_status(self, frame):
-        """Display the status of each control mode in the bottom-left corner of the frame."""
-        status_text = [
-            f"Gesture: {'ON' if self.control_modes['gesture'] else 'OFF'}",
-            f"Face: {'ON' if self.control_modes['face'] else 'OFF'}",
-            f"Voice: {'ON' if self.control_modes['voice'] else 'OFF'}"
-        ]
-        
-        # Get frame height
-        height, _, _ = frame.shape
-        
-        # Calculate starting y-position from bottom
-        # Leave a margin of 30 pixels from the bottom
-        base_y_position = height - 30
-        
-        # Draw text from bottom up (reverse order)
-        for i, text in enumerate(reversed(status_text)):
-            y_position = base_y_position - i*30
-            cv2.putText(frame, text, (10, y_position), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
-    
-    def _handle_keyboard_input(self):
-        """
-        Handle keyboard input for toggling modes and quitting.
-        
-        Returns:
-            bool: False if the application should quit, True otherwise
-        """
-        key = cv2.waitKey(1) & 0xFF
-        if key == ord('q'):
-            return False  # Signal to quit
-        elif key == ord('g'):
-            self.control_modes["gesture"] = not self.control_modes["gesture"]
-        elif key == ord('f'):
-            self.control_modes["face"] = not self.control_modes["face"]
-        elif key == ord('v'):
-            self.control_modes["voice"] = not self.control_modes["voice"]
-        return True
-
-
-def run():
-    """Entry point function for the application."""
-    controller = MediaController()
-    controller.run()
-
-
-if __name__ == "__main__":
-    run()
+"""
+Main module for the Gesture Media Controller application.
+"""
+import argparse
+import contextlib
+import multiprocessing
+import sys
+import cv2
+import time
+
+from src.config import (
+    DEFAULT_CONTROL_MODES, EXECUTION_MODE, EXECUTION_MODES, CAMERA_SOURCES, DETECTOR_SOURCES,
+    INFERENCE_RESOLUTION, AUTO_INFERENCE_RESOLUTION, METRICS_ENABLED, METRICS_OVERLAY
+)
+from src.utils.actions import ActionDispatcher
+from src.utils.frames import FramePool, FrameScaler, ResolutionGovernor
+from src.utils.lazy import LazyController
+from src.utils.metrics import metrics, FpsMeter, create_exporter
+from src.utils.profiles import ActionMapper
+from src.utils.renderer import Overlay
+from src.pipeline.detectors import DetectorOrchestrator
+from src.pipeline.headless import HeadlessRunner
+from src.pipeline.processes import ProcessOrchestrator
+from src.pipeline.sources import open_sources
+from src.pipeline.threaded import ThreadedPipeline
+
+
+class MediaController:
+    """
+    Main class that integrates all controller modules.
+    """
+    def __init__(self, mode=EXECUTION_MODE, source=None, headless=False, output=None,
+                 metrics_enabled=METRICS_ENABLED):
+        """
+        Initialize the media controller with all sub-controllers.
+
+        Args:
+            mode (str): Main loop execution mode, one of EXECUTION_MODES
+            source (str): Frame source for open_source(); replaces CAMERA_SOURCES if given
+            headless (bool): Process frames without a window and without performing actions
+            output: JSONL file, "-" or an open stream (such as stdout) for headless results
+            metrics_enabled (bool): Record hot-path metrics and export them
+        """
+        self.startup_times = {}
+        start = time.perf_counter()
+        if mode not in EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode: {mode}")
+        if headless and mode == "threaded":
+            raise ValueError("Headless runs process every frame and do not support threaded mode")
+        self.mode = mode
+        # Named frame sources, and the source each detector runs on
+        if source is not None:
+            self.sources = {"main": source}
+            self.detector_sources = {"gesture": "main", "face": "main"}
+        else:
+            self.sources = dict(CAMERA_SOURCES)
+            self.detector_sources = dict(DETECTOR_SOURCES)
+        unknown = set(self.detector_sources.values()) - set(self.sources)
+        if unknown:
+            raise ValueError(f"Detectors routed to unknown sources: {', '.join(sorted(unknown))}")
+        if len(self.sources) > 1 and mode != "threaded":
+            raise ValueError("Several camera sources need threaded mode")
+        self.headless = headless
+        self.output = output
+
+        # Instrumentation is process-wide; it stays a no-op unless enabled here
+        metrics.enabled = metrics_enabled
+        self.metrics_exporter = create_exporter(metrics) if metrics_enabled else None
+        self.fps_meter = FpsMeter()
+        self.show_metrics = METRICS_OVERLAY
+
+        # Controllers and their heavy imports (MediaPipe models, COM audio, the
+        # microphone) are built on first use; enabled ones warm up in the background
+        self.audio_controller = LazyController("audio", self._create_audio_controller)
+
+        # All controllers queue their key presses and volume changes here;
+        # headless runs only record them
+        self.dispatcher = ActionDispatcher(self.audio_controller, dry_run=headless)
+        # What each input does in the current player; 'p' switches profiles
+        self.action_map = ActionMapper()
+
+        # One scaler prepares detector input for every controller
+        self.governor = ResolutionGovernor(start=INFERENCE_RESOLUTION) if AUTO_INFERENCE_RESOLUTION else None
+        self.frame_scaler = FrameScaler(INFERENCE_RESOLUTION, self.governor)
+
+        # Stand-ins for the specific controllers, built when their mode is first enabled
+        self.gesture_controller = LazyController("gesture", self._create_gesture_controller)
+        self.face_controller = LazyController("face", self._create_face_controller)
+        self.voice_controller = LazyController("voice", self._create_voice_controller)
+        self.controllers = {
+            "gesture": self.gesture_controller,
+            "face": self.face_controller,
+            "voice": self.voice_controller
+        }
+
+        # Frame detectors keyed by the control mode that enables them; in process
+        # mode these only handle results and the models load in worker processes
+        self.detectors = {
+            "gesture": self.gesture_controller,
+            "face": self.face_controller
+        }
+        self.orchestrator = None
+
+        # Control mode settings
+        self.control_modes = DEFAULT_CONTROL_MODES.copy()
+        if headless:
+            # Headless machines have no microphone to listen on
+            self.control_modes["voice"] = False
+
+        self.audio_controller.warm_up()
+        for name, enabled in self.control_modes.items():
+            if enabled:
+                self.controllers[name].warm_up()
+        self.startup_times["init"] = time.perf_counter() - start
+        self._startup_start = start
+
+    def _create_audio_controller(self):
+        from src.utils.audio import AudioController
+        return AudioController()
+
+    def _create_gesture_controller(self):
+        from src.controllers.gesture_controller import GestureController
+        return GestureController(self.audio_controller, frame_scaler=self.frame_scaler,
+                                 dispatcher=self.dispatcher, face_provider=self._face_boxes,
+                                 inference=self.mode != "process", action_map=self.action_map)
+
+    def _create_face_controller(self):
+        from src.controllers.face_controller import FaceController
+        return FaceController(frame_scaler=self.frame_scaler, dispatcher=self.dispatcher,
+                              inference=self.mode != "process", action_map=self.action_map)
+
+    def _create_voice_controller(self):
+        from src.controllers.voice_controller import VoiceController
+        return VoiceController(self.audio_controller, dispatcher=self.dispatcher, action_map=self.action_map)
+
+    def _face_boxes(self):
+        """Latest face boxes for hand arbitration, or none while face mode is off."""
+        if self.control_modes["face"] and self.face_controller.ready:
+            return self.face_controller.faces
+        return []
+
+    def is_active(self, name):
+        """
+        Return True if a control mode is enabled and its controller is ready to use.
+
+        Enabling a mode whose controller is not built yet starts a background warm-up.
+        """
+        if not self.control_modes[name]:
+            return False
+        controller = self.controllers[name]
+        if not controller.ready:
+            controller.warm_up()
+        return controller.ready
+
+    def wait_until_ready(self):
+        """Block until the controllers of every enabled mode have finished loading."""
+        for name, enabled in self.control_modes.items():
+            if enabled:
+                try:
+                    self.controllers[name].get()
+                except RuntimeError as e:
+                    print(e)
+                    self.control_modes[name] = False
+        if self.mode == "process" and self.orchestrator is not None:
+            self.orchestrator.wait_until_ready(
+                [name for name in self.detectors if self.control_modes[name]]
+            )
+
+    def run(self):
+        """
+        Run the main application loop.
+        """
+        start = time.perf_counter()
+        sources = open_sources(self.sources)
+        closed = [name for name, source in sources.items() if not source.isOpened()]
+        if closed:
+            print(f"Error: Could not open video capture device ({', '.join(closed)}).")
+            for source in sources.values():
+                source.release()
+            return
+        cap = next(iter(sources.values()))
+        self.startup_times["camera"] = time.perf_counter() - start
+
+        if self.mode == "parallel":
+            self.orchestrator = DetectorOrchestrator(self.detectors)
+        elif self.mode == "process":
+            self.orchestrator = ProcessOrchestrator(self.detectors)
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.start()
+
+        if self.headless:
+            # Recorded sessions must give the same output however long models take to load
+            self.wait_until_ready()
+            HeadlessRunner(self, self.output).run(cap)
+        else:
+            print(f"Starting Media Controller ({self.mode} mode)...")
+            print("Press 'q' to quit, 'g' to toggle gesture control,")
+            print("'f' to toggle face control, 'v' to toggle voice control,")
+            print(f"'p' to switch the action profile (now {self.action_map.name}).")
+            if len(sources) > 1:
+                routes = ", ".join(f"{name} on {source}" for name, source in self.detector_sources.items())
+                print(f"Sources: {', '.join(sources)} ({routes})")
+
+            if self.mode == "threaded":
+                ThreadedPipeline(self).run(sources)
+            else:
+                self._run_serial(cap)
+
+        # Cleanup (controllers that were never built have nothing to release)
+        if self.voice_controller.ready:
+            self.voice_controller.stop()
+        self.dispatcher.stop()
+        if self.audio_controller.ready:
+            self.audio_controller.close()
+        self._print_action_latency()
+        if self.orchestrator is not None:
+            self.orchestrator.shutdown()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        for source in sources.values():
+            source.release()
+        if not self.headless:
+            cv2.destroyAllWindows()
+
+    def _run_serial(self, cap):
+        """
+        Capture, process and display frames one after another.
+
+        In parallel mode the detectors still run once per captured frame,
+        but concurrently on a shared RGB frame instead of back to back; in
+        process mode they run in worker processes that read the frame from
+        shared memory.
+        """
+        pool = FramePool(frame_scaler=self.frame_scaler)
+        running = True
+        while running and cap.isOpened():
+            # Read and mirror into a pooled buffer
+            with metrics.timer("capture_seconds"):
+                ret, buffer = pool.read(cap)
+            if not ret:
+                print("Error: Failed to capture frame.")
+                break
+            frame = buffer.frame
+
+            # Process with active controllers, collecting their drawings; the
+            # RGB conversion is done once into the pooled buffer and shared
+            overlay = Overlay()
+            start = time.perf_counter()
+            names = self.active_detectors()
+            rgb_frame = pool.to_rgb(buffer) if names else None
+            if self.orchestrator is not None:
+                results = self.orchestrator.detect_rgb(rgb_frame, names) if names else {}
+                frame, _ = self.orchestrator.apply(frame, results, overlay)
+            else:
+                if "gesture" in names:
+                    frame, gesture = self.gesture_controller.process_frame(frame, overlay, rgb_frame=rgb_frame)
+
+                if "face" in names:
+                    frame, _ = self.face_controller.process_frame(frame, overlay, rgb_frame=rgb_frame)
+
+            if self.governor is not None and names:
+                self.governor.update(time.perf_counter() - start)
+
+            if self.is_active("voice"):
+                self.voice_controller.listen_for_commands()
+
+            running = self.render(frame, overlay)
+            buffer.release()
+
+    def _print_action_latency(self):
+        """Print how long actions waited between being queued and executed."""
+        for source, summary in self.dispatcher.latency_report().items():
+            if summary:
+                print(f"Action latency ({source}): n={summary['count']} "
+                      f"p50={summary['p50_ms']:.1f}ms p95={summary['p95_ms']:.1f}ms")
+
+    def active_detectors(self):
+        """Return the names of the detectors whose control mode is enabled and ready."""
+        return [name for name in self.detectors if self.is_active(name)]
+
+    def _print_startup_report(self):
+        """Print where startup time went; controllers still loading report when ready."""
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.startup_times.items())
+        print(f"Startup: {stages}")
+        for name, controller in [("audio", self.audio_controller)] + list(self.controllers.items()):
+            if controller.ready:
+                print(f"  {name}: loaded in {controller.load_seconds:.2f}s")
+            elif controller.loading:
+                print(f"  {name}: still loading in the background")
+
+    def render(self, frame, overlay=None):
+        """
+        Draw all overlays in one pass, show the frame and handle keyboard input.
+
+        Args:
+            frame: Processed frame to display
+            overlay: Overlay collected from the detectors this frame
+
+        Returns:
+            bool: False if the application should quit, True otherwise
+        """
+        overlay = overlay if overlay is not None else Overlay()
+
+        # Display control mode status
+        self._display_status(frame, overlay)
+        if metrics.enabled and self.show_metrics:
+            self._display_metrics(frame, overlay)
+        with metrics.timer("draw_seconds"):
+            overlay.render(frame)
+
+        # Show the frame
+        with metrics.timer("display_seconds"):
+            cv2.imshow('Media Controller', frame)
+        metrics.inc("frames_total")
+        metrics.set("fps", round(self.fps_meter.tick(), 2))
+        if "first_frame" not in self.startup_times:
+            self.startup_times["first_frame"] = time.perf_counter() - self._startup_start
+            self._print_startup_report()
+
+        # Handle keyboard input
+        return self._handle_keyboard_input()
+
+    def show_source(self, name, frame, overlay):
+        """Draw the overlay of a source other than the main one and show it in its own window."""
+        overlay.render(frame)
+        cv2.imshow(f"Media Controller ({name})", frame)
+
+    def _display_status(self, frame, overlay):
+        """Add the status of each control mode in the bottom-left corner of the frame to the overlay."""
+        status_text = [
+            f"Profile: {self.action_map.name}",
+            f"Gesture: {self._mode_status('gesture')}",
+            f"Face: {self._mode_status('face')}",
+            f"Voice: {self._mode_status('voice')}"
+        ]
+
+        # Get frame height
+        height, _, _ = frame.shape
+
+        # Calculate starting y-position from bottom
+        # Leave a margin of 30 pixels from the bottom
+        base_y_position = height - 30
+
+        # Draw text from bottom up (reverse order)
+        for i, text in enumerate(reversed(status_text)):
+            y_position = base_y_position - i*30
+            overlay.add_text(text, (10, y_position), 0.7, (255, 255, 255))
+
+    def _mode_status(self, name):
+        """Return ON, OFF, LOADING or ERROR for a control mode."""
+        controller = self.controllers[name]
+        if not self.control_modes[name]:
+            return "OFF"
+        if controller.failed:
+            return "ERROR"
+        return "ON" if controller.ready else "LOADING"
+
+    def _display_metrics(self, frame, overlay):
+        """Add the current FPS and median stage times in the top-right corner of the frame to the overlay."""
+        lines = [f"FPS: {self.fps_meter.fps:.1f}"]
+        for name in self.active_detectors():
+            summary = metrics.summary("inference_seconds", detector=name)
+            if summary:
+                lines.append(f"{name}: {summary['p50_ms']:.1f} ms")
+
+        x_position = frame.shape[1] - 180
+        for i, text in enumerate(lines):
+            overlay.add_text(text, (x_position, 30 + i * 25), 0.6, (0, 255, 255))
+
+    def _handle_keyboard_input(self):
+        """
+        Handle keyboard input for toggling modes and quitting.
+
+        Returns:
+            bool: False if the application should quit, True otherwise
+        """
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            return False  # Signal to quit
+        elif key == ord('g'):
+            self._toggle_mode("gesture")
+        elif key == ord('f'):
+            self._toggle_mode("face")
+        elif key == ord('m'):
+            self.show_metrics = not self.show_metrics
+        elif key == ord('p'):
+            print(f"Action profile: {self.action_map.next()}")
+        elif key == ord('v'):
+            self._toggle_mode("voice")
+            if not self.control_modes["voice"] and self.voice_controller.ready:
+                self.voice_controller.stop()
+        return True
+
+    def _toggle_mode(self, name):
+        """Flip a control mode; enabling one starts loading its controller in the background."""
+        self.control_modes[name] = not self.control_modes[name]
+        if self.control_modes[name]:
+            self.controllers[name].warm_up()
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Gesture Media Controller")
+    parser.add_argument("--mode", choices=EXECUTION_MODES, default=EXECUTION_MODE,
+                        help="main loop execution mode")
+    parser.add_argument("--source", default=None,
+                        help="camera index, video file, image directory or 'synthetic' (default: CAMERA_SOURCES)")
+    parser.add_argument("--headless", action="store_true",
+                        help="process frames without a window; actions are logged, not performed")
+    parser.add_argument("--output", default=None,
+                        help="write per-frame results as JSONL to this file ('-' for stdout) in headless mode")
+    parser.add_argument("--metrics", action="store_true", default=METRICS_ENABLED,
+                        help="record hot-path metrics and export them in Prometheus format")
+    return parser.parse_args(argv)
+
+
+def run(argv=None):
+    """Entry point function for the application."""
+    args = parse_args(argv)
+    output, logs = args.output, contextlib.nullcontext()
+    if args.headless and args.output == "-":
+        # stdout carries only the JSONL records, so status messages (printed by any thread) go to stderr
+        output, logs = sys.stdout, contextlib.redirect_stdout(sys.stderr)
+    with logs:
+        controller = MediaController(mode=args.mode, source=args.source,
+                                     headless=args.headless, output=output,
+                                     metrics_enabled=args.metrics)
+        controller.run()
+
+
+if __name__ == "__main__":
+    # Lets detector worker processes start in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
+    run()
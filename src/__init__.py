@@ -1,5 +1,5 @@
-"""
-Gesture Media Controller - A media player controller with gesture, face, and voice controls.
-"""
-
-__version__ = '0.1.0'
+"""
+Gesture Media Controller - A media player controller with gesture, face, and voice controls.
+"""
+
+__version__ = '0.1.0'
@@ -1,19 +1,325 @@
-"""
-Configuration settings and constants for the gesture media controller.
-"""
-import os
-
-# Constants
-GESTURE_THRESHOLD = 0.05
-VOLUME_SENSITIVITY = 0.1
-GESTURE_COOLDOWN = 0.7  # Slightly faster cooldown for regular gestures
-
-# Path to the MediaPipe gesture recognizer model
-MODEL_PATH =  "models/gesture_recognizer.task"
-
-# Default control mode settings
-DEFAULT_CONTROL_MODES = {
-    "voice": False,
-    "gesture": True,
-    "face": True
-}
+"""
+Configuration settings and constants for the gesture media controller.
+"""
+import os
+
+# Constants
+GESTURE_THRESHOLD = 0.05
+GESTURE_COOLDOWN = 0.7  # Slightly faster cooldown for regular gestures
+
+# Path to the MediaPipe gesture recognizer model used before the model cache;
+# an existing file here is copied into the cache instead of downloading again,
+# provided GESTURE_MODEL_SHA256 is pinned and the file matches it
+MODEL_PATH =  "models/gesture_recognizer.task"
+
+# Model cache: models are downloaded once into a per-user cache directory
+# (None picks the platform default, e.g. ~/.cache/gesture-media-controller/models)
+# and verified against their SHA-256 on every start. With no pinned hash the
+# hash of the first download is recorded and trusted from then on.
+MODEL_CACHE_DIR = os.environ.get("GESTURE_MODEL_CACHE") or None
+GESTURE_MODEL_URL = "https://storage.googleapis.com/mediapipe-models/gesture_recognizer/gesture_recognizer/float16/1/gesture_recognizer.task"
+GESTURE_MODEL_SHA256 = None  # Pin to the published file's hex digest to verify every copy
+# How the recognizer loads the model: "path" lets MediaPipe map the file itself,
+# "buffer" reads it into memory here and passes the bytes (for paths MediaPipe cannot open,
+# e.g. non-ASCII user directories on Windows)
+MODEL_LOAD_MODE = "path"
+MODEL_WARM_UP = True  # Run one inference on a blank image at startup to initialise the graph
+
+# MediaPipe running mode for the gesture recognizer:
+#   "image"       - full hand detection on every frame, blocking
+#   "video"       - tracks hands across frames using monotonic timestamps, blocking
+#   "live_stream" - tracks hands across frames; results arrive asynchronously and
+#                   the newest one is reused so the loop never waits on inference
+GESTURE_RUNNING_MODE = "image"
+
+# Voice recognition: ambient noise is calibrated when the listener starts and
+# then refreshed on this schedule instead of before every phrase
+VOICE_CALIBRATION_DURATION = 0.5  # Seconds of audio sampled per calibration
+VOICE_CALIBRATION_INTERVAL = 60.0  # Seconds between calibrations
+VOICE_LISTEN_TIMEOUT = 1.0  # Seconds to wait for speech before checking for shutdown
+VOICE_PHRASE_TIME_LIMIT = 3.0  # Maximum length of a single phrase
+VOICE_AUDIO_QUEUE_SIZE = 4  # Phrases waiting for recognition before the oldest is dropped
+VOICE_RESTART_DELAY = 5.0  # Seconds before restarting a listener that stopped on an error
+
+# Speech recognition backend: "google" (online), "sphinx" or "vosk" (offline,
+# limited to the command grammar). Offline backends fall back to Google if
+# their engine is not installed.
+VOICE_BACKEND = "google"
+SPHINX_KEYWORD_SENSITIVITY = 0.8  # 0.0-1.0, higher finds more keywords but more false hits
+VOSK_MODEL_PATH = "models/vosk"  # Directory of an unpacked Vosk model
+VOSK_SAMPLE_RATE = 16000
+
+# Resolution frames are downscaled to before detection, as (width, height),
+# or None to run detectors on the full camera frame. Overlays are always
+# drawn on the full-resolution frame.
+INFERENCE_RESOLUTION = None
+# Pick the largest resolution from the ladder that still meets TARGET_FPS
+AUTO_INFERENCE_RESOLUTION = False
+INFERENCE_RESOLUTION_LADDER = [(1280, 720), (960, 540), (640, 360), (480, 270), (320, 180)]
+TARGET_FPS = 30
+
+# Face presence detection rate. Presence only decides pause/resume, so it
+# runs below the camera rate: FACE_DETECTION_HZ normally, FACE_DETECTION_BOOST_HZ
+# for FACE_BOOST_DURATION seconds after presence changes, and backing off
+# towards FACE_DETECTION_MIN_HZ once presence has been stable for
+# FACE_STABLE_AFTER seconds. Set FACE_DETECTION_HZ to None to run every frame.
+FACE_DETECTION_HZ = 5
+FACE_DETECTION_MIN_HZ = 1
+FACE_DETECTION_BOOST_HZ = 15
+FACE_STABLE_AFTER = 5.0
+FACE_BOOST_DURATION = 1.0
+
+# Face control pauses playback when nobody is watching:
+#   "attention" - a face only counts while it looks at the screen, judged from
+#                 head pose estimated from six FaceMesh landmarks
+#   "presence"  - any detected face counts
+FACE_MODE = "attention"
+FACE_MAX_FACES = 2  # Faces tracked in attention mode
+FACE_MAX_YAW = 30.0  # Degrees the head may turn left or right and still count as watching
+FACE_MAX_PITCH = 25.0  # Degrees the head may tilt up or down
+FACE_ANGLE_HYSTERESIS = 10.0  # Extra degrees allowed while already watching
+# A change has to hold this long before playback is paused or resumed
+FACE_PAUSE_AFTER = 1.5
+FACE_RESUME_AFTER = 0.5
+
+# ROI tracking for gesture recognition ("image" running mode only): once a
+# hand is found, the next frame is recognized on a padded crop around it and
+# the full frame is searched again when the hand is lost or near the crop edge
+GESTURE_ROI_TRACKING = False
+ROI_PADDING = 0.6  # Padding on each side, as a fraction of the hand's size
+ROI_MIN_SIZE = 0.25  # Minimum crop side, as a fraction of the frame's shorter side
+ROI_MIN_CONFIDENCE = 0.6  # Hand confidence below which the crop is abandoned
+ROI_EDGE_MARGIN = 0.03  # Landmarks this close to the crop edge mean the hand is leaving
+
+# Action dispatch: key presses and volume changes run on a worker thread
+ACTION_QUEUE_SIZE = 32  # Pending actions before the oldest is dropped
+ACTION_KEY_PAUSE = 0.0  # Seconds to wait after a key action (replaces pyautogui.PAUSE)
+ACTION_HISTORY_SIZE = 256  # Executed actions kept for latency inspection
+
+# System volume backend: "auto" picks pycaw on Windows and pactl (PulseAudio /
+# PipeWire) or amixer (ALSA) on Linux; "mock" keeps the volume in memory
+AUDIO_BACKEND = "auto"
+AUDIO_CACHE_TTL = 2.0  # Seconds a cached volume stays valid on backends without change events
+PULSE_SINK = "@DEFAULT_SINK@"
+ALSA_CONTROL = "Master"
+
+# Gesture volume control:
+#   "discrete"   - Pointing_Up / Closed_Fist press the player's volume keys
+#   "continuous" - while the hand holds the pinch pose (thumb and index out,
+#                  the other fingers folded), the thumb-index distance sets
+#                  the system volume directly
+GESTURE_VOLUME_MODE = "discrete"
+VOLUME_PINCH_GESTURES = ("None",)  # The pinch pose is not one of the canned gestures
+PINCH_HOLD_TIME = 0.4  # Seconds the pinch pose must be held before it controls the volume
+# Gestures bound to the player's volume keys, ignored in continuous mode
+VOLUME_KEY_GESTURES = ("Pointing_Up", "Closed_Fist")
+# Thumb-index distance relative to palm size (wrist to middle knuckle) mapped to 0% and 100%
+PINCH_MIN_RATIO = 0.25
+PINCH_MAX_RATIO = 1.4
+# One-Euro filter applied to the target volume
+VOLUME_FILTER_MIN_CUTOFF = 1.0
+VOLUME_FILTER_BETA = 0.5
+VOLUME_UPDATE_INTERVAL = 0.05  # Minimum seconds between volume updates
+VOLUME_DEADBAND = 0.01  # Ignore changes smaller than this
+
+# Temporal gesture filtering: per-frame scores are smoothed before any action fires
+GESTURE_CATEGORIES = ("None", "Closed_Fist", "Open_Palm", "Pointing_Up",
+                      "Thumb_Down", "Thumb_Up", "Victory", "ILoveYou")
+GESTURE_FILTER_METHOD = "ewma"  # "ewma" (time-weighted average) or "majority" (vote over the window)
+GESTURE_FILTER_WINDOW = 15  # Frames kept for majority voting
+GESTURE_FILTER_TIME_CONSTANT = 0.1  # EWMA time constant in seconds
+# Hysteresis: a gesture activates at the enter threshold and releases below the exit threshold
+GESTURE_ENTER_THRESHOLD = 0.6
+GESTURE_EXIT_THRESHOLD = 0.4
+# Seconds between repeated firings; gestures not listed use GESTURE_COOLDOWN
+GESTURE_COOLDOWNS = {
+    "Open_Palm": 1.5,
+    "ILoveYou": 1.5,
+}
+# Toggles fire once per activation: the hand has to release the gesture to fire again
+GESTURE_ONE_SHOT = ("Open_Palm", "ILoveYou")
+
+# Motion gestures: swipes detected from the hand's recent trajectory
+GESTURE_SWIPES = True
+TRAJECTORY_LENGTH = 32  # Frames of landmark history kept
+TRAJECTORY_LANDMARKS = (0, 4, 8, 12, 16, 20)  # Wrist and fingertips
+SWIPE_WINDOW = 0.3  # Seconds a swipe must complete within
+SWIPE_MIN_DISTANCE = 0.25  # Minimum travel as a fraction of the frame
+SWIPE_MIN_SPEED = 1.0  # Minimum average speed in frame widths/heights per second
+SWIPE_MIN_CONSISTENCY = 0.7  # Fraction of frame-to-frame steps moving in the swipe direction
+SWIPE_MAX_OFF_AXIS = 0.5  # Maximum sideways travel relative to the main direction
+SWIPE_COOLDOWN = 0.5  # Seconds after a swipe before the next one
+
+# Multiple hands: every hand gets a tracking ID, and one of them controls playback
+GESTURE_NUM_HANDS = 2  # Hands recognized per frame (hand tracking crops only work with 1)
+# Which hand controls:
+#   "largest"      - the hand nearest the camera (biggest on screen)
+#   "closest_face" - the hand nearest the main viewer's face (needs face mode on;
+#                    falls back to "largest" when no face is visible)
+#   "designated"   - the hand that took control keeps it until it leaves the frame
+HAND_ARBITRATION = "largest"
+HAND_TRACK_MAX_DISTANCE = 0.2  # Furthest a hand's centre may move between frames and keep its ID
+HAND_TRACK_TIMEOUT = 0.5  # Seconds a tracking ID survives without its hand
+HAND_SWITCH_MARGIN = 1.25  # Another hand must score this much better to take control
+
+# Action profiles: what each gesture, voice phrase and face event does, per media
+# player. An action is (kind, args, label) with kind "press" (a key), "hotkey"
+# (a tuple of keys) or "volume" (a relative system volume change). Voice phrases
+# match as whole words anywhere in what was said; face events are "away" (nobody
+# watching) and "back". ACTION_PROFILE is active at start; 'p' cycles through them.
+ACTION_PROFILE = "vlc"
+_VOICE_VOLUME = {
+    "volume up": ("volume", 0.2, "Volume Up"),
+    "volume down": ("volume", -0.2, "Volume Down"),
+}
+ACTION_PROFILES = {
+    "vlc": {
+        "gestures": {
+            "Open_Palm": ("press", "space", "Toggle Play/Pause"),
+            "ILoveYou": ("press", "m", "Toggle Mute"),
+            "Thumb_Up": ("press", "right", "Seek Forward"),
+            "Thumb_Down": ("press", "left", "Seek Backward"),
+            "Swipe_Right": ("press", "right", "Seek Forward"),
+            "Swipe_Left": ("press", "left", "Seek Backward"),
+            "Swipe_Up": ("press", "n", "Next Track"),
+            "Swipe_Down": ("press", "p", "Previous Track"),
+            "Victory": ("hotkey", ("shift", "s"), "Screenshot"),
+            "Pointing_Up": ("press", "up", "Volume Up"),
+            "Closed_Fist": ("press", "down", "Volume Down"),
+        },
+        "voice": {
+            "play": ("press", "space", "Toggle Play/Pause"),
+            "pause": ("press", "space", "Toggle Play/Pause"),
+            "skip": ("press", "right", "Seek Forward"),
+            "forward": ("press", "right", "Seek Forward"),
+            "back": ("press", "left", "Seek Backward"),
+            "previous": ("press", "left", "Seek Backward"),
+            "mute": ("press", "m", "Toggle Mute"),
+            **_VOICE_VOLUME,
+        },
+        "face": {
+            "away": ("press", "space", "Pause"),
+            "back": ("press", "space", "Resume"),
+        },
+    },
+    "mpv": {
+        "gestures": {
+            "Open_Palm": ("press", "space", "Toggle Play/Pause"),
+            "ILoveYou": ("press", "m", "Toggle Mute"),
+            "Thumb_Up": ("press", "right", "Seek Forward"),
+            "Thumb_Down": ("press", "left", "Seek Backward"),
+            "Swipe_Right": ("press", "right", "Seek Forward"),
+            "Swipe_Left": ("press", "left", "Seek Backward"),
+            "Swipe_Up": ("press", ">", "Next Track"),
+            "Swipe_Down": ("press", "<", "Previous Track"),
+            "Victory": ("press", "s", "Screenshot"),
+            "Pointing_Up": ("press", "0", "Volume Up"),
+            "Closed_Fist": ("press", "9", "Volume Down"),
+        },
+        "voice": {
+            "play": ("press", "space", "Toggle Play/Pause"),
+            "pause": ("press", "space", "Toggle Play/Pause"),
+            "skip": ("press", "right", "Seek Forward"),
+            "forward": ("press", "right", "Seek Forward"),
+            "back": ("press", "left", "Seek Backward"),
+            "previous": ("press", "left", "Seek Backward"),
+            "next track": ("press", ">", "Next Track"),
+            "previous track": ("press", "<", "Previous Track"),
+            "mute": ("press", "m", "Toggle Mute"),
+            **_VOICE_VOLUME,
+        },
+        "face": {
+            "away": ("press", "space", "Pause"),
+            "back": ("press", "space", "Resume"),
+        },
+    },
+    # YouTube-style keyboard shortcuts, which most web players follow
+    "browser": {
+        "gestures": {
+            "Open_Palm": ("press", "k", "Toggle Play/Pause"),
+            "ILoveYou": ("press", "m", "Toggle Mute"),
+            "Thumb_Up": ("press", "l", "Seek Forward"),
+            "Thumb_Down": ("press", "j", "Seek Backward"),
+            "Swipe_Right": ("press", "l", "Seek Forward"),
+            "Swipe_Left": ("press", "j", "Seek Backward"),
+            "Swipe_Up": ("hotkey", ("shift", "n"), "Next Video"),
+            "Swipe_Down": ("hotkey", ("shift", "p"), "Previous Video"),
+            "Victory": ("press", "f", "Toggle Fullscreen"),
+            "Pointing_Up": ("press", "up", "Volume Up"),
+            "Closed_Fist": ("press", "down", "Volume Down"),
+        },
+        "voice": {
+            "play": ("press", "k", "Toggle Play/Pause"),
+            "pause": ("press", "k", "Toggle Play/Pause"),
+            "skip": ("press", "l", "Seek Forward"),
+            "forward": ("press", "l", "Seek Forward"),
+            "back": ("press", "j", "Seek Backward"),
+            "previous": ("press", "j", "Seek Backward"),
+            "next video": ("hotkey", ("shift", "n"), "Next Video"),
+            "full screen": ("press", "f", "Toggle Fullscreen"),
+            "mute": ("press", "m", "Toggle Mute"),
+            **_VOICE_VOLUME,
+        },
+        "face": {
+            "away": ("press", "k", "Pause"),
+            "back": ("press", "k", "Resume"),
+        },
+    },
+}
+
+# Default control mode settings
+DEFAULT_CONTROL_MODES = {
+    "voice": False,
+    "gesture": True,
+    "face": True
+}
+
+# Execution mode for the main loop:
+#   "serial"   - capture, detection and display run one after another
+#   "parallel" - like serial, but the detectors share one RGB frame and run concurrently
+#   "threaded" - capture, each detector and display run as separate stages
+#   "process"  - like parallel, but each detector runs in its own worker process
+EXECUTION_MODE = "serial"
+EXECUTION_MODES = ("serial", "parallel", "threaded", "process")
+
+# Detector worker processes ("process" mode). Frames reach the workers through
+# shared memory slots written round robin; only small results are sent back.
+PROCESS_RING_SLOTS = 3  # Frames in flight at once; one more than the number of process detectors
+PROCESS_RESULT_TIMEOUT = 1.0  # Seconds to wait for a worker's result before skipping it
+PROCESS_START_METHOD = "spawn"  # MediaPipe graphs and threads do not survive fork()
+
+# Frames buffered between pipeline stages before the oldest is dropped
+FRAME_QUEUE_SIZE = 1
+
+# Frame buffers preallocated for capture and detector input; the pool grows if
+# stages hold more frames at once (e.g. with larger queues)
+FRAME_POOL_SIZE = 4
+
+# Frame sources (see --source): the webcam used by default, and the frame rate
+# assumed for image directories and synthetic frames
+CAMERA_INDEX = 0
+REPLAY_FPS = 30
+SYNTHETIC_SIZE = (640, 480)
+SYNTHETIC_FRAMES = 300
+
+# Several cameras: the sources to open, by name (open_source() specs, None for
+# the webcam at CAMERA_INDEX), and the source each detector runs on, e.g.
+#   CAMERA_SOURCES = {"hands": 0, "room": 1}
+#   DETECTOR_SOURCES = {"gesture": "hands", "face": "room"}
+# The first source is shown in the main window and the others in windows of
+# their own. More than one source needs the "threaded" execution mode; --source
+# replaces them all with a single source.
+CAMERA_SOURCES = {"main": None}
+DETECTOR_SOURCES = {"gesture": "main", "face": "main"}
+
+# Instrumentation (see --metrics): timers and counters on the hot path, exported in
+# Prometheus text format. Disabled instrumentation costs a flag check per call.
+METRICS_ENABLED = False
+METRICS_PREFIX = "media_controller_"
+METRICS_WINDOW = 500  # Recent samples per timer used for quantiles
+METRICS_EXPORT = "http"  # "http" (serve /metrics), "file" (write METRICS_FILE) or None
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9464
+METRICS_FILE = "metrics.prom"
+METRICS_EXPORT_INTERVAL = 5.0  # Seconds between file writes
+METRICS_OVERLAY = True  # Show FPS and stage times on the frame while metrics are enabled
@@ -1,3 +1,3 @@
-"""
-Controller modules for handling different input methods.
-"""
+"""
+Controller modules for handling different input methods.
+"""
@@ -1,70 +1,231 @@
-"""
-Face detection for automatic media playback control.
-"""
-import cv2
-import mediapipe as mp
-import pyautogui
-
-
-class FaceController:
-    """
-    Controls media player based on face detection.
-    """
-    def __init__(self):
-        """Initialize the face controller."""
-        self.mp_face = mp.solutions.face_detection
-        self.face_detector = self.mp_face.FaceDetection(min_detection_confidence=0.5)
-        self.prev_face_state = True  # Assume face is initially detected
-        
-    def process_frame(self, frame):
-        """
-        Process a video frame to detect faces.
-        
-        Args:
-            frame: OpenCV image frame
-            
-        Returns:
-            processed_frame: Frame with face detection drawn
-            face_state_changed: True if face state changed, False otherwise
-        """
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        face_results = self.face_detector.process(frame_rgb)
-        
-        face_detected = face_results.detections is not None and len(face_results.detections) > 0
-        face_state_changed = self._handle_face_state(face_detected)
-        
-        # Draw face detection box if face detected
-        if face_detected:
-            frame = self._draw_face_box(frame, face_results.detections)
-            
-        return frame, face_state_changed
-        
-    def _handle_face_state(self, face_detected):
-        """
-        Handle changes in face detection state.
-        
-        Args:
-            face_detected: Whether a face is currently detected
-            
-        Returns:
-            bool: True if state changed, False otherwise
-        """
-        if face_detected != self.prev_face_state:
-            if face_detected:
-                print("Face detected - resuming playback")
-            else:
-                print("Face lost - pausing playback")
-            pyautogui.press("space")
-            self.prev_face_state = face_detected
-            return True
-        return False
-        
-    def _draw_face_box(self, frame, detections):
-        """Draw boxes around detected faces."""
-        for detection in detections:
-            bbox = detection.location_data.relative_bounding_box
-            ih, iw, _ = frame.shape
-            x, y = int(bbox.xmin * iw), int(bbox.ymin * ih)
-            w, h = int(bbox.width * iw), int(bbox.height * ih)
-            cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-        return frame
+"""
+Face detection for automatic media playback control.
+"""
+import time
+from collections import namedtuple
+
+import mediapipe as mp
+import numpy as np
+
+from ..config import (
+    INFERENCE_RESOLUTION, FACE_DETECTION_HZ, FACE_DETECTION_MIN_HZ,
+    FACE_DETECTION_BOOST_HZ, FACE_STABLE_AFTER, FACE_BOOST_DURATION,
+    FACE_MODE, FACE_MAX_FACES
+)
+from ..utils.actions import ActionDispatcher
+from ..utils.attention import AttentionTracker, pose_points, head_angles
+from ..utils.frames import FrameScaler
+from ..utils.metrics import metrics
+from ..utils.profiles import ActionMapper
+from ..utils.renderer import Overlay
+from ..utils.scheduler import DetectionScheduler
+
+# Faces found in one frame: (faces, 4) boxes as normalized xmin, ymin, width, height,
+# and (faces, 2) head yaw and pitch in degrees, or None in "presence" mode
+FaceResult = namedtuple("FaceResult", ["boxes", "angles"])
+NO_FACES = FaceResult(np.zeros((0, 4)), None)
+
+FACE_MODES = ("attention", "presence")
+
+
+class FaceController:
+    """
+    Controls media player based on face detection.
+    """
+    def __init__(self, frame_scaler=None, dispatcher=None, mode=FACE_MODE, inference=True, action_map=None):
+        """
+        Initialize the face controller.
+        
+        Args:
+            frame_scaler: FrameScaler used to downscale frames before inference
+            dispatcher: ActionDispatcher that executes key presses off the frame loop
+            mode (str): "attention" (faces must look at the screen) or "presence"
+            inference (bool): Load the model; False for a controller that only handles
+                results detected elsewhere (e.g. in a worker process)
+            action_map: ActionMapper holding the face event bindings of the active profile
+        """
+        if mode not in FACE_MODES:
+            raise ValueError(f"Unknown face mode: {mode}")
+        self.dispatcher = dispatcher or ActionDispatcher()
+        self.action_map = action_map or ActionMapper()
+        self.frame_scaler = frame_scaler or FrameScaler(INFERENCE_RESOLUTION)
+        self.mode = mode
+        if inference and mode == "attention":
+            self.face_mesh = mp.solutions.face_mesh.FaceMesh(
+                max_num_faces=FACE_MAX_FACES, min_detection_confidence=0.5, min_tracking_confidence=0.5
+            )
+        elif inference:
+            self.face_detector = mp.solutions.face_detection.FaceDetection(min_detection_confidence=0.5)
+        
+        # Pausing and resuming only happen once a change has held for a while,
+        # and playback is only resumed if it was paused here
+        self.attention = AttentionTracker()
+        self.paused_by_face = False
+        
+        # Presence changes slowly, so detection runs at a reduced, adaptive rate
+        # and the last detections are reused in between
+        self.scheduler = DetectionScheduler(
+            FACE_DETECTION_HZ, FACE_DETECTION_MIN_HZ, FACE_DETECTION_BOOST_HZ,
+            stable_after=FACE_STABLE_AFTER, boost_duration=FACE_BOOST_DURATION
+        )
+        self.last_detections = NO_FACES
+        
+    @property
+    def attentive(self):
+        """Whether someone is (confirmed to be) watching."""
+        return self.attention.attentive
+        
+    @property
+    def faces(self):
+        """Boxes (xmin, ymin, width, height) of the latest detected faces, normalized to the frame."""
+        return [tuple(box) for box in self.last_detections.boxes]
+        
+    @metrics.timed("process_seconds", controller="face")
+    def process_frame(self, frame, overlay=None, timestamp=None, rgb_frame=None):
+        """
+        Process a video frame to detect faces.
+        
+        Args:
+            frame: OpenCV image frame
+            overlay: Overlay to add drawings to; if None they are drawn immediately
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+            rgb_frame: The frame already downscaled and converted to RGB, if shared with other detectors
+        
+        Returns:
+            processed_frame: Frame with face detection drawn
+            face_state_changed: True if face state changed, False otherwise
+        """
+        if not self.scheduler.should_run(timestamp):
+            # Skip the colour conversion too when detection is not due
+            return self.handle_result(frame, self.last_detections, overlay, timestamp)
+        
+        if rgb_frame is None:
+            rgb_frame = self.frame_scaler.to_rgb(frame)
+        detections = self.detect(rgb_frame, timestamp)
+        return self.handle_result(frame, detections, overlay, timestamp)
+        
+    @metrics.timed("inference_seconds", detector="face")
+    def detect(self, rgb_frame, timestamp=None):
+        """
+        Run face detection on an RGB frame, if the scheduler says it is due.
+        
+        In "attention" mode this also estimates each face's head pose.
+        
+        Args:
+            rgb_frame: RGB image as a NumPy array
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+        
+        Returns:
+            FaceResult: Detected faces (empty if none were found); the previous
+            detections when this frame was skipped
+        """
+        if not self.scheduler.should_run(timestamp):
+            return self.last_detections
+        
+        if self.mode == "attention":
+            result = self._detect_attention(rgb_frame)
+        else:
+            result = self._detect_presence(rgb_frame)
+        self.last_detections = result
+        self.scheduler.record(self._is_looking(result), timestamp)
+        return result
+        
+    @staticmethod
+    def pack_result(detections):
+        """Return a detection result in picklable form (FaceResult already is)."""
+        return detections
+        
+    @staticmethod
+    def unpack_result(packed):
+        """Rebuild the detection result returned by pack_result()."""
+        return packed
+        
+    def _detect_presence(self, rgb_frame):
+        detections = self.face_detector.process(rgb_frame).detections
+        if not detections:
+            return NO_FACES
+        boxes = np.array([
+            (bbox.xmin, bbox.ymin, bbox.width, bbox.height)
+            for bbox in (detection.location_data.relative_bounding_box for detection in detections)
+        ])
+        return FaceResult(boxes, None)
+        
+    def _detect_attention(self, rgb_frame):
+        faces = self.face_mesh.process(rgb_frame).multi_face_landmarks
+        if not faces:
+            return FaceResult(NO_FACES.boxes, np.zeros((0, 2)))
+        points = np.array([[(lm.x, lm.y) for lm in face.landmark] for face in faces])
+        low, high = points.min(axis=1), points.max(axis=1)
+        height, width = rgb_frame.shape[:2]
+        angles = head_angles(pose_points(points), (width, height))
+        return FaceResult(np.hstack([low, high - low]), angles)
+        
+    def _is_looking(self, detections):
+        """Whether anyone in a result is watching, before debouncing."""
+        return len(detections.boxes) > 0 and self.attention.is_looking(detections.angles)
+        
+    def handle_result(self, frame, detections, overlay=None, timestamp=None):
+        """
+        Update the attention state from a detection result and draw it.
+        
+        Args:
+            frame: OpenCV image frame to draw on
+            detections: Result returned by detect()
+            overlay: Overlay to add drawings to; if None they are drawn immediately
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+        
+        Returns:
+            processed_frame: Frame with face detection drawn
+            face_state_changed: True if the confirmed attention state changed
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        # Results may come from detect() in another thread or process
+        self.last_detections = detections
+        face_state_changed = self.attention.update(self._is_looking(detections), now)
+        if face_state_changed:
+            self._handle_face_state(self.attention.attentive)
+        
+        if overlay is None:
+            return self._add_faces(Overlay(), frame, detections, now).render(frame), face_state_changed
+        self._add_faces(overlay, frame, detections, now)
+        return frame, face_state_changed
+        
+    def _handle_face_state(self, attentive):
+        """
+        Pause when attention is confirmed lost, and resume only what was paused here.
+        
+        Args:
+            attentive: Confirmed attention state
+        """
+        if not attentive and not self.paused_by_face:
+            label = "Nobody watching - pausing playback" if self.mode == "attention" else "Face lost - pausing playback"
+            self.paused_by_face = self._fire("away", label)
+        elif attentive and self.paused_by_face:
+            label = "Viewer back - resuming playback" if self.mode == "attention" else "Face detected - resuming playback"
+            self._fire("back", label)
+            self.paused_by_face = False
+        
+    def _fire(self, event, label):
+        """Queue the action bound to a face event; return False if the profile binds none."""
+        binding = self.action_map.face(event)
+        if binding is None:
+            return False
+        self.dispatcher.submit(binding.kind, binding.args, label, "face")
+        return True
+        
+    def _add_faces(self, overlay, frame, detections, now):
+        """Add boxes around detected faces, their head angles, and a pending pause or resume."""
+        height, width = frame.shape[:2]
+        for i, (xmin, ymin, box_width, box_height) in enumerate(detections.boxes):
+            overlay.add_box(xmin, ymin, box_width, box_height)
+            if detections.angles is not None:
+                yaw, pitch = detections.angles[i]
+                origin = (int(xmin * width), max(15, int(ymin * height) - 8))
+                overlay.add_text(f"yaw {yaw:+.0f} pitch {pitch:+.0f}", origin, 0.5, (0, 255, 0), 1)
+        
+        pending = self.attention.pending(now)
+        if pending:
+            action = "Resuming" if self.attention.looking else "Pausing"
+            hold = self.attention.resume_after if self.attention.looking else self.attention.pause_after
+            overlay.add_text(f"{action} in {max(0.0, hold - pending):.1f}s", (10, 190), 0.6, (0, 165, 255))
+        return overlay
@@ -1,257 +1,550 @@
-"""
-Gesture detection and control for media playback using MediaPipe's Gesture Recognizer.
-"""
-import time
-import os
-import pyautogui
-import mediapipe as mp
-import cv2
-import numpy as np
-import urllib.request
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-
-from ..config import GESTURE_COOLDOWN, VOLUME_SENSITIVITY, MODEL_PATH
-
-
-class GestureController:
-    """
-    Controls media player based on hand gestures using MediaPipe's pre-trained gesture recognizer.
-    """
-    def __init__(self, audio_controller):
-        """
-        Initialize the gesture controller with MediaPipe's gesture recognizer.
-        
-        Args:
-            audio_controller: Instance of AudioController for volume control
-        """
-        self.audio_controller = audio_controller
-        self.last_gesture_time = 0
-        self.previous_gesture = None
-        self.gesture_start_time = 0
-        self.last_toggle_time = 0
-        self.mp_drawing = mp.solutions.drawing_utils
-        self.mp_hands = mp.solutions.hands
-        self.mp_drawing_styles = mp.solutions.drawing_styles
-        
-        # Download and set up the gesture recognizer model
-        self._setup_gesture_recognizer()
-        
-    def _setup_gesture_recognizer(self):
-        """Download and set up the MediaPipe gesture recognizer."""
-        model_path = MODEL_PATH
-        
-        # Create the model directory if it doesn't exist
-        os.makedirs(os.path.dirname(model_path), exist_ok=True)
-        
-        # Download the model if it doesn't exist
-        if not os.path.exists(model_path):
-            print("Downloading MediaPipe gesture recognizer model...")
-            url = "https://storage.googleapis.com/mediapipe-models/gesture_recognizer/gesture_recognizer/float16/1/gesture_recognizer.task"
-            urllib.request.urlretrieve(url, model_path)
-            print("Model downloaded successfully.")
-        
-        # Initialize the gesture recognizer
-        base_options = python.BaseOptions(model_asset_path=model_path)
-        options = vision.GestureRecognizerOptions(
-            base_options=base_options,
-            running_mode=vision.RunningMode.IMAGE,
-            num_hands=1,
-            min_hand_detection_confidence=0.5,
-            min_hand_presence_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
-        self.recognizer = vision.GestureRecognizer.create_from_options(options)
-        
-    def process_frame(self, frame):
-        """
-        Process a video frame to detect hand gestures using MediaPipe's gesture recognizer.
-        
-        Args:
-            frame: OpenCV image frame
-        
-        Returns:
-            processed_frame: Frame with hand landmarks and gesture info
-            detected_gesture: Name of detected gesture or None
-        """
-        # Convert OpenCV BGR image to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Create MediaPipe Image
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
-        
-        try:
-            # Recognize gestures
-            recognition_result = self.recognizer.recognize(mp_image)
-            
-            # Process results
-            if not recognition_result.gestures or not recognition_result.hand_landmarks:
-                # Display "No Hand Detected" when no hand is found
-                cv2.putText(frame, "No Hand Detected", (10, 70), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-                self.previous_gesture = None
-                return frame, None
-                
-            # Get the top gesture and hand information
-            top_gesture = recognition_result.gestures[0][0]
-            gesture_name = top_gesture.category_name
-            gesture_score = top_gesture.score
-            hand_landmarks = recognition_result.hand_landmarks[0]
-            
-            # Draw hand landmarks on the frame
-            self._draw_landmarks(frame, hand_landmarks)
-            
-            # Display gesture information on frame
-            confidence = int(gesture_score * 100)
-            emoji = self._get_gesture_emoji(gesture_name)
-            cv2.putText(frame, f"Gesture: {gesture_name} ({confidence}%)", (50, 50),
-                      cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-            
-            # For debugging - show if this gesture is a toggle action
-            is_toggle = gesture_name in ["Open_Palm", "ILoveYou"]
-            can_toggle = time.time() - self.last_toggle_time > 1.5
-            cv2.putText(frame, f"Toggle ready: {'Yes' if (is_toggle and can_toggle) else 'No'}", 
-                      (10, 100), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2)
-            
-            # Check if gesture has changed
-            if gesture_name != self.previous_gesture:
-                self.previous_gesture = gesture_name
-                self.gesture_start_time = time.time()
-            
-            # Only execute gesture if it's stable for a short time and has high confidence
-            if gesture_score > 0.65 and time.time() - self.gesture_start_time > 0.3:  # Lower confidence threshold
-                if self._should_execute_gesture(gesture_name):
-                    self._execute_gesture_action(gesture_name)
-                    print(f"🎯 Gesture: {gesture_name} {emoji} ({confidence}%)")
-                return frame, gesture_name
-                    
-        except Exception as e:
-            print(f"Error processing frame: {e}")
-            cv2.putText(frame, "Error: " + str(e)[:30], (10, 130), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 255), 2)
-                
-        return frame, None
-    
-    def _draw_landmarks(self, frame, hand_landmarks):
-        """
-        Draw hand landmarks on the frame.
-        
-        Args:
-            frame: The image frame to draw on
-            hand_landmarks: Hand landmarks from MediaPipe Tasks API
-        """
-        # Convert landmarks to the format expected by mp_drawing.draw_landmarks
-        height, width, _ = frame.shape
-        landmarks_list = []
-        
-        # Draw each landmark as a circle
-        for landmark in hand_landmarks:
-            # Convert normalized coordinates to pixel coordinates
-            x = int(landmark.x * width)
-            y = int(landmark.y * height)
-            
-            # Draw a small circle for each landmark
-            cv2.circle(frame, (x, y), 5, (0, 255, 0), -1)
-            
-            # Store landmarks for connection drawing
-            landmarks_list.append((x, y))
-        
-        # Draw connections between landmarks to form the hand skeleton
-        connections = [
-            (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
-            (0, 5), (5, 6), (6, 7), (7, 8),  # Index finger
-            (0, 9), (9, 10), (10, 11), (11, 12),  # Middle finger
-            (0, 13), (13, 14), (14, 15), (15, 16),  # Ring finger
-            (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
-            (5, 9), (9, 13), (13, 17)  # Palm
-        ]
-        
-        # Draw the connections
-        for connection in connections:
-            start_idx, end_idx = connection
-            if start_idx < len(landmarks_list) and end_idx < len(landmarks_list):
-                cv2.line(frame, landmarks_list[start_idx], landmarks_list[end_idx], (255, 255, 255), 2)
-    
-    def _get_gesture_emoji(self, gesture_name):
-        """Return emoji for the given gesture name."""
-        emoji_map = {
-            "Thumb_Up": "👍",
-            "Thumb_Down": "👎",
-            "Open_Palm": "👋",
-            "Closed_Fist": "✊",
-            "Victory": "✌️",
-            "Pointing_Up": "☝️",
-            "ILoveYou": "🤟"
-        }
-        return emoji_map.get(gesture_name, "")
-    
-    def _should_execute_gesture(self, gesture_name):
-        """
-        Determine if a gesture should trigger an action based on timing.
-        
-        Args:
-            gesture_name: Detected gesture name
-            
-        Returns:
-            bool: True if action should be executed
-        """
-        current_time = time.time()
-        
-        # For toggle actions (play/pause, mute), enforce longer cooldown
-        if gesture_name in ["Open_Palm", "ILoveYou"]:
-            if current_time - self.last_toggle_time > 1.5:
-                self.last_toggle_time = current_time
-                return True
-            return False
-            
-        # For all other gestures, use normal cooldown
-        if current_time - self.last_gesture_time < GESTURE_COOLDOWN:
-            return False
-            
-        self.last_gesture_time = current_time
-        return True
-        
-    def _execute_gesture_action(self, gesture_name):
-        """
-        Execute action based on detected gesture using VLC media player controls.
-        
-        Args:
-            gesture_name: MediaPipe's gesture name
-        """
-        # VLC specific actions based on the 7 MediaPipe gestures
-        if gesture_name == "Open_Palm":  # 👋
-            # Try both space and 'k' for play/pause in VLC
-            try:
-                print("Sending play/pause command (space)")
-                pyautogui.press("space")
-            except Exception as e:
-                print(f"Error sending space key: {e}")
-                
-            print("Action: Toggle Play/Pause")
-            
-        elif gesture_name == "ILoveYou":  # 🤟
-            pyautogui.press("m")  # Mute in VLC
-            print("Action: Toggle Mute")
-            
-        elif gesture_name == "Thumb_Up":  # 👍
-            pyautogui.press("right")  # Seek forward in VLC
-            print("Action: Seek Forward")
-            
-        elif gesture_name == "Thumb_Down":  # 👎
-            pyautogui.press("left")  # Seek backward in VLC
-            print("Action: Seek Backward")
-            
-        elif gesture_name == "Victory":  # ✌️
-            pyautogui.hotkey('shift', 's')  # Screenshot in VLC
-            print("Action: Screenshot")
-            
-        elif gesture_name == "Pointing_Up":  # ☝️
-            # self.audio_controller.increase_volume(VOLUME_SENSITIVITY)  # Volume up
-            pyautogui.press("up")
-            print("Action: Volume Up")
-            
-        elif gesture_name == "Closed_Fist":  # ✊
-            # self.audio_controller.decrease_volume(VOLUME_SENSITIVITY)  # Volume down
-            pyautogui.press("down")
-            print("Action: Volume Down")
-
+"""
+Gesture detection and control for media playback using MediaPipe's Gesture Recognizer.
+"""
+import time
+import threading
+import dataclasses
+import mediapipe as mp
+import numpy as np
+from mediapipe.tasks import python
+from mediapipe.tasks.python import vision
+from mediapipe.tasks.python.components.containers.category import Category
+from mediapipe.tasks.python.components.containers.landmark import NormalizedLandmark
+
+from ..config import (
+    GESTURE_COOLDOWN, MODEL_LOAD_MODE, MODEL_WARM_UP, GESTURE_RUNNING_MODE, INFERENCE_RESOLUTION,
+    GESTURE_ROI_TRACKING, ROI_PADDING, ROI_MIN_SIZE, ROI_MIN_CONFIDENCE, ROI_EDGE_MARGIN,
+    GESTURE_VOLUME_MODE, VOLUME_PINCH_GESTURES, PINCH_HOLD_TIME, VOLUME_KEY_GESTURES, PINCH_MIN_RATIO,
+    PINCH_MAX_RATIO, VOLUME_FILTER_MIN_CUTOFF, VOLUME_FILTER_BETA, VOLUME_UPDATE_INTERVAL, VOLUME_DEADBAND,
+    GESTURE_CATEGORIES, GESTURE_FILTER_METHOD, GESTURE_FILTER_WINDOW, GESTURE_FILTER_TIME_CONSTANT,
+    GESTURE_ENTER_THRESHOLD, GESTURE_EXIT_THRESHOLD, GESTURE_COOLDOWNS, GESTURE_ONE_SHOT,
+    GESTURE_SWIPES, GESTURE_NUM_HANDS, HAND_ARBITRATION
+)
+from ..utils.actions import ActionDispatcher
+from ..utils.filters import OneEuroFilter, GestureFilter
+from ..utils.frames import FrameScaler
+from ..utils.metrics import metrics
+from ..utils.models import ModelCache, read_model_bytes
+from ..utils.profiles import ActionMapper
+from ..utils.renderer import Overlay, landmarks_to_array
+from ..utils.tracking import HandTracker, HandArbiter, hand_boxes
+from ..utils.trajectory import SwipeDetector
+
+# Maps GESTURE_RUNNING_MODE values to MediaPipe running modes
+RUNNING_MODES = {
+    "image": vision.RunningMode.IMAGE,
+    "video": vision.RunningMode.VIDEO,
+    "live_stream": vision.RunningMode.LIVE_STREAM
+}
+
+
+class GestureController:
+    """
+    Controls media player based on hand gestures using MediaPipe's pre-trained gesture recognizer.
+    """
+    def __init__(self, audio_controller, running_mode=GESTURE_RUNNING_MODE, frame_scaler=None,
+                 roi_tracking=GESTURE_ROI_TRACKING, dispatcher=None, volume_mode=GESTURE_VOLUME_MODE,
+                 swipes=GESTURE_SWIPES, num_hands=GESTURE_NUM_HANDS, arbitration=HAND_ARBITRATION,
+                 face_provider=None, inference=True, action_map=None):
+        """
+        Initialize the gesture controller with MediaPipe's gesture recognizer.
+        
+        Args:
+            audio_controller: Instance of AudioController for volume control
+            running_mode (str): "image", "video" or "live_stream"
+            frame_scaler: FrameScaler used to downscale frames before inference
+            roi_tracking (bool): Recognize on a crop around the last hand ("image" mode only)
+            dispatcher: ActionDispatcher that executes key presses off the frame loop
+            volume_mode (str): "discrete" volume keys or "continuous" pinch control
+            swipes (bool): Detect swipe motions from the hand's trajectory
+            num_hands (int): Maximum number of hands recognized per frame
+            arbitration (str): Which hand controls playback (see HAND_ARBITRATION)
+            face_provider: Callable returning the latest face boxes, for "closest_face"
+            inference (bool): Load the model; False for a controller that only handles
+                results recognized elsewhere (e.g. in a worker process)
+            action_map: ActionMapper holding the gesture bindings of the active profile
+        """
+        if running_mode not in RUNNING_MODES:
+            raise ValueError(f"Unknown gesture running mode: {running_mode}")
+        self.audio_controller = audio_controller
+        self.dispatcher = dispatcher or ActionDispatcher(audio_controller)
+        self.action_map = action_map or ActionMapper()
+        self.running_mode = running_mode
+        self.frame_scaler = frame_scaler or FrameScaler(INFERENCE_RESOLUTION)
+        # Streaming modes already track hands internally, so ROI cropping only applies to
+        # IMAGE, and a crop around one hand would hide the others
+        self.roi_tracking = roi_tracking and running_mode == "image" and num_hands == 1
+        self.roi = None  # (x0, y0, x1, y1) as fractions of the frame size
+        
+        # Every hand gets a tracking ID; only the controlling hand's gestures act
+        self.num_hands = num_hands
+        self.swipes = swipes
+        self.hand_tracker = HandTracker()
+        self.arbiter = HandArbiter(arbitration)
+        self.face_provider = face_provider
+        self.controlling_track = None
+        
+        # Continuous volume: filtered thumb-index distance, rate limited
+        self.volume_mode = volume_mode
+        self.pinch_since = None  # When the controlling hand took the pinch pose
+        self.last_volume_update = 0
+        self.last_volume_level = None
+        
+        # Streaming state: VIDEO and LIVE_STREAM need strictly increasing timestamps,
+        # and LIVE_STREAM delivers results to a callback on MediaPipe's thread
+        self._last_timestamp_ms = -1
+        self._result_lock = threading.Lock()
+        self._latest_result = self._empty_result()
+        self._latest_result_ms = -1  # Timestamp the callback delivered the cached result for
+        self._handled = None  # (timestamp_ms, Overlay, gesture) of the live result last handled
+        
+        # Fetch the model from the cache and set up the gesture recognizer
+        self.recognizer = None
+        if inference:
+            self._setup_gesture_recognizer()
+            if MODEL_WARM_UP:
+                self._warm_up()
+        
+    def _setup_gesture_recognizer(self, model_cache=None, load_mode=MODEL_LOAD_MODE):
+        """
+        Set up the MediaPipe gesture recognizer from the model cache.
+        
+        Args:
+            model_cache: ModelCache to fetch the model from, defaults to the per-user cache
+            load_mode (str): "path" or "buffer" (see MODEL_LOAD_MODE)
+        """
+        model_path = (model_cache or ModelCache()).fetch("gesture_recognizer")
+        if load_mode == "buffer":
+            base_options = python.BaseOptions(model_asset_buffer=read_model_bytes(model_path))
+        elif load_mode == "path":
+            base_options = python.BaseOptions(model_asset_path=model_path)
+        else:
+            raise ValueError(f"Unknown model load mode: {load_mode}")
+        
+        # Initialize the gesture recognizer
+        options = vision.GestureRecognizerOptions(
+            base_options=base_options,
+            running_mode=RUNNING_MODES[self.running_mode],
+            num_hands=self.num_hands,
+            min_hand_detection_confidence=0.5,
+            min_hand_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self._on_result if self.running_mode == "live_stream" else None
+        )
+        self.recognizer = vision.GestureRecognizer.create_from_options(options)
+        
+    def _warm_up(self):
+        """
+        Run one inference on a blank frame so graph initialisation happens now
+        rather than on the first camera frame.
+        """
+        blank = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.zeros((192, 192, 3), dtype=np.uint8))
+        start = time.perf_counter()
+        if self.running_mode == "video":
+            self.recognizer.recognize_for_video(blank, self._next_timestamp_ms(0))
+        elif self.running_mode == "live_stream":
+            self.recognizer.recognize_async(blank, self._next_timestamp_ms(0))
+        else:
+            self.recognizer.recognize(blank)
+        metrics.observe("warm_up_seconds", time.perf_counter() - start, detector="gesture")
+        
+    def _on_result(self, result, output_image, timestamp_ms):
+        """Cache the newest result delivered by the LIVE_STREAM recognizer."""
+        with self._result_lock:
+            self._latest_result = result
+            self._latest_result_ms = timestamp_ms
+            
+    def _next_timestamp_ms(self, timestamp=None):
+        """Return a monotonic, strictly increasing timestamp for streaming modes."""
+        timestamp_ms = int((time.monotonic() if timestamp is None else timestamp) * 1000)
+        if timestamp_ms <= self._last_timestamp_ms:
+            timestamp_ms = self._last_timestamp_ms + 1
+        self._last_timestamp_ms = timestamp_ms
+        return timestamp_ms
+        
+    @staticmethod
+    def _empty_result():
+        """Return a recognition result with no hands in it."""
+        return vision.GestureRecognizerResult([], [], [], [])
+        
+    @staticmethod
+    def pack_result(result):
+        """
+        Reduce a recognition result to plain values that are cheap to pickle.
+        
+        Returns:
+            tuple: Gesture and handedness (category name, score) lists per hand,
+            and a (hands, 21, 3) float32 array of normalized landmarks
+        """
+        categories = [
+            [[(category.category_name, category.score) for category in hand] for hand in per_hand]
+            for per_hand in (result.gestures, result.handedness)
+        ]
+        landmarks = np.array([[(lm.x, lm.y, lm.z) for lm in hand] for hand in result.hand_landmarks],
+                             dtype=np.float32).reshape(-1, 21, 3)
+        return categories[0], categories[1], landmarks
+        
+    @staticmethod
+    def unpack_result(packed):
+        """Rebuild the recognition result returned by pack_result() for handle_result()."""
+        gestures, handedness, landmarks = packed
+        categories = [
+            [[Category(score=score, category_name=name) for name, score in hand] for hand in per_hand]
+            for per_hand in (gestures, handedness)
+        ]
+        hand_landmarks = [
+            [NormalizedLandmark(x=float(x), y=float(y), z=float(z)) for x, y, z in hand] for hand in landmarks
+        ]
+        return vision.GestureRecognizerResult(categories[0], categories[1], hand_landmarks, [])
+        
+    @metrics.timed("process_seconds", controller="gesture")
+    def process_frame(self, frame, overlay=None, timestamp=None, rgb_frame=None):
+        """
+        Process a video frame to detect hand gestures using MediaPipe's gesture recognizer.
+        
+        Args:
+            frame: OpenCV image frame
+            overlay: Overlay to add drawings to; if None they are drawn immediately
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+            rgb_frame: The frame already downscaled and converted to RGB, if shared with other detectors
+        
+        Returns:
+            processed_frame: Frame with hand landmarks and gesture info
+            detected_gesture: Name of detected gesture or None
+        """
+        if overlay is None:
+            overlay = Overlay()
+            frame, gesture_name = self._process_frame(frame, overlay, timestamp, rgb_frame)
+            return overlay.render(frame), gesture_name
+        return self._process_frame(frame, overlay, timestamp, rgb_frame)
+    
+    def _process_frame(self, frame, overlay, timestamp, rgb_frame):
+        """Detect and handle one frame, collecting the drawings in overlay (untimed)."""
+        # Downscale for inference and convert OpenCV BGR image to RGB
+        if rgb_frame is None:
+            rgb_frame = self.frame_scaler.to_rgb(frame)
+        
+        try:
+            recognition_result = self.detect(rgb_frame, timestamp)
+            return self.handle_result(frame, recognition_result, overlay, timestamp)
+                    
+        except Exception as e:
+            print(f"Error processing frame: {e}")
+            overlay.add_text("Error: " + str(e)[:30], (10, 130), 0.6, (0, 0, 255))
+                
+        return frame, None
+    
+    @metrics.timed("inference_seconds", detector="gesture")
+    def detect(self, rgb_frame, timestamp=None):
+        """
+        Run the gesture recognizer on an RGB frame.
+        
+        Only inference happens here, so it can run on a worker thread
+        while drawing and actions happen elsewhere. In "live_stream" mode
+        the frame is queued with MediaPipe and the newest cached result is
+        returned immediately, so callers never wait on inference.
+        
+        Args:
+            rgb_frame: RGB image as a NumPy array
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+            
+        Returns:
+            GestureRecognizerResult from MediaPipe
+        """
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+        
+        if self.running_mode == "video":
+            return self.recognizer.recognize_for_video(mp_image, self._next_timestamp_ms(timestamp))
+        
+        if self.running_mode == "live_stream":
+            self.recognizer.recognize_async(mp_image, self._next_timestamp_ms(timestamp))
+            with self._result_lock:
+                return self._latest_result
+        
+        if self.roi_tracking and self.roi is not None:
+            result = self._recognize_roi(rgb_frame, self.roi)
+            if result is not None:
+                return result
+        
+        result = self.recognizer.recognize(mp_image)
+        if self.roi_tracking:
+            self.roi = self._roi_from_result(result, rgb_frame.shape)
+        return result
+    
+    def _recognize_roi(self, rgb_frame, roi):
+        """
+        Recognize gestures on a crop of the frame and map the result back.
+        
+        Args:
+            rgb_frame: Full RGB inference frame
+            roi: (x0, y0, x1, y1) crop as fractions of the frame size
+            
+        Returns:
+            GestureRecognizerResult in full-frame coordinates, or None if the
+            hand was not confidently found well inside the crop
+        """
+        height, width = rgb_frame.shape[:2]
+        x0, x1 = int(roi[0] * width), int(roi[2] * width)
+        y0, y1 = int(roi[1] * height), int(roi[3] * height)
+        crop = np.ascontiguousarray(rgb_frame[y0:y1, x0:x1])
+        result = self.recognizer.recognize(mp.Image(image_format=mp.ImageFormat.SRGB, data=crop))
+        
+        if not result.hand_landmarks or result.handedness[0][0].score < ROI_MIN_CONFIDENCE:
+            self.roi = None
+            return None
+        
+        # Landmarks close to a crop edge that is not also a frame edge mean the
+        # hand is leaving the crop; search the whole frame instead
+        points = np.array([(lm.x, lm.y) for lm in result.hand_landmarks[0]])
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+        if ((x0 > 0 and min_x < ROI_EDGE_MARGIN) or (x1 < width and max_x > 1.0 - ROI_EDGE_MARGIN) or
+                (y0 > 0 and min_y < ROI_EDGE_MARGIN) or (y1 < height and max_y > 1.0 - ROI_EDGE_MARGIN)):
+            self.roi = None
+            return None
+        
+        scale_x, scale_y = (x1 - x0) / width, (y1 - y0) / height
+        offset_x, offset_y = x0 / width, y0 / height
+        hand_landmarks = [
+            [dataclasses.replace(lm, x=offset_x + lm.x * scale_x, y=offset_y + lm.y * scale_y)
+             for lm in landmarks]
+            for landmarks in result.hand_landmarks
+        ]
+        result = vision.GestureRecognizerResult(
+            result.gestures, result.handedness, hand_landmarks, result.hand_world_landmarks
+        )
+        self.roi = self._roi_from_result(result, rgb_frame.shape)
+        return result
+    
+    def _roi_from_result(self, result, frame_shape):
+        """
+        Compute a padded square crop around the first hand in a result.
+        
+        Args:
+            result: GestureRecognizerResult in full-frame coordinates
+            frame_shape: Shape of the inference frame
+            
+        Returns:
+            tuple or None: (x0, y0, x1, y1) as fractions of the frame size,
+            or None if there is no hand
+        """
+        if not result.hand_landmarks:
+            return None
+        
+        height, width = frame_shape[:2]
+        points = np.array([(lm.x * width, lm.y * height) for lm in result.hand_landmarks[0]])
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+        
+        side = max(max_x - min_x, max_y - min_y) * (1 + 2 * ROI_PADDING)
+        side = min(max(side, ROI_MIN_SIZE * min(width, height)), min(width, height))
+        center_x, center_y = (min_x + max_x) / 2, (min_y + max_y) / 2
+        
+        x0 = np.clip(center_x - side / 2, 0, width - side)
+        y0 = np.clip(center_y - side / 2, 0, height - side)
+        return x0 / width, y0 / height, (x0 + side) / width, (y0 + side) / height
+    
+    def handle_result(self, frame, recognition_result, overlay=None, timestamp=None):
+        """
+        Draw a recognition result on the frame and trigger the matching action.
+        
+        Args:
+            frame: OpenCV image frame to draw on
+            recognition_result: Result returned by detect()
+            overlay: Overlay to add drawings to; if None they are drawn immediately
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+        
+        Returns:
+            processed_frame: Frame with hand landmarks and gesture info
+            detected_gesture: Name of the stable (filtered) gesture or None
+        """
+        if overlay is None:
+            overlay = Overlay()
+            frame, gesture_name = self.handle_result(frame, recognition_result, overlay, timestamp)
+            return overlay.render(frame), gesture_name
+        
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.running_mode != "live_stream":
+            return self._apply_result(frame, recognition_result, overlay, now)
+        
+        # LIVE_STREAM returns the cached result until the recognizer delivers a new one; it is
+        # handled once, then only redrawn, so the filters and swipes never see it twice
+        with self._result_lock:
+            result_ms = self._latest_result_ms if recognition_result is self._latest_result else None
+        if result_ms is not None and self._handled is not None and self._handled[0] == result_ms:
+            overlay.extend(self._handled[1])
+            return frame, self._handled[2]
+        
+        drawn = Overlay()
+        frame, gesture_name = self._apply_result(frame, recognition_result, drawn, now)
+        self._handled = (result_ms, drawn, gesture_name)
+        overlay.extend(drawn)
+        return frame, gesture_name
+    
+    def _apply_result(self, frame, recognition_result, overlay, now):
+        """Track the hands in a result, draw it and trigger the controlling hand's action."""
+        hands = [landmarks_to_array(landmarks) for landmarks in recognition_result.hand_landmarks]
+        self.hand_tracker.update(*hand_boxes(hands), now)
+        faces = self.face_provider() if self.face_provider is not None and self.arbiter.policy == "closest_face" else ()
+        track = self.arbiter.select(self.hand_tracker.tracks, faces)
+        
+        if track is not self.controlling_track:
+            self._hand_over(self.controlling_track, track, now)
+            self.controlling_track = track
+        
+        for hand in hands:
+            overlay.add_hand(hand)
+        
+        if track is None or not recognition_result.gestures:
+            # Display "No Hand Detected" when no hand is found
+            overlay.add_text("No Hand Detected", (10, 70), 1, (0, 0, 255))
+            return frame, None
+            
+        # Get the top gesture of the controlling hand
+        index = track.index
+        top_gesture = recognition_result.gestures[index][0]
+        gesture_name = top_gesture.category_name
+        gesture_score = top_gesture.score
+        hand_landmarks = recognition_result.hand_landmarks[index]
+        
+        # Display gesture information on frame
+        confidence = int(gesture_score * 100)
+        overlay.add_text(f"Gesture: {gesture_name} ({confidence}%)", (50, 50), 0.8, (0, 255, 0))
+        if len(hands) > 1:
+            overlay.add_text(f"Hand #{track.id} of {len(hands)} in control", (10, 160), 0.6, (255, 255, 0))
+        
+        # Feed every category's score to the filter; it decides what fires
+        scores = {category.category_name: category.score for category in recognition_result.gestures[index]}
+        fired_gesture = track.gesture_filter.update(scores, now)
+        
+        # A swipe overrides whatever pose the hand passed through while moving
+        swipe = track.swipe_detector.update(hands[index], now) if track.swipe_detector is not None else None
+        if swipe is not None:
+            track.gesture_filter.reset()
+            fired_gesture = swipe
+        
+        # For debugging - show if this gesture is a toggle action
+        is_toggle = gesture_name in GESTURE_ONE_SHOT
+        can_toggle = track.gesture_filter.ready(gesture_name, now)
+        overlay.add_text(f"Toggle ready: {'Yes' if (is_toggle and can_toggle) else 'No'}",
+                         (10, 100), 0.7, (255, 255, 0))
+        
+        if self.volume_mode == "continuous":
+            if self._pinch_engaged(gesture_name, hand_landmarks, now):
+                level = self._update_continuous_volume(track.volume_filter, hand_landmarks, now)
+                overlay.add_text(f"Volume: {int(level * 100)}%", (10, 130), 0.7, (0, 255, 255))
+            else:
+                track.volume_filter.reset()
+        
+        if fired_gesture is not None:
+            self._execute_gesture_action(fired_gesture)
+            
+        return frame, track.gesture_filter.active_name
+    
+    def _hand_over(self, previous, track, now):
+        """
+        Move control from one tracked hand to another (either may be None).
+        
+        The previous hand's gesture is released so it does not fire again
+        when it regains control, and the new hand inherits the cooldowns
+        so a toggle does not fire twice just because control moved.
+        """
+        self.pinch_since = None
+        if previous is not None and previous.gesture_filter is not None:
+            previous.gesture_filter.update(None, now)
+            previous.volume_filter.reset()
+            if previous.swipe_detector is not None:
+                previous.swipe_detector.reset()
+        if track is None:
+            return
+        if track.gesture_filter is None:
+            track.gesture_filter = self._create_gesture_filter()
+            track.swipe_detector = SwipeDetector() if self.swipes else None
+            track.volume_filter = OneEuroFilter(VOLUME_FILTER_MIN_CUTOFF, VOLUME_FILTER_BETA)
+        if previous is not None and previous.gesture_filter is not None:
+            np.maximum(track.gesture_filter.last_fired, previous.gesture_filter.last_fired,
+                       out=track.gesture_filter.last_fired)
+    
+    @staticmethod
+    def _create_gesture_filter():
+        """Create the filter that smooths one hand's scores and decides when a gesture fires."""
+        return GestureFilter(
+            GESTURE_CATEGORIES,
+            window=GESTURE_FILTER_WINDOW,
+            method=GESTURE_FILTER_METHOD,
+            time_constant=GESTURE_FILTER_TIME_CONSTANT,
+            enter_threshold=GESTURE_ENTER_THRESHOLD,
+            exit_threshold=GESTURE_EXIT_THRESHOLD,
+            cooldowns=GESTURE_COOLDOWNS,
+            default_cooldown=GESTURE_COOLDOWN,
+            one_shot=GESTURE_ONE_SHOT
+        )
+    
+    @staticmethod
+    def _is_pinch_pose(hand_landmarks):
+        """Whether the middle, ring and little fingers are folded, leaving thumb and index free."""
+        wrist = hand_landmarks[0]
+        for tip, pip in ((12, 10), (16, 14), (20, 18)):
+            tip_distance = np.hypot(hand_landmarks[tip].x - wrist.x, hand_landmarks[tip].y - wrist.y)
+            pip_distance = np.hypot(hand_landmarks[pip].x - wrist.x, hand_landmarks[pip].y - wrist.y)
+            if tip_distance >= pip_distance:
+                return False
+        return True
+    
+    def _pinch_engaged(self, gesture_name, hand_landmarks, now):
+        """
+        Whether the controlling hand is setting the volume.
+        
+        A relaxed hand is not enough: the pinch pose must be held for
+        PINCH_HOLD_TIME seconds first, and control ends as soon as it is let go.
+        """
+        if gesture_name not in VOLUME_PINCH_GESTURES or not self._is_pinch_pose(hand_landmarks):
+            self.pinch_since = None
+            return False
+        if self.pinch_since is None:
+            self.pinch_since = now
+        return now - self.pinch_since >= PINCH_HOLD_TIME
+    
+    def _update_continuous_volume(self, volume_filter, hand_landmarks, now):
+        """
+        Map the thumb-index distance to a system volume level and push it.
+        
+        The distance is divided by the palm size so it does not depend on how
+        far the hand is from the camera, smoothed with a One-Euro filter, and
+        sent at most every VOLUME_UPDATE_INTERVAL seconds.
+        
+        Args:
+            volume_filter: OneEuroFilter of the controlling hand
+            hand_landmarks: Hand landmarks from MediaPipe Tasks API
+            now (float): Frame time in seconds
+            
+        Returns:
+            float: Filtered target volume level (0.0-1.0)
+        """
+        wrist, thumb_tip, middle_mcp, index_tip = (hand_landmarks[i] for i in (0, 4, 9, 8))
+        palm_size = np.hypot(middle_mcp.x - wrist.x, middle_mcp.y - wrist.y)
+        pinch = np.hypot(index_tip.x - thumb_tip.x, index_tip.y - thumb_tip.y)
+        ratio = pinch / max(palm_size, 1e-6)
+        
+        target = np.clip((ratio - PINCH_MIN_RATIO) / (PINCH_MAX_RATIO - PINCH_MIN_RATIO), 0.0, 1.0)
+        level = float(volume_filter(float(target), now))
+        
+        changed = self.last_volume_level is None or abs(level - self.last_volume_level) >= VOLUME_DEADBAND
+        if changed and now - self.last_volume_update >= VOLUME_UPDATE_INTERVAL:
+            self.dispatcher.set_volume(level, source="gesture")
+            self.last_volume_update = now
+            self.last_volume_level = level
+        return level
+    
+    def _execute_gesture_action(self, gesture_name):
+        """
+        Queue the action bound to a detected gesture in the active profile.
+        
+        Args:
+            gesture_name: MediaPipe's gesture name, or a swipe name
+        """
+        if self.volume_mode == "continuous" and gesture_name in VOLUME_KEY_GESTURES:
+            # Volume follows the pinch distance instead of stepping with keys
+            return
+        
+        binding = self.action_map.gesture(gesture_name)
+        if binding is not None:
+            self.dispatcher.submit(binding.kind, binding.args, binding.label, "gesture")
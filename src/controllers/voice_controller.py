@@ -1,62 +1,210 @@
-"""
-Voice recognition for media player control.
-"""
-import pyautogui
-import speech_recognition as sr
-
-
-class VoiceController:
-    """
-    Controls media player based on voice commands.
-    """
-    def __init__(self, audio_controller):
-        """
-        Initialize the voice controller.
-        
-        Args:
-            audio_controller: Instance of AudioController for volume control
-        """
-        self.recognizer = sr.Recognizer()
-        self.mic = sr.Microphone()
-        self.audio_controller = audio_controller
-        
-    def listen_for_commands(self):
-        """
-        Listen for voice commands and execute corresponding actions.
-        
-        Returns:
-            str or None: Recognized command or None if no command recognized
-        """
-        try:
-            with self.mic as source:
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                print("ing for commands...")
-                audio = self.recognizer.listen(source, timeout=3, phrase_time_limit=3)
-                
-            command = self.recognizer.recognize_google(audio).lower()
-            print(f"Detected command: {command}")
-            
-            self._execute_command(command)
-            return command
-            
-        except (sr.UnknownValueError, sr.WaitTimeoutError):
-            return None
-        except Exception as e:
-            print(f"Voice recognition error: {e}")
-            return None
-    
-    def _execute_command(self, command):
-        """Execute actions based on recognized voice command."""
-        if "play" in command or "pause" in command:
-            pyautogui.press("space")
-        elif "volume" in command:
-            if "up" in command:
-                self.audio_controller.increase_volume(0.2)
-            elif "down" in command:
-                self.audio_controller.decrease_volume(0.2)
-        elif "skip" in command or "forward" in command:
-            pyautogui.press("right")
-        elif "back" in command or "previous" in command:
-            pyautogui.press("left")
-        elif "mute" in command:
-            pyautogui.press("m")
+"""
+Voice recognition for media player control.
+"""
+import queue
+import threading
+import time
+
+import speech_recognition as sr
+
+from ..config import (
+    VOICE_BACKEND, VOICE_CALIBRATION_DURATION, VOICE_CALIBRATION_INTERVAL,
+    VOICE_LISTEN_TIMEOUT, VOICE_PHRASE_TIME_LIMIT, VOICE_AUDIO_QUEUE_SIZE, VOICE_RESTART_DELAY
+)
+from ..utils.actions import ActionDispatcher
+from ..utils.metrics import metrics
+from ..utils.profiles import ActionMapper
+from ..utils.speech import create_speech_backend
+from ..utils.stats import LatencyTracker
+
+# Longest the listener can be inside calibration or listen() before it sees a
+# stop request: waiting for speech, then recording a phrase up to its limit
+STOP_TIMEOUT = VOICE_CALIBRATION_DURATION + VOICE_LISTEN_TIMEOUT + VOICE_PHRASE_TIME_LIMIT + 1.0
+
+
+class VoiceController:
+    """
+    Controls media player based on voice commands.
+
+    Listening and recognition run on long-lived background threads; parsed
+    commands are posted to a thread-safe queue that the main loop drains
+    without blocking. A thread that dies (e.g. when the microphone
+    disappears) is restarted after VOICE_RESTART_DELAY.
+    """
+    def __init__(self, audio_controller, backend=VOICE_BACKEND, dispatcher=None, action_map=None):
+        """
+        Initialize the voice controller.
+
+        Args:
+            audio_controller: Instance of AudioController for volume control
+            backend (str): Speech recognition backend name ("google", "sphinx" or "vosk")
+            dispatcher: ActionDispatcher that executes actions off the frame loop
+            action_map: ActionMapper holding the voice phrases of the active profile
+        """
+        self.recognizer = sr.Recognizer()
+        self.mic = sr.Microphone()
+        self.audio_controller = audio_controller
+        self.dispatcher = dispatcher or ActionDispatcher(audio_controller)
+        self.action_map = action_map or ActionMapper()
+        # Offline grammars cover every profile, so switching profiles needs no reload
+        self.backend = create_speech_backend(backend, self.recognizer, self.action_map.phrases())
+        self.latency = LatencyTracker()
+        self.commands = queue.Queue()
+        self._audio_queue = queue.Queue(maxsize=VOICE_AUDIO_QUEUE_SIZE)
+        self._stop_event = threading.Event()
+        self._threads = {}  # Background threads by name, kept while they are still alive
+        self._last_start = None
+        self._last_calibration = 0
+
+    @property
+    def running(self):
+        """Whether the background listener is active, with both of its threads alive."""
+        return (bool(self._threads) and not self._stop_event.is_set() and
+                all(thread.is_alive() for thread in self._threads.values()))
+
+    def start(self):
+        """Start the background listening and recognition threads, restarting any that died."""
+        if self.running:
+            return
+        restarting = bool(self._threads) and not self._stop_event.is_set()
+        if restarting and time.monotonic() - self._last_start < VOICE_RESTART_DELAY:
+            return
+        self._last_start = time.monotonic()
+        self._stop_event.clear()
+        for target, name in ((self._listen_loop, "voice-listen"),
+                             (self._recognize_loop, "voice-recognize")):
+            thread = self._threads.get(name)
+            if thread is not None and thread.is_alive():
+                continue  # Still inside listen() from before a stop(); it carries on
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads[name] = thread
+        print("Restarting voice listener..." if restarting else "Listening for voice commands...")
+
+    def stop(self):
+        """Stop the background threads and discard pending audio."""
+        if not self._threads or self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        deadline = time.monotonic() + STOP_TIMEOUT
+        for thread in self._threads.values():
+            thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        # A thread still blocked (e.g. in a slow online recognition) is kept so
+        # start() reuses it rather than opening a second listener
+        self._threads = {name: thread for name, thread in self._threads.items() if thread.is_alive()}
+        if self._threads:
+            print(f"Voice threads still finishing: {', '.join(self._threads)}")
+        while not self._audio_queue.empty():
+            self._audio_queue.get_nowait()
+        self._print_latency_report()
+
+    @metrics.timed("process_seconds", controller="voice")
+    def listen_for_commands(self):
+        """
+        Execute any voice commands recognized since the last call.
+
+        Starts the background listener on first use. Never blocks.
+
+        Returns:
+            str or None: Label of the last executed command or None if no command recognized
+        """
+        if not self.running:
+            self.start()
+
+        label = None
+        while True:
+            try:
+                command, utterance_end = self.commands.get_nowait()
+            except queue.Empty:
+                break
+            self._execute_command(command, utterance_end)
+            label = command.label
+        return label
+
+    def _calibrate(self, source):
+        """Re-measure ambient noise so the energy threshold tracks the room."""
+        self.recognizer.adjust_for_ambient_noise(source, duration=VOICE_CALIBRATION_DURATION)
+        self._last_calibration = time.monotonic()
+
+    def _listen_loop(self):
+        """Capture phrases from the microphone and hand them to the recognizer thread."""
+        try:
+            with self.mic as source:
+                self._calibrate(source)
+                while not self._stop_event.is_set():
+                    if time.monotonic() - self._last_calibration > VOICE_CALIBRATION_INTERVAL:
+                        self._calibrate(source)
+                    try:
+                        audio = self.recognizer.listen(source, timeout=VOICE_LISTEN_TIMEOUT,
+                                                       phrase_time_limit=VOICE_PHRASE_TIME_LIMIT)
+                    except sr.WaitTimeoutError:
+                        continue
+
+                    # listen() returns as soon as the phrase has ended
+                    item = (audio, time.monotonic())
+                    try:
+                        self._audio_queue.put_nowait(item)
+                    except queue.Full:
+                        # Recognition is behind; drop the oldest phrase
+                        self._audio_queue.get_nowait()
+                        self._audio_queue.put_nowait(item)
+        except Exception as e:
+            print(f"Voice listener error: {e}")
+
+    def _recognize_loop(self):
+        """Recognize captured phrases and post parsed commands to the queue."""
+        while not self._stop_event.is_set():
+            try:
+                audio, utterance_end = self._audio_queue.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            try:
+                text = self.backend.recognize(audio)
+            except sr.UnknownValueError:
+                continue
+            except Exception as e:
+                print(f"Voice recognition error: {e}")
+                continue
+            finally:
+                elapsed = time.monotonic() - utterance_end
+                self.latency.record(f"{self.backend.name}/recognition", elapsed)
+                metrics.observe("recognition_seconds", elapsed, backend=self.backend.name)
+
+            print(f"Detected command: {text}")
+            command = self._parse_command(text)
+            if command is not None:
+                self.commands.put((command, utterance_end))
+
+    def _parse_command(self, text):
+        """
+        Map recognized speech to the action bound to it in the active profile.
+
+        Args:
+            text (str): Recognized phrase
+
+        Returns:
+            Binding or None: The action, or None if the phrase holds no command
+        """
+        return self.action_map.voice(text)
+
+    def _print_latency_report(self):
+        """Print utterance-end to recognition and to action latency for the backend."""
+        report = self.latency.report()
+        source = f"voice/{self.backend.name}"
+        report[f"{self.backend.name}/end_to_action"] = self.dispatcher.latency.summary(source)
+        for key, summary in report.items():
+            if summary:
+                print(f"Voice latency {key}: n={summary['count']} "
+                      f"p50={summary['p50_ms']:.0f}ms p95={summary['p95_ms']:.0f}ms")
+
+    def _execute_command(self, command, utterance_end=None):
+        """
+        Queue the action for a parsed voice command.
+
+        Args:
+            command: Binding from _parse_command()
+            utterance_end (float): time.monotonic() when the phrase ended, for latency tracking
+        """
+        source = f"voice/{self.backend.name}"
+        self.dispatcher.submit(command.kind, command.args, command.label, source, utterance_end)
@@ -0,0 +1,3 @@
+"""
+Execution pipelines that move frames from capture through detection to display.
+"""
@@ -0,0 +1,77 @@
+"""
+Detector orchestration: run every enabled detector on one shared frame in parallel.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DetectorOrchestrator:
+    """
+    Runs the detectors concurrently on one shared, read-only RGB frame.
+
+    MediaPipe releases the GIL while running inference, so per-frame latency
+    is roughly that of the slowest detector rather than the sum of all of them.
+    Results are merged and applied in a fixed order, after every detector has
+    finished, so drawing never races with inference.
+    """
+    def __init__(self, detectors, max_workers=None):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            detectors (dict): Controllers with detect()/handle_result(), keyed by name
+            max_workers (int): Thread pool size, defaults to one thread per detector
+        """
+        self.detectors = detectors
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, len(detectors)),
+            thread_name_prefix="detector"
+        )
+
+    def detect_rgb(self, rgb_frame, names, timestamp=None):
+        """
+        Run the named detectors on an RGB frame converted once by the frame pool.
+
+        Args:
+            rgb_frame: RGB image shared by all detectors
+            names: Names of the detectors to run
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+
+        Returns:
+            dict: Detection result for each detector that succeeded, keyed by name
+        """
+        futures = {
+            name: self.executor.submit(self.detectors[name].detect, rgb_frame, timestamp)
+            for name in names
+        }
+
+        results = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Error in {name} detector: {e}")
+        return results
+
+    def apply(self, frame, results, overlay=None, timestamp=None):
+        """
+        Apply merged detection results to the frame, in detector order.
+
+        Args:
+            frame: OpenCV BGR image frame to draw on
+            results (dict): Detection results keyed by detector name
+            overlay: Overlay collecting the drawings; if None each detector draws immediately
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+
+        Returns:
+            processed_frame: Frame with every detector's overlay drawn
+            outputs (dict): Second value returned by each handle_result(), keyed by name
+        """
+        outputs = {}
+        for name, controller in self.detectors.items():
+            if name in results:
+                frame, outputs[name] = controller.handle_result(frame, results[name], overlay, timestamp)
+        return frame, outputs
+
+    def shutdown(self):
+        """Stop the worker threads."""
+        self.executor.shutdown(wait=False)
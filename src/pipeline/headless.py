@@ -0,0 +1,129 @@
+"""
+Headless batch runner: process a frame source without a display.
+
+Frames are processed as fast as the CPU allows and each frame's detected
+gesture, face state and requested actions are written as one JSON line,
+so recorded sessions can be benchmarked and compared against golden output.
+"""
+import json
+import sys
+import time
+
+from ..utils.frames import FramePool
+from ..utils.metrics import metrics
+from ..utils.renderer import Overlay
+
+
+class HeadlessRunner:
+    """
+    Runs the active detectors on every frame of a source and logs the results.
+    """
+    def __init__(self, media_controller, output=None):
+        """
+        Initialize the runner.
+
+        Args:
+            media_controller: MediaController that owns the detectors and dispatcher
+            output: JSONL file to write, "-" for stdout, an open text stream, or None for no log
+        """
+        self.media = media_controller
+        self.output = output
+        self.frames = 0
+        self.elapsed = 0.0
+        self._actions = []
+
+    def run(self, source):
+        """
+        Process every frame of a source.
+
+        Args:
+            source: FrameSource (or opened cv2.VideoCapture)
+
+        Returns:
+            dict: Frame count, elapsed seconds and frames per second
+        """
+        self.media.dispatcher.add_listener(self._actions.append)
+        pool = FramePool(frame_scaler=self.media.frame_scaler)
+        stream = self._open_output()
+        start = time.perf_counter()
+        try:
+            while source.isOpened():
+                # Read and mirror into a pooled buffer, as the interactive loops do
+                with metrics.timer("capture_seconds"):
+                    ret, buffer = pool.read(source)
+                if not ret:
+                    break
+                rgb_frame = pool.to_rgb(buffer) if self.media.active_detectors() else None
+                record = self.process(buffer.frame, getattr(source, "timestamp", None), rgb_frame)
+                buffer.release()
+                metrics.inc("frames_total")
+                if stream is not None:
+                    stream.write(json.dumps(record) + "\n")
+        finally:
+            self.elapsed = time.perf_counter() - start
+            if stream is not None and stream is not self.output and stream is not sys.stdout:
+                stream.close()
+
+        summary = self.summary()
+        print(f"Processed {summary['frames']} frames in {summary['seconds']:.2f}s "
+              f"({summary['fps']:.1f} FPS)", file=sys.stderr)
+        return summary
+
+    def process(self, frame, timestamp=None, rgb_frame=None):
+        """
+        Run the active detectors on one frame.
+
+        Args:
+            frame: Mirrored OpenCV BGR image frame
+            timestamp (float): Frame time in seconds
+            rgb_frame: The frame converted for the detectors, shared by all of them;
+                each detector converts its own copy if None
+
+        Returns:
+            dict: JSON-serialisable record of what was detected and requested
+        """
+        overlay = Overlay()
+        names = self.media.active_detectors()
+        outputs = {}
+
+        if self.media.orchestrator is not None:
+            if rgb_frame is None:
+                rgb_frame = self.media.frame_scaler.to_rgb(frame)
+            results = self.media.orchestrator.detect_rgb(rgb_frame, names, timestamp)
+            frame, outputs = self.media.orchestrator.apply(frame, results, overlay, timestamp)
+        else:
+            for name in names:
+                controller = self.media.detectors[name]
+                frame, outputs[name] = controller.process_frame(frame, overlay, timestamp=timestamp,
+                                                                rgb_frame=rgb_frame)
+
+        record = {
+            "frame": self.frames,
+            "timestamp": timestamp,
+            "gesture": outputs.get("gesture"),
+            "face": self.media.face_controller.attentive if "face" in names else None,
+            "actions": [
+                {"kind": action.kind, "args": action.args, "label": action.label, "source": action.source}
+                for action in self._actions
+            ]
+        }
+        self._actions.clear()
+        self.frames += 1
+        return record
+
+    def summary(self):
+        """Return the frame count, elapsed seconds and throughput of the last run."""
+        return {
+            "frames": self.frames,
+            "seconds": self.elapsed,
+            "fps": self.frames / self.elapsed if self.elapsed > 0 else 0.0
+        }
+
+    def _open_output(self):
+        if self.output is None:
+            return None
+        if self.output == "-":
+            return sys.stdout
+        if hasattr(self.output, "write"):
+            return self.output
+        return open(self.output, "w", encoding="utf-8")
@@ -0,0 +1,429 @@
+"""
+Detector worker processes fed through shared memory.
+
+Each detector runs in its own process, so its Python-side work (result
+conversion, ROI cropping, head pose) never contends for the main process's
+GIL. Frames are copied once into a shared memory ring instead of being
+pickled; only a small slot description goes to the worker and only plain
+result values (landmarks, category names and scores, face boxes) come back.
+"""
+import multiprocessing
+import queue
+import sys
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..config import PROCESS_RING_SLOTS, PROCESS_RESULT_TIMEOUT, PROCESS_START_METHOD
+from ..utils.metrics import metrics
+from .detectors import DetectorOrchestrator
+
+# Where a worker finds a frame: shared memory block name, byte offset, array
+# layout, plus the frame time and an ID the worker echoes with its result
+FrameSlot = namedtuple("FrameSlot", ["memory", "offset", "shape", "dtype", "timestamp", "frame_id"])
+
+# Seconds between checks that a loading worker is still alive
+LIVENESS_INTERVAL = 0.1
+
+
+class SharedFrameRing:
+    """
+    Equally sized frame slots in one shared memory block.
+
+    A slot is only written again once every worker it was sent to has
+    answered for it, so a frame is never overwritten while still queued or
+    being read. The block is sized for the first frame written and replaced
+    by a larger one if a bigger frame arrives (e.g. when the inference
+    resolution grows), but only once no slot is in use, so no queued request
+    ever points at a block that is gone.
+    """
+    def __init__(self, slots=PROCESS_RING_SLOTS):
+        """
+        Initialize the ring; memory is allocated on the first write.
+
+        Args:
+            slots (int): Number of frames that can be in flight at once
+        """
+        self.slots = slots
+        self.slot_bytes = 0
+        self.memory = None
+        self._readers = [0] * slots  # Workers yet to answer for each slot's frame
+        self._in_flight = {}  # Slot index of each frame ID still being read
+        self._frame_id = 0
+
+    @property
+    def free(self):
+        """Number of slots that can be written."""
+        return self._readers.count(0)
+
+    def write(self, frame, timestamp=None, readers=1):
+        """
+        Copy a frame into a free slot.
+
+        Args:
+            frame: NumPy image array
+            timestamp (float): Frame time passed on to the detector
+            readers (int): Number of workers the frame is sent to; the slot is
+                free again after as many release() calls
+
+        Returns:
+            FrameSlot or None: Description of the slot for read_slot(), or None
+            if no slot is free (or the block must grow while slots are in use)
+        """
+        if frame.nbytes > self.slot_bytes:
+            if self._in_flight:
+                return None
+            self._allocate(frame.nbytes)
+        if not self.free:
+            return None
+        index = self._readers.index(0)
+        self._readers[index] = readers
+        self._frame_id += 1
+        self._in_flight[self._frame_id] = index
+
+        offset = index * self.slot_bytes
+        view = np.ndarray(frame.shape, frame.dtype, buffer=self.memory.buf, offset=offset)
+        np.copyto(view, frame)
+        del view  # The block cannot be closed while views of it exist
+        return FrameSlot(self.memory.name, offset, frame.shape, frame.dtype.str, timestamp, self._frame_id)
+
+    def release(self, frame_id):
+        """Record that one worker has finished with a frame."""
+        index = self._in_flight.get(frame_id)
+        if index is None:
+            return
+        self._readers[index] -= 1
+        if self._readers[index] == 0:
+            del self._in_flight[frame_id]
+
+    def _allocate(self, slot_bytes):
+        self.close()
+        self.memory = shared_memory.SharedMemory(create=True, size=slot_bytes * self.slots)
+        self.slot_bytes = slot_bytes
+
+    def close(self):
+        """Release and remove the shared memory block."""
+        if self.memory is not None:
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+            self.slot_bytes = 0
+        self._readers = [0] * self.slots
+        self._in_flight.clear()
+
+
+def read_slot(slot, attached):
+    """
+    Return a read-only view of the frame in a slot.
+
+    Args:
+        slot: FrameSlot written by SharedFrameRing.write()
+        attached (dict): Shared memory blocks this process has opened, keyed by
+            name; blocks the ring has since replaced are closed
+
+    Returns:
+        numpy.ndarray: The frame, backed by shared memory
+    """
+    memory = attached.get(slot.memory)
+    if memory is None:
+        for old in attached.values():
+            old.close()
+        attached.clear()
+        memory = attached[slot.memory] = shared_memory.SharedMemory(name=slot.memory)
+    frame = np.ndarray(slot.shape, np.dtype(slot.dtype), buffer=memory.buf, offset=slot.offset)
+    frame.setflags(write=False)
+    return frame
+
+
+def create_gesture_detector():
+    """Build a gesture recognizer for a worker process; actions are never executed there."""
+    from ..controllers.gesture_controller import GestureController
+    from ..utils.actions import ActionDispatcher
+    return GestureController(None, dispatcher=ActionDispatcher(dry_run=True))
+
+
+def create_face_detector():
+    """Build a face detector for a worker process; actions are never executed there."""
+    from ..controllers.face_controller import FaceController
+    from ..utils.actions import ActionDispatcher
+    return FaceController(dispatcher=ActionDispatcher(dry_run=True))
+
+
+# Worker-side detector factories keyed by detector name; they must be picklable
+WORKER_FACTORIES = {
+    "gesture": create_gesture_detector,
+    "face": create_face_detector
+}
+
+
+def _worker_main(factory, requests, results):
+    """
+    Entry point of a worker process: build the detector, then detect on every
+    slot received until None arrives.
+
+    Messages sent back are (kind, frame ID, value, seconds) tuples, where kind
+    is "ready", "failed", "result" or "error".
+    """
+    # Workers only log (model downloads), and a headless run may be writing records to stdout
+    sys.stdout = sys.stderr
+    try:
+        detector = factory()
+    except Exception as e:
+        results.put(("failed", None, str(e), 0.0))
+        return
+    results.put(("ready", None, None, 0.0))
+
+    attached = {}
+    try:
+        while True:
+            slot = requests.get()
+            if slot is None:
+                break
+            frame = None
+            try:
+                frame = read_slot(slot, attached)
+                start = time.perf_counter()
+                packed = detector.pack_result(detector.detect(frame, slot.timestamp))
+                results.put(("result", slot.frame_id, packed, time.perf_counter() - start))
+            except Exception as e:
+                results.put(("error", slot.frame_id, str(e), 0.0))
+            finally:
+                del frame
+    except KeyboardInterrupt:
+        pass  # The main process shuts the workers down
+    finally:
+        for memory in attached.values():
+            memory.close()
+
+
+class DetectorWorker:
+    """
+    One detector running in a worker process.
+
+    The process starts immediately and builds its detector in the background;
+    frames are only sent once it has reported that it is ready. Frames sent
+    are tracked until the worker answers for them, even after their results
+    are no longer wanted, so their ring slots can be reused.
+    """
+    def __init__(self, name, factory, context):
+        """
+        Start the worker process.
+
+        Args:
+            name (str): Detector name, used in log messages and the process name
+            factory: Picklable callable that builds the detector in the worker
+            context: multiprocessing context used to create the process and queues
+        """
+        self.name = name
+        self.requests = context.Queue()
+        self.results = context.Queue()
+        self.ready = False
+        self.error = None
+        self.pending = set()  # IDs of frames sent that the worker has not answered for
+        self.process = context.Process(target=_worker_main, args=(factory, self.requests, self.results),
+                                       name=f"detector-{name}", daemon=True)
+        self.process.start()
+
+    def poll(self, timeout=0.0):
+        """
+        Check whether the detector has finished loading.
+
+        A worker that exits before reporting (e.g. it crashed importing the
+        model runtime) is marked as failed instead of being waited for.
+
+        Args:
+            timeout (float): Seconds to wait for it, or None to wait until it
+                is ready or has failed
+
+        Returns:
+            bool: Whether the worker is ready to take frames
+        """
+        if self.ready or self.error is not None:
+            return self.ready
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            # Checked before reading, so an empty queue afterwards means no report is coming
+            alive = self.process.is_alive()
+            wait = LIVENESS_INTERVAL if deadline is None else min(LIVENESS_INTERVAL, deadline - time.monotonic())
+            try:
+                kind, _, value, _ = self.results.get(timeout=wait) if wait > 0.0 else self.results.get_nowait()
+                break
+            except queue.Empty:
+                if not alive:
+                    self.error = f"worker process exited with code {self.process.exitcode} before loading"
+                    print(f"Error loading {self.name} detector: {self.error}")
+                    return False
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+        if kind == "ready":
+            self.ready = True
+        else:
+            self.error = value
+            print(f"Error loading {self.name} detector: {value}")
+        return self.ready
+
+    @property
+    def busy(self):
+        """Whether the worker still has a frame to answer for."""
+        return bool(self.pending)
+
+    def submit(self, slot):
+        """Send a frame slot to the worker."""
+        self.pending.add(slot.frame_id)
+        self.requests.put(slot)
+
+    def collect(self, frame_id, deadline, on_done):
+        """
+        Wait for the worker's result for one frame.
+
+        Results for earlier frames, which arrived after their own deadline,
+        are discarded, but still count as the worker being done with them.
+
+        Args:
+            frame_id (int): FrameSlot.frame_id of the frame, or None to only
+                take in the answers that have already arrived
+            deadline (float): time.monotonic() value to give up at
+            on_done: Called with the ID of every frame the worker has answered for
+
+        Returns:
+            tuple or None: (kind, value, seconds), or None on timeout
+        """
+        while True:
+            try:
+                kind, result_id, value, seconds = self.results.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return None
+            if result_id in self.pending:
+                self.pending.discard(result_id)
+                on_done(result_id)
+            if result_id == frame_id:
+                return kind, value, seconds
+
+    def abandon(self, on_done):
+        """Give up on a worker whose process has died, releasing the frames it held."""
+        self.ready = False
+        self.error = f"worker process exited with code {self.process.exitcode}"
+        print(f"Error in {self.name} detector: {self.error}")
+        for frame_id in self.pending:
+            on_done(frame_id)
+        self.pending.clear()
+
+    def stop(self, timeout=1.0):
+        """Ask the worker to exit, terminating it if it does not."""
+        if self.process.is_alive():
+            self.requests.put(None)
+            self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout)
+        for channel in (self.requests, self.results):
+            channel.cancel_join_thread()
+            channel.close()
+        self.process.close()
+
+
+class ProcessOrchestrator(DetectorOrchestrator):
+    """
+    Runs each detector in its own worker process on a shared memory frame.
+
+    Like DetectorOrchestrator, every requested detector sees the same frame
+    and the results are applied in the main process in detector order. The
+    controllers given here only handle results; workers are started on a
+    detector's first request, and it is skipped until its worker is ready.
+    A worker still busy with an earlier frame (one that timed out) is
+    skipped too, so its request queue never grows, and a frame is dropped
+    when no ring slot is free.
+    """
+    def __init__(self, detectors, factories=None, slots=PROCESS_RING_SLOTS,
+                 timeout=PROCESS_RESULT_TIMEOUT, start_method=PROCESS_START_METHOD):
+        """
+        Initialize the orchestrator.
+
+        Args:
+            detectors (dict): Controllers with handle_result()/unpack_result(), keyed by name
+            factories (dict): Picklable worker-side detector factories keyed by name,
+                defaults to WORKER_FACTORIES
+            slots (int): Frame slots in the shared memory ring
+            timeout (float): Seconds to wait for each frame's results
+            start_method (str): multiprocessing start method for the workers
+        """
+        self.detectors = detectors
+        self.factories = factories or WORKER_FACTORIES
+        self.timeout = timeout
+        self.ring = SharedFrameRing(slots)
+        self.context = multiprocessing.get_context(start_method)
+        self.workers = {}
+        self.inference_seconds = {}  # Worker-side inference time of the last frame, by name
+
+    def _worker(self, name):
+        """Return the worker of a detector, starting it on first use."""
+        if name not in self.workers:
+            self.workers[name] = DetectorWorker(name, self.factories[name], self.context)
+        return self.workers[name]
+
+    def wait_until_ready(self, names):
+        """Start the named detectors' workers if needed and block until each has loaded or failed."""
+        for name in names:
+            self._worker(name).poll(timeout=None)
+
+    def detect_rgb(self, rgb_frame, names, timestamp=None):
+        """
+        Run the named detectors on an RGB frame in their worker processes.
+
+        Args:
+            rgb_frame: RGB image shared by all detectors
+            names: Names of the detectors to run
+            timestamp (float): Frame time in seconds, defaults to time.monotonic()
+
+        Returns:
+            dict: Detection result for each detector that answered in time, keyed by name
+        """
+        workers = [self._worker(name) for name in names]
+        idle = []
+        for worker in workers:
+            if not worker.poll():
+                continue
+            # Take in late answers to earlier frames, freeing their slots
+            worker.collect(None, 0.0, self.ring.release)
+            if not worker.busy:
+                idle.append(worker)
+            elif not worker.process.is_alive():
+                worker.abandon(self.ring.release)
+            else:
+                metrics.inc("worker_busy_skips_total", detector=worker.name)
+        workers = idle
+        if not workers:
+            return {}
+
+        slot = self.ring.write(rgb_frame, timestamp, readers=len(workers))
+        if slot is None:
+            metrics.inc("ring_full_drops_total")
+            return {}
+        for worker in workers:
+            worker.submit(slot)
+
+        results = {}
+        self.inference_seconds = {}
+        deadline = time.monotonic() + self.timeout
+        for worker in workers:
+            message = worker.collect(slot.frame_id, deadline, self.ring.release)
+            if message is None:
+                metrics.inc("worker_timeouts_total", detector=worker.name)
+                continue
+            kind, value, seconds = message
+            if kind == "error":
+                print(f"Error in {worker.name} detector: {value}")
+                continue
+            metrics.observe("inference_seconds", seconds, detector=worker.name)
+            self.inference_seconds[worker.name] = seconds
+            results[worker.name] = self.detectors[worker.name].unpack_result(value)
+        return results
+
+    def shutdown(self):
+        """Stop the worker processes and release the shared memory."""
+        for worker in self.workers.values():
+            worker.stop()
+        self.workers.clear()
+        self.ring.close()
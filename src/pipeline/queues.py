@@ -0,0 +1,70 @@
+"""
+Bounded queues for passing frames between pipeline stages.
+"""
+import threading
+from collections import deque
+
+
+class LatestQueue:
+    """
+    Bounded queue that drops its oldest item when full.
+
+    A slow consumer therefore always sees the newest frames, and stale
+    frames never pile up behind it.
+    """
+    def __init__(self, maxsize=1, on_drop=None):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize (int): Number of items kept before the oldest is dropped
+            on_drop: Called with each dropped item, e.g. to release its frame buffer
+        """
+        self._items = deque(maxlen=maxsize)
+        self.on_drop = on_drop
+        self._condition = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        """Add an item, discarding the oldest one if the queue is full."""
+        dropped = None
+        with self._condition:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+                dropped = self._items[0]
+            self._items.append(item)
+            self._condition.notify()
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+
+    def get(self, timeout=None):
+        """
+        Remove and return the oldest queued item.
+
+        Args:
+            timeout (float): Seconds to wait for an item, or None to wait forever
+
+        Returns:
+            The item, or None if the wait timed out or the queue was closed
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._items or self._closed, timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        """Wake up all waiting consumers; later gets return None once empty."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    @property
+    def closed(self):
+        """Whether close() has been called."""
+        return self._closed
+
+    def __len__(self):
+        with self._condition:
+            return len(self._items)
@@ -0,0 +1,243 @@
+"""
+Frame sources: webcam, video file, image directory or synthetic frames.
+
+Every source has the small part of the cv2.VideoCapture interface the
+pipelines use (isOpened, read, release), plus the timestamp of the last
+frame read. Live sources are stamped with the wall clock; recorded and
+synthetic sources use media time, so replaying them gives the same
+results however fast the frames are processed.
+"""
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from ..config import CAMERA_INDEX, REPLAY_FPS, SYNTHETIC_SIZE, SYNTHETIC_FRAMES
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+class FrameSource:
+    """
+    Base class for frame sources.
+    """
+    # Live sources deliver frames at their own pace; the others as fast as they are read
+    realtime = False
+
+    def __init__(self):
+        """Initialize the source."""
+        self.frame_index = -1
+        self.timestamp = None
+
+    def isOpened(self):
+        """Return True while frames can still be read."""
+        raise NotImplementedError
+
+    def read(self, image=None):
+        """
+        Read the next frame.
+
+        Args:
+            image: Array to read into if the source can, like cv2.VideoCapture.read(image);
+                the returned frame may still be a different array
+
+        Returns:
+            tuple: (ret, frame) like cv2.VideoCapture.read()
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """Release the underlying device or file."""
+
+    def _advance(self, fps):
+        """Step the frame counter and stamp the frame in media time."""
+        self.frame_index += 1
+        self.timestamp = self.frame_index / fps
+
+
+class CameraSource(FrameSource):
+    """
+    Live frames from a webcam.
+    """
+    realtime = True
+
+    def __init__(self, index=CAMERA_INDEX):
+        """
+        Initialize the source.
+
+        Args:
+            index (int): OpenCV camera index
+        """
+        super().__init__()
+        self.capture = cv2.VideoCapture(index)
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        ret, frame = self.capture.read(image=image)
+        if ret:
+            self.frame_index += 1
+            self.timestamp = time.monotonic()
+        return ret, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class VideoFileSource(FrameSource):
+    """
+    Frames from a recorded video file.
+    """
+    def __init__(self, path):
+        """
+        Initialize the source.
+
+        Args:
+            path (str): Path of the video file
+        """
+        super().__init__()
+        self.capture = cv2.VideoCapture(path)
+        self.fps = self.capture.get(cv2.CAP_PROP_FPS) or REPLAY_FPS
+
+    def isOpened(self):
+        return self.capture.isOpened()
+
+    def read(self, image=None):
+        ret, frame = self.capture.read(image=image)
+        if ret:
+            self._advance(self.fps)
+        return ret, frame
+
+    def release(self):
+        self.capture.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """
+    Frames from the images in a directory, in file name order.
+    """
+    def __init__(self, path, fps=REPLAY_FPS):
+        """
+        Initialize the source.
+
+        Args:
+            path (str): Directory containing the images
+            fps (float): Frame rate the images were captured at
+        """
+        super().__init__()
+        self.fps = fps
+        self.paths = sorted(
+            file_path for file_path in glob.glob(os.path.join(path, "*"))
+            if file_path.lower().endswith(IMAGE_EXTENSIONS)
+        )
+
+    def isOpened(self):
+        return self.frame_index + 1 < len(self.paths)
+
+    def read(self, image=None):
+        if not self.isOpened():
+            return False, None
+        frame = cv2.imread(self.paths[self.frame_index + 1])
+        if frame is None:
+            return False, None
+        self._advance(self.fps)
+        return True, frame
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames with a moving bright blob, for throughput tests without recordings.
+    """
+    def __init__(self, size=SYNTHETIC_SIZE, frames=SYNTHETIC_FRAMES, fps=REPLAY_FPS):
+        """
+        Initialize the source.
+
+        Args:
+            size (tuple): Frame (width, height)
+            frames (int): Number of frames to generate
+            fps (float): Nominal frame rate used for timestamps
+        """
+        super().__init__()
+        self.size = size
+        self.frames = frames
+        self.fps = fps
+        width, height = size
+        # Static background gradient, built once
+        row = np.linspace(40, 90, width, dtype=np.uint8)
+        self.background = np.repeat(np.tile(row, (height, 1))[:, :, None], 3, axis=2)
+
+    def isOpened(self):
+        return self.frame_index + 1 < self.frames
+
+    def read(self, image=None):
+        if not self.isOpened():
+            return False, None
+        self._advance(self.fps)
+        width, height = self.size
+        phase = 2 * np.pi * self.frame_index / max(1, self.frames)
+        center = (int(width * (0.5 + 0.35 * np.cos(phase))), int(height * (0.5 + 0.35 * np.sin(phase))))
+        if image is not None and image.shape == self.background.shape:
+            frame = image
+            np.copyto(frame, self.background)
+        else:
+            frame = self.background.copy()
+        cv2.circle(frame, center, max(4, min(width, height) // 10), (200, 220, 240), -1)
+        return True, frame
+
+
+def open_source(spec=None):
+    """
+    Open a frame source from a command line style description.
+
+    Args:
+        spec (str): None or a camera index for a webcam, "synthetic" for
+            generated frames, a directory of images, or a video file path
+
+    Returns:
+        FrameSource
+    """
+    if spec is None:
+        return CameraSource()
+    if str(spec).isdigit():
+        return CameraSource(int(spec))
+    if spec == "synthetic":
+        return SyntheticSource()
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec)
+    if not os.path.exists(spec):
+        raise FileNotFoundError(f"Frame source not found: {spec}")
+    return VideoFileSource(spec)
+
+
+def open_sources(specs):
+    """
+    Open several frame sources at once.
+
+    Opening a webcam can take a second or more, so the sources are opened
+    in parallel rather than one after another.
+
+    Args:
+        specs (dict): open_source() specs keyed by source name
+
+    Returns:
+        dict: FrameSource for each name, in the order of specs
+    """
+    with ThreadPoolExecutor(max_workers=max(1, len(specs)), thread_name_prefix="open-source") as executor:
+        futures = {name: executor.submit(open_source, spec) for name, spec in specs.items()}
+
+    sources = {}
+    error = None
+    for name, future in futures.items():
+        try:
+            sources[name] = future.result()
+        except FileNotFoundError as e:
+            error = error or e
+    if error is not None:
+        for source in sources.values():
+            source.release()
+        raise error
+    return sources
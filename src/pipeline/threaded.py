@@ -0,0 +1,229 @@
+"""
+Threaded capture / inference / render pipeline.
+
+Capture, each detector and rendering run as separate stages connected by
+drop-oldest queues, so frame rate is bounded by the slowest stage instead
+of the sum of all of them. Several sources (cameras) can feed the pipeline,
+each captured on its own thread.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from .queues import LatestQueue
+from ..config import FRAME_QUEUE_SIZE
+from ..utils.frames import FramePool
+from ..utils.metrics import metrics
+from ..utils.renderer import Overlay
+from ..utils.stats import LatencyTracker
+
+# A captured frame travelling through the pipeline, with its read-only RGB copy
+# and the pooled buffer holding both; each queue's packet holds one buffer reference.
+# Timestamps of all sources come from the same monotonic clock.
+FramePacket = namedtuple("FramePacket", ["source", "seq", "timestamp", "frame", "rgb_frame", "buffer"])
+
+
+def release_packet(packet):
+    """Release a packet's frame buffer reference."""
+    packet.buffer.release()
+
+
+class ThreadedPipeline:
+    """
+    Runs capture and every detector on their own threads, rendering on the caller's thread.
+
+    Each source is captured on its own thread and only feeds the detectors
+    routed to it, so every detector runs at its own source's rate and a slow
+    camera never holds back the others. OpenCV windows must be driven from
+    the main thread, so rendering and keyboard handling stay on the thread
+    that calls run().
+    """
+    def __init__(self, media_controller, queue_size=FRAME_QUEUE_SIZE, latency=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            media_controller: MediaController that owns the detectors and display
+            queue_size (int): Capacity of each inter-stage queue
+            latency: LatencyTracker for capture-to-display time, created if None
+        """
+        self.media = media_controller
+        self.queue_size = queue_size
+        self.latency = latency if latency is not None else LatencyTracker()
+        self.pools = {}
+        self.render_queues = {}
+        self.display_source = None  # Shown in the main window; the pipeline ends with it
+        self.detector_queues = {}
+        self.detector_sources = {}  # Source each detector runs on
+        self.latest_results = {}  # (seq, capture timestamp, result) of each detector
+        self._drawn = {}  # (seq, Overlay) of the result each detector last handled
+        self._results_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+
+    def run(self, cap):
+        """
+        Run the pipeline until the user quits or capture fails.
+
+        Args:
+            cap: Opened cv2.VideoCapture or FrameSource, or a dict of them keyed by
+                source name, of which the first is displayed in the main window
+        """
+        sources = cap if isinstance(cap, dict) else {"main": cap}
+        self.display_source = next(iter(sources))
+        # Each capture thread converts into its own scaler's buffer, at the shared resolution
+        for source_name in sources:
+            self.pools[source_name] = FramePool(frame_scaler=self.media.frame_scaler.clone())
+            self.render_queues[source_name] = LatestQueue(self.queue_size, on_drop=release_packet)
+
+        # Detectors without a (known) route run on the displayed source
+        routes = getattr(self.media, "detector_sources", {})
+        for name in self.media.detectors:
+            source_name = routes.get(name)
+            self.detector_sources[name] = source_name if source_name in sources else self.display_source
+            self.detector_queues[name] = LatestQueue(self.queue_size, on_drop=release_packet)
+
+        for source_name, source in sources.items():
+            self._start_thread(self._capture_loop, f"capture-{source_name}", source_name, source)
+        for name, controller in self.media.detectors.items():
+            self._start_thread(self._detector_loop, f"detect-{name}", name, controller)
+
+        try:
+            self._render_loop()
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Signal every stage to finish and wait for the worker threads."""
+        self._stop_event.set()
+        for queue in self.render_queues.values():
+            queue.close()
+        for queue in self.detector_queues.values():
+            queue.close()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+        self._threads = []
+
+    def _start_thread(self, target, name, *args):
+        thread = threading.Thread(target=target, name=name, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _capture_loop(self, source_name, cap):
+        """Read frames from one source and fan them out to its detector and render queues."""
+        pool = self.pools[source_name]
+        render_queue = self.render_queues[source_name]
+        detector_queues = [
+            queue for name, queue in self.detector_queues.items() if self.detector_sources[name] == source_name
+        ]
+        seq = 0
+        while not self._stop_event.is_set():
+            # Read and mirror into a pooled buffer
+            with metrics.timer("capture_seconds"):
+                ret, buffer = pool.read(cap)
+            if not ret:
+                print(f"Error: Failed to capture frame from source '{source_name}'.")
+                break
+            seq += 1
+
+            # Convert once here; every detector on this source reads the same RGB buffer
+            rgb_frame = pool.to_rgb(buffer) if detector_queues else None
+            packet = FramePacket(source_name, seq, time.monotonic(), buffer.frame, rgb_frame, buffer)
+            buffer.retain(len(detector_queues) + 1)
+            for queue in detector_queues:
+                queue.put(packet)
+            render_queue.put(packet)
+            buffer.release()  # The capture stage's own reference
+
+        render_queue.close()
+
+    def _detector_loop(self, name, controller):
+        """Run one detector on the newest frame whenever it is free."""
+        queue = self.detector_queues[name]
+        while not self._stop_event.is_set():
+            packet = queue.get(timeout=0.1)
+            if packet is None:
+                if queue.closed:
+                    break
+                continue
+            try:
+                if not self.media.is_active(name):
+                    # Drop the cached result so it is not drawn when re-enabled
+                    with self._results_lock:
+                        self.latest_results.pop(name, None)
+                    continue
+
+                start = time.perf_counter()
+                result = controller.detect(packet.rgb_frame, packet.timestamp)
+                if self.media.governor is not None:
+                    self.media.governor.update(time.perf_counter() - start, key=name)
+            except Exception as e:
+                print(f"Error in {name} detector: {e}")
+                continue
+            finally:
+                packet.buffer.release()
+
+            with self._results_lock:
+                self.latest_results[name] = (packet.seq, packet.timestamp, result)
+
+    def _render_loop(self):
+        """Overlay the newest detector results on the newest frame of each source and display it."""
+        render_queue = self.render_queues[self.display_source]
+        running = True
+        while running:
+            packet = render_queue.get(timeout=0.5)
+            if packet is None:
+                if render_queue.closed:
+                    break
+                continue
+
+            with self._results_lock:
+                results = dict(self.latest_results)
+
+            # Other sources are shown whenever they have a new frame, at most
+            # once per displayed frame
+            for source_name, queue in self.render_queues.items():
+                other = queue.get(timeout=0) if source_name != self.display_source else None
+                if other is not None:
+                    frame, overlay = self._apply_results(other, results)
+                    self.media.show_source(source_name, frame, overlay)
+                    other.buffer.release()
+
+            frame, overlay = self._apply_results(packet, results)
+
+            if self.media.is_active("voice"):
+                self.media.voice_controller.listen_for_commands()
+
+            running = self.media.render(frame, overlay)
+            packet.buffer.release()
+            self.latency.record("total", time.monotonic() - packet.timestamp)
+
+    def _apply_results(self, packet, results):
+        """
+        Apply the newest results of the detectors running on a packet's source.
+
+        Each result is handled once, with the time of the frame it was detected
+        on, so filters, trackers and actions see every detection exactly once
+        however many frames are displayed while the detector is busy. On the
+        frames in between, only the drawings of that result are shown again.
+
+        Returns:
+            frame: The packet's frame
+            overlay: Overlay with the detectors' drawings
+        """
+        frame = packet.frame
+        overlay = Overlay()
+        for name, controller in self.media.detectors.items():
+            if self.detector_sources[name] != packet.source:
+                continue
+            if not self.media.is_active(name) or name not in results:
+                self._drawn.pop(name, None)
+                continue
+            seq, timestamp, result = results[name]
+            drawn = self._drawn.get(name)
+            if drawn is None or drawn[0] != seq:
+                drawn = (seq, Overlay())
+                frame, _ = controller.handle_result(frame, result, drawn[1], timestamp)
+                self._drawn[name] = drawn
+            overlay.extend(drawn[1])
+        return frame, overlay
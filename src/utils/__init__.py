@@ -1,3 +1,3 @@
-"""
-Utility modules for the gesture media controller.
-"""
+"""
+Utility modules for the gesture media controller.
+"""
@@ -0,0 +1,219 @@
+"""
+Asynchronous dispatch of media actions (key presses and volume changes).
+
+Controllers submit actions to a bounded queue and return immediately; a
+worker thread merges repeated actions and executes them off the frame loop.
+"""
+import queue
+import threading
+import time
+from collections import deque, namedtuple
+
+try:
+    import pyautogui
+except Exception:  # pyautogui fails on import without a display, e.g. on a headless server
+    pyautogui = None
+
+from .metrics import metrics
+from .stats import LatencyTracker
+from ..config import ACTION_QUEUE_SIZE, ACTION_KEY_PAUSE, ACTION_HISTORY_SIZE
+
+# A requested action. kind is "press", "hotkey", "volume" (relative change)
+# or "set_volume" (absolute level); args holds the keys or the amount.
+Action = namedtuple("Action", ["kind", "args", "label", "source", "queued_at"])
+
+# An executed action; count is how many submitted actions were merged into it
+ActionRecord = namedtuple("ActionRecord", ["label", "source", "count", "queued_at", "executed_at"])
+
+
+def coalesce(actions):
+    """
+    Merge runs of consecutive, compatible actions.
+
+    Identical key presses and hotkeys become one call with a repeat count,
+    relative volume changes are summed into one step, and only the last of
+    several absolute volume levels is kept.
+
+    Args:
+        actions (list): Actions in submission order
+
+    Returns:
+        list: (action, count) pairs; a merged action keeps the earliest queued_at
+    """
+    merged = []
+    for action in actions:
+        if merged:
+            previous, count = merged[-1]
+            if previous.kind == action.kind and previous.source == action.source:
+                if action.kind in ("press", "hotkey") and previous.args == action.args:
+                    merged[-1] = (previous, count + 1)
+                    continue
+                if action.kind == "volume":
+                    merged[-1] = (previous._replace(args=previous.args + action.args), count + 1)
+                    continue
+                if action.kind == "set_volume":
+                    merged[-1] = (action._replace(queued_at=previous.queued_at), count + 1)
+                    continue
+        merged.append((action, 1))
+    return merged
+
+
+class ActionDispatcher:
+    """
+    Executes media actions on a worker thread fed by a bounded queue.
+    """
+    def __init__(self, audio_controller=None, maxsize=ACTION_QUEUE_SIZE,
+                 key_pause=ACTION_KEY_PAUSE, history=ACTION_HISTORY_SIZE, dry_run=False):
+        """
+        Initialize the dispatcher. The worker thread starts on first submit.
+
+        Args:
+            audio_controller: AudioController used for volume actions
+            maxsize (int): Actions queued before the oldest is dropped
+            key_pause (float): Seconds to sleep after each key action (pyautogui.PAUSE is bypassed)
+            history (int): Number of executed actions kept in records
+            dry_run (bool): Record actions without pressing keys or changing the volume
+        """
+        self.audio_controller = audio_controller
+        self.key_pause = key_pause
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.records = deque(maxlen=history)
+        self.latency = LatencyTracker()
+        self.dry_run = dry_run
+        self.dropped = 0
+        self._listeners = []
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback):
+        """
+        Call callback(action) for every submitted action.
+
+        Listeners run synchronously on the submitting thread, before the
+        action is queued, so they see actions in the order they were requested.
+        """
+        self._listeners.append(callback)
+
+    def press(self, key, label=None, source=None):
+        """Queue a single key press."""
+        self.submit("press", key, label, source)
+
+    def hotkey(self, *keys, label=None, source=None):
+        """Queue a key combination such as ('shift', 's')."""
+        self.submit("hotkey", keys, label, source)
+
+    def change_volume(self, delta, label=None, source=None):
+        """Queue a relative system volume change (-1.0 to 1.0)."""
+        self.submit("volume", delta, label, source)
+
+    def set_volume(self, level, label=None, source=None):
+        """Queue an absolute system volume level (0.0 to 1.0)."""
+        self.submit("set_volume", level, label, source)
+
+    def submit(self, kind, args, label=None, source=None, queued_at=None):
+        """
+        Queue an action without blocking.
+
+        If the queue is full the oldest pending action is dropped, so the
+        newest user intent always gets through.
+
+        Args:
+            kind (str): "press", "hotkey", "volume" or "set_volume"
+            args: Key, key tuple or volume amount
+            label (str): Human-readable description, printed when executed
+            source (str): Controller that requested the action
+            queued_at (float): time.monotonic() when the triggering input was seen
+        """
+        self.start()
+        action = Action(kind, args, label, source,
+                        queued_at if queued_at is not None else time.monotonic())
+        for listener in self._listeners:
+            listener(action)
+        while True:
+            try:
+                self.queue.put_nowait(action)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.dropped += 1
+                    metrics.inc("actions_dropped_total")
+                except queue.Empty:
+                    pass
+
+    def start(self):
+        """Start the worker thread if it is not running."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="action-dispatcher", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Execute what is already queued, then stop the worker thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout=2.0)
+
+    def _run(self):
+        """Worker loop: take everything queued, merge it and execute it."""
+        while not (self._stop_event.is_set() and self.queue.empty()):
+            try:
+                batch = [self.queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for action, count in coalesce(batch):
+                source = action.source or "unknown"
+                try:
+                    with metrics.timer("action_execute_seconds", kind=action.kind):
+                        self._execute(action, count)
+                except Exception as e:
+                    print(f"Error executing action {action.label or action.kind}: {e}")
+                    metrics.inc("action_errors_total", source=source)
+                    continue
+                executed_at = time.monotonic()
+                self.records.append(ActionRecord(action.label, action.source, count,
+                                                 action.queued_at, executed_at))
+                self.latency.record(source, executed_at - action.queued_at)
+                metrics.inc("actions_total", count, source=source)
+                metrics.observe("action_latency_seconds", executed_at - action.queued_at, source=source)
+
+    def _execute(self, action, count):
+        """Perform one (possibly merged) action."""
+        if self.dry_run:
+            pass  # Recorded and printed as usual, but not performed
+        elif action.kind in ("press", "hotkey") and pyautogui is None:
+            raise RuntimeError("pyautogui is not available (no display)")
+        elif action.kind == "press":
+            pyautogui.press(action.args, presses=count, _pause=False)
+        elif action.kind == "hotkey":
+            for _ in range(count):
+                pyautogui.hotkey(*action.args, _pause=False)
+        elif action.kind == "volume":
+            self.audio_controller.increase_volume(action.args)
+        elif action.kind == "set_volume":
+            self.audio_controller.set_volume(action.args)
+        else:
+            raise ValueError(f"Unknown action kind: {action.kind}")
+
+        if action.kind in ("press", "hotkey") and self.key_pause and not self.dry_run:
+            time.sleep(self.key_pause)
+
+        if action.label:
+            suffix = f" x{count}" if count > 1 else ""
+            print(f"Action: {action.label}{suffix}")
+
+    def latency_report(self):
+        """Return queue-to-execution latency summaries keyed by source."""
+        return self.latency.report()
@@ -0,0 +1,151 @@
+"""
+Viewer attention from head pose, with a debounced pause/resume state.
+
+Head pose is estimated with solvePnP from six face landmarks (nose tip,
+chin, outer eye corners and mouth corners) fitted to a generic 3D head,
+which is far cheaper than anything else done per frame. AttentionTracker
+turns the noisy per-frame "is anyone looking" signal into confirmed
+pause and resume decisions.
+"""
+import cv2
+import numpy as np
+
+from ..config import (
+    FACE_MAX_YAW, FACE_MAX_PITCH, FACE_ANGLE_HYSTERESIS, FACE_PAUSE_AFTER, FACE_RESUME_AFTER
+)
+
+# FaceMesh landmark indices: nose tip, chin, eye outer corners, mouth corners
+POSE_LANDMARKS = np.array([1, 152, 33, 263, 61, 291])
+
+# Generic head in camera axes (x right, y down, z away from the camera), arbitrary units.
+# Eyes and mouth corners are listed as image-left, image-right pairs.
+HEAD_MODEL = np.array([
+    (0.0, 0.0, 0.0),          # Nose tip
+    (0.0, 330.0, 65.0),       # Chin
+    (-225.0, -170.0, 135.0),  # Outer eye corner, image left
+    (225.0, -170.0, 135.0),   # Outer eye corner, image right
+    (-150.0, 150.0, 125.0),   # Mouth corner, image left
+    (150.0, 150.0, 125.0),    # Mouth corner, image right
+])
+
+
+def pose_points(faces):
+    """
+    Pick the six pose landmarks of every face, ordered to match HEAD_MODEL.
+
+    Pairs are ordered by image x rather than by which side of the face they
+    are on, so mirrored frames fit the (symmetric) model as well.
+
+    Args:
+        faces: (faces, landmarks, 2) array of normalized x, y
+
+    Returns:
+        (faces, 6, 2) array
+    """
+    points = faces[:, POSE_LANDMARKS]
+    for left, right in ((2, 3), (4, 5)):
+        swap = points[:, left, 0] > points[:, right, 0]
+        points[swap, left], points[swap, right] = points[swap, right], points[swap, left]
+    return points
+
+
+def head_angles(points, frame_size):
+    """
+    Estimate the yaw and pitch of each face.
+
+    Args:
+        points: (faces, 6, 2) pose landmarks from pose_points(), normalized
+        frame_size: (width, height) of the frame the landmarks came from
+
+    Returns:
+        (faces, 2) array of yaw and pitch in degrees, zero when facing the camera
+    """
+    width, height = frame_size
+    # Pinhole camera with a focal length of about the frame width and no distortion
+    camera = np.array([[width, 0, width / 2], [0, width, height / 2], [0, 0, 1]], dtype=np.float64)
+    pixels = points.astype(np.float64) * (width, height)
+
+    rotations = np.empty((len(points), 3, 3))
+    for i, image_points in enumerate(pixels):
+        found, rvec, _ = cv2.solvePnP(HEAD_MODEL, image_points, camera, None, flags=cv2.SOLVEPNP_ITERATIVE)
+        rotations[i] = cv2.Rodrigues(rvec)[0] if found else np.eye(3)
+
+    yaw = np.degrees(np.arcsin(np.clip(-rotations[:, 2, 0], -1.0, 1.0)))
+    pitch = np.degrees(np.arctan2(rotations[:, 2, 1], rotations[:, 2, 2]))
+    return np.stack([yaw, pitch], axis=1)
+
+
+class AttentionTracker:
+    """
+    Debounced attention state.
+
+    A face counts as looking at the screen while its yaw and pitch are
+    within limits; the limits widen by FACE_ANGLE_HYSTERESIS while the viewer
+    is already looking, so angles near a limit do not flicker. A change
+    only becomes confirmed after it has held for pause_after (looking away)
+    or resume_after (looking back) seconds.
+    """
+    def __init__(self, max_yaw=FACE_MAX_YAW, max_pitch=FACE_MAX_PITCH, hysteresis=FACE_ANGLE_HYSTERESIS,
+                 pause_after=FACE_PAUSE_AFTER, resume_after=FACE_RESUME_AFTER):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_yaw (float): Largest left-right head turn in degrees that counts as looking
+            max_pitch (float): Largest up-down head tilt in degrees that counts as looking
+            hysteresis (float): Degrees the limits widen by while already looking
+            pause_after (float): Seconds of inattention before it is confirmed
+            resume_after (float): Seconds of attention before it is confirmed
+        """
+        self.max_yaw = max_yaw
+        self.max_pitch = max_pitch
+        self.hysteresis = hysteresis
+        self.pause_after = pause_after
+        self.resume_after = resume_after
+        self.attentive = True  # Confirmed state; the viewer is assumed present at start
+        self.looking = True  # Latest unconfirmed observation
+        self._since = None  # When the observation started to differ from the confirmed state
+
+    def is_looking(self, angles):
+        """
+        Return whether any face is looking at the screen.
+
+        Args:
+            angles: (faces, 2) yaw and pitch in degrees, or None in presence-only
+                mode where any face counts
+        """
+        if angles is None:
+            return True
+        margin = self.hysteresis if self.looking else 0.0
+        within = ((np.abs(angles[:, 0]) <= self.max_yaw + margin) &
+                  (np.abs(angles[:, 1]) <= self.max_pitch + margin))
+        return bool(within.any())
+
+    def update(self, looking, now):
+        """
+        Add one observation and return whether the confirmed state changed.
+
+        Args:
+            looking (bool): Whether someone is looking at the screen in this frame
+            now (float): Frame time in seconds
+
+        Returns:
+            bool: True if attention was just confirmed lost or regained
+        """
+        self.looking = looking
+        if looking == self.attentive:
+            self._since = None
+            return False
+        if self._since is None:
+            self._since = now
+        hold = self.resume_after if looking else self.pause_after
+        if now - self._since < hold:
+            return False
+        self.attentive = looking
+        self._since = None
+        return True
+
+    def pending(self, now):
+        """Seconds the current unconfirmed change has lasted, or 0.0."""
+        return 0.0 if self._since is None else max(0.0, now - self._since)
+
@@ -1,52 +1,380 @@
-"""
-Audio utilities for volume control.
-"""
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
-
-
-class AudioController:
-    """
-    Controls system audio volume using the pycaw library.
-    """
-    def __init__(self):
-        """Initialize the audio controller."""
-        devices = AudioUtilities.GetSpeakers()
-        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
-        self.volume_interface = cast(interface, POINTER(IAudioEndpointVolume))
-        self.current_volume = self.volume_interface.GetMasterVolumeLevelScalar()
-
-    def get_volume(self):
-        """Get the current volume level."""
-        self.current_volume = self.volume_interface.GetMasterVolumeLevelScalar()
-        return self.current_volume
-        
-    def set_volume(self, new_level):
-        """
-        Set the system volume level.
-        
-        Args:
-            new_level (float): Volume level between 0.0 and 1.0
-        """
-        new_level = max(0.0, min(1.0, new_level))  # Ensure volume level is between 0 and 1
-        self.volume_interface.SetMasterVolumeLevelScalar(new_level, None)
-        self.current_volume = new_level
-        
-    def increase_volume(self, increment=0.1):
-        """
-        Increase the system volume.
-        
-        Args:
-            increment (float): Amount to increase volume by (0.0-1.0)
-        """
-        self.set_volume(self.get_volume() + increment)
-        
-    def decrease_volume(self, decrement=0.1):
-        """
-        Decrease the system volume.
-        
-        Args:
-            decrement (float): Amount to decrease volume by (0.0-1.0)
-        """
-        self.set_volume(self.get_volume() - decrement)
+"""
+Audio utilities for volume control.
+"""
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from ctypes import cast, POINTER
+
+if sys.platform == "win32" and not hasattr(sys, "coinit_flags"):
+    # comtypes initializes COM when first imported, in the apartment given here;
+    # the multithreaded one lets the endpoint be shared by the threads using it
+    sys.coinit_flags = 0  # COINIT_MULTITHREADED
+
+try:
+    import comtypes
+    from comtypes import CLSCTX_ALL
+    from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
+except ImportError:  # pycaw and COM are only available on Windows
+    comtypes = CLSCTX_ALL = AudioUtilities = IAudioEndpointVolume = None
+
+from ..config import AUDIO_BACKEND, AUDIO_CACHE_TTL, PULSE_SINK, ALSA_CONTROL
+
+
+class AudioBackend:
+    """
+    Base class for platform volume backends. Levels are floats from 0.0 to 1.0.
+    """
+    name = "base"
+
+    def read_volume(self):
+        """Read the current master volume from the system."""
+        raise NotImplementedError
+
+    def write_volume(self, level):
+        """Write a master volume level to the system."""
+        raise NotImplementedError
+
+    def watch(self, callback):
+        """
+        Call callback() whenever the volume or default device changes outside our control.
+
+        Returns:
+            bool: True if change events are supported, False if callers must poll
+        """
+        return False
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class PycawAudioBackend(AudioBackend):
+    """
+    Windows volume control through pycaw and the Core Audio COM API.
+
+    The backend is created on a lazy-loading thread and used from the
+    volume writer and the caller's threads, so every method first makes
+    sure COM is initialized on the thread calling it.
+    """
+    name = "pycaw"
+    _com = threading.local()
+
+    def __init__(self):
+        """Initialize the backend."""
+        if AudioUtilities is None:
+            raise ImportError("pycaw is not available on this platform")
+        self._initialize_com()
+        devices = AudioUtilities.GetSpeakers()
+        interface = devices.Activate(IAudioEndpointVolume._iid_, CLSCTX_ALL, None)
+        self.volume_interface = cast(interface, POINTER(IAudioEndpointVolume))
+        self._callbacks = []
+
+    def _initialize_com(self):
+        """Initialize COM on the calling thread, once per thread."""
+        if not getattr(self._com, "initialized", False):
+            comtypes.CoInitializeEx()
+            self._com.initialized = True
+
+    def read_volume(self):
+        self._initialize_com()
+        return self.volume_interface.GetMasterVolumeLevelScalar()
+
+    def write_volume(self, level):
+        self._initialize_com()
+        self.volume_interface.SetMasterVolumeLevelScalar(level, None)
+
+    def watch(self, callback):
+        self._initialize_com()
+        try:
+            from pycaw.callbacks import AudioEndpointVolumeCallback, MMNotificationClient
+        except ImportError:
+            return False
+
+        class VolumeCallback(AudioEndpointVolumeCallback):
+            def on_notify(self, *args):
+                callback()
+
+        class DeviceCallback(MMNotificationClient):
+            def on_default_device_changed(self, *args):
+                callback()
+
+        volume_callback = VolumeCallback()
+        self.volume_interface.RegisterControlChangeNotify(volume_callback)
+        device_callback = DeviceCallback()
+        AudioUtilities.GetDeviceEnumerator().RegisterEndpointNotificationCallback(device_callback)
+        # Keep references so the COM objects are not garbage collected
+        self._callbacks.extend([volume_callback, device_callback])
+        return True
+
+
+class PulseAudioBackend(AudioBackend):
+    """
+    Linux volume control through pactl, for PulseAudio and PipeWire.
+    """
+    name = "pulse"
+
+    def __init__(self, sink=PULSE_SINK):
+        """
+        Initialize the backend.
+
+        Args:
+            sink (str): Sink name, "@DEFAULT_SINK@" follows the default output
+        """
+        if shutil.which("pactl") is None:
+            raise OSError("pactl not found")
+        self.sink = sink
+        self._subscriber = None
+
+    def read_volume(self):
+        output = subprocess.run(["pactl", "get-sink-volume", self.sink],
+                                capture_output=True, text=True, check=True).stdout
+        match = re.search(r"(\d+)%", output)
+        if match is None:
+            raise ValueError(f"Unexpected pactl output: {output!r}")
+        return int(match.group(1)) / 100
+
+    def write_volume(self, level):
+        subprocess.run(["pactl", "set-sink-volume", self.sink, f"{round(level * 100)}%"], check=True)
+
+    def watch(self, callback):
+        self._subscriber = subprocess.Popen(["pactl", "subscribe"], stdout=subprocess.PIPE,
+                                            stderr=subprocess.DEVNULL, text=True)
+
+        def read_events():
+            for line in self._subscriber.stdout:
+                # e.g. "Event 'change' on sink #0" or "Event 'change' on server"
+                if "sink" in line or "server" in line:
+                    callback()
+
+        threading.Thread(target=read_events, name="pactl-subscribe", daemon=True).start()
+        return True
+
+    def close(self):
+        if self._subscriber is not None:
+            self._subscriber.terminate()
+            self._subscriber = None
+
+
+class AlsaAudioBackend(AudioBackend):
+    """
+    Linux volume control through ALSA's amixer. Has no change events.
+    """
+    name = "alsa"
+
+    def __init__(self, control=ALSA_CONTROL):
+        """
+        Initialize the backend.
+
+        Args:
+            control (str): Mixer control name, usually "Master"
+        """
+        if shutil.which("amixer") is None:
+            raise OSError("amixer not found")
+        self.control = control
+
+    def read_volume(self):
+        output = subprocess.run(["amixer", "get", self.control],
+                                capture_output=True, text=True, check=True).stdout
+        match = re.search(r"\[(\d+)%\]", output)
+        if match is None:
+            raise ValueError(f"Unexpected amixer output: {output!r}")
+        return int(match.group(1)) / 100
+
+    def write_volume(self, level):
+        subprocess.run(["amixer", "-q", "set", self.control, f"{round(level * 100)}%"], check=True)
+
+
+class MockAudioBackend(AudioBackend):
+    """
+    In-memory backend for tests and machines without audio control.
+    """
+    name = "mock"
+
+    def __init__(self, level=0.5):
+        """
+        Initialize the backend.
+
+        Args:
+            level (float): Initial volume level
+        """
+        self.level = level
+        self.reads = 0
+        self.writes = []
+        self._callbacks = []
+
+    def read_volume(self):
+        self.reads += 1
+        return self.level
+
+    def write_volume(self, level):
+        self.writes.append(level)
+        self.level = level
+
+    def watch(self, callback):
+        self._callbacks.append(callback)
+        return True
+
+    def simulate_external_change(self, level):
+        """Change the volume as another application would, firing change events."""
+        self.level = level
+        for callback in self._callbacks:
+            callback()
+
+
+AUDIO_BACKENDS = {
+    backend.name: backend
+    for backend in (PycawAudioBackend, PulseAudioBackend, AlsaAudioBackend, MockAudioBackend)
+}
+
+
+def create_audio_backend(name=AUDIO_BACKEND):
+    """
+    Create an audio backend by name.
+
+    In "auto" mode each candidate must also read the volume once, so a
+    backend whose tools are present but unusable (e.g. a pactl too old for
+    get-sink-volume) falls through to the next one.
+
+    Args:
+        name (str): One of AUDIO_BACKENDS, or "auto" to pick one for this platform
+
+    Returns:
+        AudioBackend
+    """
+    if name != "auto":
+        if name not in AUDIO_BACKENDS:
+            raise ValueError(f"Unknown audio backend: {name}")
+        return AUDIO_BACKENDS[name]()
+
+    candidates = ["pycaw"] if sys.platform == "win32" else ["pulse", "alsa"]
+    for candidate in candidates:
+        backend = None
+        try:
+            backend = AUDIO_BACKENDS[candidate]()
+            backend.read_volume()
+            return backend
+        except Exception as e:
+            print(f"Audio backend '{candidate}' unavailable: {e}")
+            if backend is not None:
+                backend.close()
+    print("No system audio backend available; volume changes will not be applied")
+    return MockAudioBackend()
+
+
+class AudioController:
+    """
+    Controls system audio volume through a platform AudioBackend.
+
+    Reads are served from a cache that is invalidated by the backend's
+    change events (or expires after AUDIO_CACHE_TTL seconds when the backend
+    has none). Writes happen on a background thread; setting a new level
+    while one is still pending replaces it rather than queueing another.
+    """
+    def __init__(self, backend=None):
+        """
+        Initialize the audio controller.
+
+        Args:
+            backend: AudioBackend to use, defaults to create_audio_backend()
+        """
+        self.backend = backend or create_audio_backend()
+        self._condition = threading.Condition()
+        self._pending = None
+        self._writing = False
+        self._writer = None
+        self._cache_valid = False
+        self._cache_time = 0
+        self._has_events = self.backend.watch(self.invalidate)
+        self.current_volume = self.get_volume()
+
+    def invalidate(self):
+        """Mark the cached volume as stale, e.g. after a device change."""
+        with self._condition:
+            self._cache_valid = False
+
+    def get_volume(self):
+        """Get the current volume level."""
+        with self._condition:
+            if self._pending is not None:
+                return self._pending
+            fresh = self._has_events or time.monotonic() - self._cache_time < AUDIO_CACHE_TTL
+            if self._cache_valid and fresh:
+                return self.current_volume
+
+        level = self.backend.read_volume()
+        with self._condition:
+            if self._pending is None:
+                self.current_volume = level
+                self._cache_valid = True
+                self._cache_time = time.monotonic()
+            return self.current_volume
+
+    def set_volume(self, new_level):
+        """
+        Set the system volume level.
+
+        Args:
+            new_level (float): Volume level between 0.0 and 1.0
+        """
+        new_level = max(0.0, min(1.0, new_level))  # Ensure volume level is between 0 and 1
+        with self._condition:
+            # Latest level wins: an unwritten pending level is simply replaced
+            self._pending = new_level
+            self.current_volume = new_level
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="audio-writer", daemon=True)
+                self._writer.start()
+            self._condition.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Wait until pending volume changes have been written.
+
+        Returns:
+            bool: True if nothing is pending any more
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
+
+    def _write_loop(self):
+        """Write the newest pending level whenever one is set."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                level, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self.backend.write_volume(level)
+            except Exception as e:
+                print(f"Error setting volume: {e}")
+            with self._condition:
+                self._writing = False
+                self._cache_valid = True
+                self._cache_time = time.monotonic()
+                self._condition.notify_all()
+
+    def increase_volume(self, increment=0.1):
+        """
+        Increase the system volume.
+
+        Args:
+            increment (float): Amount to increase volume by (0.0-1.0)
+        """
+        self.set_volume(self.get_volume() + increment)
+
+    def decrease_volume(self, decrement=0.1):
+        """
+        Decrease the system volume.
+
+        Args:
+            decrement (float): Amount to decrease volume by (0.0-1.0)
+        """
+        self.set_volume(self.get_volume() - decrement)
+
+    def close(self):
+        """Flush pending changes and release the backend."""
+        self.flush(timeout=1.0)
+        self.backend.close()
@@ -0,0 +1,207 @@
+"""
+Signal filters for smoothing noisy per-frame measurements.
+"""
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter: an adaptive low-pass filter for noisy real-time signals.
+
+    At low speeds a low cutoff removes jitter; as the signal moves faster the
+    cutoff rises so the output follows with little lag. See Casiez et al.,
+    "1 Euro Filter: A Simple Speed-based Low-pass Filter for Noisy Input in
+    Interactive Systems" (CHI 2012).
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0):
+        """
+        Initialize the filter.
+
+        Args:
+            min_cutoff (float): Cutoff frequency in Hz at zero speed; lower means less jitter
+            beta (float): How quickly the cutoff rises with speed; higher means less lag
+            d_cutoff (float): Cutoff frequency in Hz for the derivative estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget the filter state, e.g. when tracking is lost."""
+        self._value = None
+        self._derivative = 0.0
+        self._timestamp = None
+
+    @staticmethod
+    def _alpha(dt, cutoff):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value, timestamp):
+        """
+        Filter one sample.
+
+        Args:
+            value (float): Raw measurement
+            timestamp (float): Sample time in seconds
+
+        Returns:
+            float: Filtered value
+        """
+        if self._value is None:
+            self._value = value
+            self._timestamp = timestamp
+            return value
+
+        dt = timestamp - self._timestamp
+        if dt <= 0:
+            return self._value
+        self._timestamp = timestamp
+
+        derivative = (value - self._value) / dt
+        alpha_d = self._alpha(dt, self.d_cutoff)
+        self._derivative = alpha_d * derivative + (1 - alpha_d) * self._derivative
+
+        cutoff = self.min_cutoff + self.beta * abs(self._derivative)
+        alpha = self._alpha(dt, cutoff)
+        self._value = alpha * value + (1 - alpha) * self._value
+        return self._value
+
+
+class GestureFilter:
+    """
+    Temporal filter that turns noisy per-frame gesture scores into stable decisions.
+
+    Per-frame category scores are written into a fixed-size ring buffer,
+    preallocated as a NumPy array. A smoothed score per category comes from
+    either a time-based exponentially weighted average ("ewma") or the share
+    of recent frames in which the category came top ("majority").
+
+    A gesture becomes active when its smoothed score reaches enter_threshold
+    and stays active until it falls below the lower exit_threshold, so scores
+    hovering around a single threshold do not flicker. An active gesture
+    fires when its cooldown has elapsed; one-shot gestures fire only once
+    per activation.
+    """
+    def __init__(self, categories, window=15, method="ewma", time_constant=0.1,
+                 enter_threshold=0.6, exit_threshold=0.4, cooldowns=None,
+                 default_cooldown=0.7, one_shot=(), ignore=("None",)):
+        """
+        Initialize the filter.
+
+        Args:
+            categories (list): Category names, in a fixed order
+            window (int): Number of frames kept in the ring buffer
+            method (str): "ewma" or "majority"
+            time_constant (float): EWMA time constant in seconds
+            enter_threshold (float): Smoothed score needed to activate a gesture
+            exit_threshold (float): Smoothed score below which it deactivates
+            cooldowns (dict): Seconds between firings, per category name
+            default_cooldown (float): Cooldown for categories not in cooldowns
+            one_shot (tuple): Categories that fire once per activation
+            ignore (tuple): Categories that never activate
+        """
+        if method not in ("ewma", "majority"):
+            raise ValueError(f"Unknown gesture filter method: {method}")
+        if exit_threshold > enter_threshold:
+            raise ValueError("exit_threshold must not exceed enter_threshold")
+
+        self.categories = list(categories)
+        self.index = {name: i for i, name in enumerate(self.categories)}
+        self.method = method
+        self.time_constant = time_constant
+        self.enter_threshold = enter_threshold
+        self.exit_threshold = exit_threshold
+
+        cooldowns = cooldowns or {}
+        self.cooldowns = np.array([cooldowns.get(name, default_cooldown) for name in self.categories])
+        self.one_shot = np.array([name in one_shot for name in self.categories])
+        self.eligible = np.array([name not in ignore for name in self.categories])
+
+        self.scores = np.zeros((window, len(self.categories)), dtype=np.float32)
+        self.smoothed = np.zeros(len(self.categories), dtype=np.float32)
+        self._row = np.zeros(len(self.categories), dtype=np.float32)
+        self.last_fired = np.full(len(self.categories), -np.inf)
+        self.reset()
+
+    def reset(self):
+        """Clear all history, e.g. when the tracked hand changes."""
+        self.scores.fill(0)
+        self.smoothed.fill(0)
+        self.position = 0
+        self.count = 0
+        self.active = None
+        self._fired_this_activation = False
+        self._last_timestamp = None
+
+    @property
+    def active_name(self):
+        """Name of the currently active gesture, or None."""
+        return None if self.active is None else self.categories[self.active]
+
+    def ready(self, name, now):
+        """Return True if the named gesture's cooldown has elapsed."""
+        i = self.index.get(name)
+        return i is not None and now - self.last_fired[i] >= self.cooldowns[i]
+
+    def update(self, scores, now):
+        """
+        Add one frame of scores and decide whether a gesture fires.
+
+        Args:
+            scores (dict): Score per category name; None or {} when no hand is visible
+            now (float): Monotonic timestamp in seconds
+
+        Returns:
+            str or None: Name of the gesture that fires on this frame
+        """
+        row = self._row
+        row.fill(0)
+        for name, score in (scores or {}).items():
+            i = self.index.get(name)
+            if i is not None:
+                row[i] = score
+
+        self.scores[self.position] = row
+        self.position = (self.position + 1) % len(self.scores)
+        self.count = min(self.count + 1, len(self.scores))
+
+        if self.method == "ewma":
+            # Smoothing starts from zero, and a sample counts for the time since the
+            # previous one; the first after a reset only starts the clock, so a
+            # single spike can never activate a gesture on its own
+            dt = 0.0 if self._last_timestamp is None else max(0.0, now - self._last_timestamp)
+            alpha = 1.0 - np.exp(-dt / self.time_constant)
+            self.smoothed += alpha * (row - self.smoothed)
+        else:
+            recent = self.scores[:self.count]
+            winners = recent.argmax(axis=1)[recent.max(axis=1) > 0]
+            # Divide by the full window so a few frames after a reset cannot win outright
+            self.smoothed[:] = np.bincount(winners, minlength=len(self.categories)) / len(self.scores)
+        self._last_timestamp = now
+
+        # Hysteresis: the active gesture holds until it drops below the exit threshold
+        if self.active is not None and self.smoothed[self.active] < self.exit_threshold:
+            self.active = None
+        if self.active is None:
+            candidates = np.where(self.eligible, self.smoothed, -1.0)
+            best = int(candidates.argmax())
+            if candidates[best] >= self.enter_threshold:
+                self.active = best
+                self._fired_this_activation = False
+        elif not self.eligible[self.active]:
+            self.active = None
+
+        if self.active is None:
+            return None
+        if self.one_shot[self.active] and self._fired_this_activation:
+            return None
+        if now - self.last_fired[self.active] < self.cooldowns[self.active]:
+            return None
+
+        self.last_fired[self.active] = now
+        self._fired_this_activation = True
+        return self.categories[self.active]
@@ -0,0 +1,287 @@
+"""
+Frame preparation for detector input.
+"""
+import threading
+
+import cv2
+import numpy as np
+
+from ..config import INFERENCE_RESOLUTION_LADDER, TARGET_FPS, FRAME_POOL_SIZE
+
+
+class FrameScaler:
+    """
+    Downscales frames for inference into a preallocated buffer.
+
+    The aspect ratio is preserved, so the normalized landmarks and boxes
+    MediaPipe returns for the small frame map directly onto the
+    full-resolution display frame.
+    """
+    def __init__(self, resolution=None, governor=None):
+        """
+        Initialize the scaler.
+
+        Args:
+            resolution (tuple): Maximum (width, height) for inference, or None for full resolution
+            governor: Optional ResolutionGovernor that picks the resolution at runtime
+        """
+        self.resolution = resolution
+        self.governor = governor
+        self._buffer = None
+
+    def clone(self):
+        """Return a scaler with the same resolution and governor but its own buffer."""
+        return FrameScaler(self.resolution, self.governor)
+
+    def target_size(self, frame_shape):
+        """
+        Return the (width, height) a frame of the given shape is scaled to.
+
+        Args:
+            frame_shape: Shape of the input frame (height, width, channels)
+        """
+        height, width = frame_shape[:2]
+        resolution = self.governor.resolution if self.governor is not None else self.resolution
+        if resolution is None:
+            return width, height
+
+        scale = min(resolution[0] / width, resolution[1] / height, 1.0)
+        return max(1, int(width * scale)), max(1, int(height * scale))
+
+    def scale(self, frame):
+        """
+        Downscale a frame for inference.
+
+        The returned array is reused by the next call, so consume it (for
+        example with cv2.cvtColor) before scaling another frame.
+
+        Args:
+            frame: OpenCV BGR image frame
+
+        Returns:
+            numpy.ndarray: The scaled frame, or the input itself if no scaling is needed
+        """
+        width, height = self.target_size(frame.shape)
+        if (width, height) == (frame.shape[1], frame.shape[0]):
+            return frame
+
+        shape = (height, width) + frame.shape[2:]
+        if self._buffer is None or self._buffer.shape != shape:
+            self._buffer = np.empty(shape, dtype=frame.dtype)
+        cv2.resize(frame, (width, height), dst=self._buffer, interpolation=cv2.INTER_AREA)
+        return self._buffer
+
+    def to_rgb(self, frame, dst=None):
+        """
+        Downscale a BGR frame and convert it to RGB.
+
+        Args:
+            frame: OpenCV BGR image frame
+            dst: Writeable array to convert into; a new array is allocated
+                if it is None or does not have the scaled frame's shape
+
+        Returns:
+            numpy.ndarray: The RGB frame (dst when it was used)
+        """
+        scaled = self.scale(frame)
+        if dst is not None and dst.shape == scaled.shape and dst.dtype == scaled.dtype:
+            return cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB, dst=dst)
+        return cv2.cvtColor(scaled, cv2.COLOR_BGR2RGB)
+
+
+class FrameBuffer:
+    """
+    One pooled frame: the mirrored BGR frame and its RGB copy for the detectors.
+
+    Every stage holding the buffer owns one reference and releases it when
+    done; the buffer goes back to its pool when the last one is released.
+    """
+    __slots__ = ("pool", "frame", "rgb_frame", "refs")
+
+    def __init__(self, pool, shape, dtype):
+        self.pool = pool
+        self.frame = np.empty(shape, dtype=dtype)
+        self.rgb_frame = None
+        self.refs = 0
+
+    def retain(self, count=1):
+        """Add references for stages the buffer is handed to."""
+        with self.pool.lock:
+            self.refs += count
+        return self
+
+    def release(self):
+        """Drop one reference, returning the buffer to the pool after the last."""
+        self.pool.release(self)
+
+
+class FramePool:
+    """
+    Ring of preallocated frame buffers shared by capture and processing.
+
+    Capture reads into one reused array and mirrors it straight into a free
+    pooled buffer, and the RGB conversion for the detectors goes into that
+    buffer's own RGB array, so steady-state frames allocate no image memory.
+    The pool only grows if consumers hold more buffers than it has.
+    """
+    def __init__(self, size=FRAME_POOL_SIZE, frame_scaler=None):
+        """
+        Initialize the pool.
+
+        Args:
+            size (int): Buffers allocated when the first frame arrives
+            frame_scaler: FrameScaler used for the RGB conversion, defaults to full resolution
+        """
+        self.size = size
+        self.frame_scaler = frame_scaler or FrameScaler()
+        self.lock = threading.Lock()
+        self.allocated = 0
+        self._free = []
+        self._capture = None  # Reused by cap.read(); only the capturing thread touches it
+
+    def read(self, cap, mirror=True):
+        """
+        Read the next frame from a capture into a pooled buffer.
+
+        Args:
+            cap: cv2.VideoCapture or FrameSource
+            mirror (bool): Flip the frame horizontally for a mirror effect
+
+        Returns:
+            tuple: (ret, FrameBuffer holding one reference, or None)
+        """
+        ret, raw = cap.read(image=self._capture)
+        if not ret:
+            return False, None
+        self._capture = raw
+        buffer = self._acquire(raw.shape, raw.dtype)
+        if mirror:
+            cv2.flip(raw, 1, dst=buffer.frame)
+        else:
+            np.copyto(buffer.frame, raw)
+        return True, buffer
+
+    def to_rgb(self, buffer):
+        """
+        Convert a buffer's frame into its pooled RGB array.
+
+        Returns:
+            numpy.ndarray: The RGB frame, read-only so detectors can share it
+        """
+        rgb_frame = buffer.rgb_frame
+        if rgb_frame is not None:
+            rgb_frame.setflags(write=True)
+        rgb_frame = self.frame_scaler.to_rgb(buffer.frame, dst=rgb_frame)
+        rgb_frame.setflags(write=False)
+        buffer.rgb_frame = rgb_frame
+        return rgb_frame
+
+    def _acquire(self, shape, dtype):
+        with self.lock:
+            while self._free:
+                buffer = self._free.pop()
+                if buffer.frame.shape == shape and buffer.frame.dtype == dtype:
+                    buffer.refs = 1
+                    return buffer
+                self.allocated -= 1  # Frame size changed; let stale buffers go
+            for _ in range(self.size - 1 if self.allocated == 0 else 0):
+                self._free.append(FrameBuffer(self, shape, dtype))
+                self.allocated += 1
+            buffer = FrameBuffer(self, shape, dtype)
+            buffer.refs = 1
+            self.allocated += 1
+            return buffer
+
+    def release(self, buffer):
+        """Drop one reference to a buffer (see FrameBuffer.release)."""
+        with self.lock:
+            if buffer.refs <= 0:
+                raise RuntimeError("Frame buffer released more often than it was retained")
+            buffer.refs -= 1
+            if buffer.refs == 0:
+                self._free.append(buffer)
+
+
+class ResolutionGovernor:
+    """
+    Picks the largest inference resolution that still meets a target FPS.
+
+    Inference time is tracked as an exponential moving average. When it
+    exceeds the frame budget the governor steps down the resolution ladder,
+    and it steps back up when the larger resolution's predicted cost (scaled
+    by pixel count) fits the budget with some headroom.
+    """
+    def __init__(self, ladder=INFERENCE_RESOLUTION_LADDER, target_fps=TARGET_FPS,
+                 start=None, smoothing=0.1, settle_frames=30, headroom=0.8):
+        """
+        Initialize the governor.
+
+        Args:
+            ladder (list): Candidate (width, height) resolutions, largest first
+            target_fps (float): Frame rate the inference time must sustain
+            start (tuple): Initial resolution, defaults to the largest
+            smoothing (float): EMA weight given to each new sample
+            settle_frames (int): Samples to collect after a change before deciding again
+            headroom (float): Fraction of the budget a step up must fit within
+        """
+        self.ladder = list(ladder)
+        self.budget = 1.0 / target_fps
+        self.smoothing = smoothing
+        self.settle_frames = settle_frames
+        self.headroom = headroom
+        self.index = self.ladder.index(start) if start in self.ladder else 0
+        self._lock = threading.Lock()
+        self._reset()
+
+    @property
+    def resolution(self):
+        """Currently selected (width, height)."""
+        return self.ladder[self.index]
+
+    def _reset(self):
+        self._averages = {}
+        self._samples = 0
+
+    def update(self, seconds, key="inference"):
+        """
+        Record how long inference took and adjust the resolution if needed.
+
+        Args:
+            seconds (float): Inference time for one frame
+            key (str): Stage the sample belongs to; the slowest stage decides
+
+        Returns:
+            bool: True if the resolution changed
+        """
+        with self._lock:
+            return self._update(seconds, key)
+
+    def _update(self, seconds, key):
+        average = self._averages.get(key)
+        if average is None:
+            average = seconds
+        else:
+            average += self.smoothing * (seconds - average)
+        self._averages[key] = average
+
+        self._samples += 1
+        if self._samples < self.settle_frames:
+            return False
+
+        slowest = max(self._averages.values())
+        if slowest > self.budget and self.index < len(self.ladder) - 1:
+            self.index += 1
+        elif self.index > 0 and self._predicted_cost(slowest, self.index - 1) < self.budget * self.headroom:
+            self.index -= 1
+        else:
+            return False
+
+        print(f"Inference resolution: {self.resolution[0]}x{self.resolution[1]}")
+        self._reset()
+        return True
+
+    def _predicted_cost(self, seconds, index):
+        """Estimate inference time at ladder[index] from the time at the current resolution."""
+        current = self.ladder[self.index]
+        candidate = self.ladder[index]
+        return seconds * (candidate[0] * candidate[1]) / (current[0] * current[1])
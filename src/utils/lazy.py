@@ -0,0 +1,86 @@
+"""
+Lazy construction of expensive controllers.
+
+Controllers pull in heavy dependencies (MediaPipe models, COM audio
+interfaces, the microphone), so they are built on first use instead of at
+startup, and can be warmed up on a background thread while video runs.
+"""
+import threading
+import time
+
+
+class LazyController:
+    """
+    Stand-in for a controller that is built on first use.
+
+    Attribute access is forwarded to the real controller, building it (or
+    waiting for a warm-up already in progress) if needed. Callers that must
+    not block check `ready` first and call warm_up() otherwise.
+    """
+    def __init__(self, name, factory):
+        """
+        Initialize the stand-in.
+
+        Args:
+            name (str): Name used in log messages and thread names
+            factory: Callable that imports what it needs and returns the controller
+        """
+        self.name = name
+        self.factory = factory
+        self.instance = None
+        self.error = None
+        self.load_seconds = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def ready(self):
+        """Whether the controller has been built."""
+        return self.instance is not None
+
+    @property
+    def loading(self):
+        """Whether a build is in progress."""
+        return self._thread is not None and self.instance is None and self.error is None
+
+    @property
+    def failed(self):
+        """Whether building the controller raised an error."""
+        return self.error is not None
+
+    def warm_up(self):
+        """Start building the controller on a background thread, if not started yet."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._load, name=f"load-{self.name}", daemon=True)
+                self._thread.start()
+
+    def get(self):
+        """
+        Return the controller, building it now if needed.
+
+        Raises:
+            RuntimeError: If the controller could not be built
+        """
+        if self.instance is None:
+            self.warm_up()
+            self._thread.join()
+            if self.error is not None:
+                raise RuntimeError(f"{self.name} controller failed to start: {self.error}") from self.error
+        return self.instance
+
+    def _load(self):
+        start = time.perf_counter()
+        try:
+            instance = self.factory()
+        except Exception as e:
+            self.error = e
+            print(f"Could not start {self.name} control: {e}")
+            return
+        self.load_seconds = time.perf_counter() - start
+        self.instance = instance
+        print(f"{self.name.capitalize()} control ready ({self.load_seconds:.2f}s)")
+
+    def __getattr__(self, attribute):
+        # Only called for attributes the stand-in itself does not have
+        return getattr(self.get(), attribute)
@@ -0,0 +1,313 @@
+"""
+Hot-path instrumentation: counters, gauges and timers with a Prometheus text exporter.
+
+Instrumented code reports to the module-level `metrics` registry. While it
+is disabled (the default), timers and counters return after a single flag
+check, so instrumentation can stay in the frame loop permanently.
+"""
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .stats import LatencyTracker
+from ..config import (
+    METRICS_ENABLED, METRICS_PREFIX, METRICS_WINDOW, METRICS_EXPORT,
+    METRICS_HOST, METRICS_PORT, METRICS_FILE, METRICS_EXPORT_INTERVAL
+)
+
+_NULL_TIMER = nullcontext()
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in items) + "}"
+
+
+class Metrics:
+    """
+    Registry of counters, gauges and timers.
+
+    Timers keep a running count and sum plus a window of recent samples,
+    from which the exported quantiles are computed.
+    """
+    def __init__(self, enabled=METRICS_ENABLED, prefix=METRICS_PREFIX, window=METRICS_WINDOW):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled (bool): Whether anything is recorded
+            prefix (str): Prefix added to every exported metric name
+            window (int): Recent samples kept per timer for quantiles
+        """
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timers = {}
+        self._recent = LatencyTracker(window)
+
+    def inc(self, name, amount=1, **labels):
+        """Increase a counter."""
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        """Set a gauge to a value."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._gauges[_key(name, labels)] = value
+
+    def observe(self, name, seconds, **labels):
+        """Record one timer sample in seconds."""
+        if self.enabled:
+            self._observe(_key(name, labels), seconds)
+
+    def _observe(self, key, seconds):
+        with self._lock:
+            count, total = self._timers.get(key, (0, 0.0))
+            self._timers[key] = (count + 1, total + seconds)
+        self._recent.record(key, seconds)
+
+    def timer(self, name, **labels):
+        """Return a context manager that times its body (a no-op while disabled)."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self._timer(_key(name, labels))
+
+    @contextmanager
+    def _timer(self, key):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._observe(key, time.perf_counter() - start)
+
+    def timed(self, name, **labels):
+        """Decorator that times every call of a function."""
+        key = _key(name, labels)
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._observe(key, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def summary(self, name, **labels):
+        """Return the recent-sample summary of a timer (see LatencyTracker.summary)."""
+        return self._recent.summary(_key(name, labels))
+
+    def value(self, name, **labels):
+        """Return the current value of a counter or gauge, or None."""
+        key = _key(name, labels)
+        with self._lock:
+            return self._counters.get(key, self._gauges.get(key))
+
+    def render_prometheus(self):
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Counters, gauges, and timers as summaries with quantiles, _sum and _count
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            timers = sorted(self._timers.items())
+
+        lines = []
+        typed = set()
+
+        def declare(name, kind):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            declare(self.prefix + name, "counter")
+            lines.append(f"{self.prefix}{name}{_format_labels(labels)} {value}")
+        for (name, labels), value in gauges:
+            declare(self.prefix + name, "gauge")
+            lines.append(f"{self.prefix}{name}{_format_labels(labels)} {value}")
+        for key, (count, total) in timers:
+            name, labels = key
+            full_name = self.prefix + name
+            declare(full_name, "summary")
+            summary = self._recent.summary(key)
+            for quantile in QUANTILES:
+                value = summary.get(f"p{int(quantile * 100)}_ms")
+                if value is not None:
+                    lines.append(f"{full_name}{_format_labels(labels, quantile=quantile)} {value / 1000:.6f}")
+            lines.append(f"{full_name}_sum{_format_labels(labels)} {total:.6f}")
+            lines.append(f"{full_name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+class FpsMeter:
+    """
+    Frame rate from the time between successive ticks, smoothed exponentially.
+    """
+    def __init__(self, smoothing=0.1):
+        """
+        Initialize the meter.
+
+        Args:
+            smoothing (float): Weight given to each new frame interval
+        """
+        self.smoothing = smoothing
+        self.interval = None
+        self._last = None
+
+    @property
+    def fps(self):
+        """Current smoothed frames per second, or 0.0 before two ticks."""
+        return 1.0 / self.interval if self.interval else 0.0
+
+    def tick(self, now=None):
+        """Record that a frame was displayed."""
+        now = time.perf_counter() if now is None else now
+        if self._last is not None:
+            elapsed = now - self._last
+            self.interval = elapsed if self.interval is None else (
+                self.interval + self.smoothing * (elapsed - self.interval))
+        self._last = now
+        return self.fps
+
+
+class MetricsServer:
+    """
+    Serves the registry at http://host:port/metrics on a background thread.
+    """
+    def __init__(self, registry, host=METRICS_HOST, port=METRICS_PORT):
+        """
+        Initialize the server.
+
+        Args:
+            registry: Metrics to serve
+            host (str): Interface to bind, local only by default
+            port (int): TCP port
+        """
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Keep scrapes out of the console
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def address(self):
+        """(host, port) the server is listening on."""
+        return self.server.server_address[:2]
+
+    def start(self):
+        """Start serving."""
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        print(f"Serving metrics at http://{self.address[0]}:{self.address[1]}/metrics")
+
+    def stop(self):
+        """Stop serving."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class MetricsFileExporter:
+    """
+    Periodically writes the registry to a file, e.g. for node_exporter's textfile collector.
+    """
+    def __init__(self, registry, path=METRICS_FILE, interval=METRICS_EXPORT_INTERVAL):
+        """
+        Initialize the exporter.
+
+        Args:
+            registry: Metrics to export
+            path (str): Output file, replaced atomically on each write
+            interval (float): Seconds between writes
+        """
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def write(self):
+        """Write the current metrics once."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.registry.render_prometheus())
+        os.replace(temp_path, self.path)
+
+    def start(self):
+        """Start writing periodically."""
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-file", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self):
+        """Stop the writer, writing the final values once more."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        self.write()
+
+
+def create_exporter(registry, kind=METRICS_EXPORT):
+    """
+    Create the exporter selected in the config.
+
+    Args:
+        registry: Metrics to export
+        kind (str): "http", "file" or None
+
+    Returns:
+        MetricsServer, MetricsFileExporter or None
+    """
+    if kind is None:
+        return None
+    if kind == "http":
+        return MetricsServer(registry)
+    if kind == "file":
+        return MetricsFileExporter(registry)
+    raise ValueError(f"Unknown metrics exporter: {kind}")
+
+
+# Process-wide registry used by the instrumented modules
+metrics = Metrics()
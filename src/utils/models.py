@@ -0,0 +1,186 @@
+"""
+Model asset registry and per-user cache.
+
+Model files are downloaded once into a per-user cache directory, written
+atomically (a partial download can never be mistaken for a model), and
+verified against a SHA-256 hash on every start. Hashes are either pinned
+in the registry or recorded from the first download in a sidecar file.
+Model files from before the cache are only adopted when the hash is pinned,
+since nothing else can tell an intact one from a truncated one.
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import urllib.request
+from collections import namedtuple
+
+from ..config import MODEL_CACHE_DIR, MODEL_PATH, GESTURE_MODEL_URL, GESTURE_MODEL_SHA256
+
+# A downloadable model. sha256 may be None to trust (and record) the first download.
+ModelSpec = namedtuple("ModelSpec", ["name", "url", "filename", "sha256"])
+
+MODELS = {
+    "gesture_recognizer": ModelSpec("gesture_recognizer", GESTURE_MODEL_URL,
+                                    "gesture_recognizer.task", GESTURE_MODEL_SHA256),
+}
+
+# Existing model files from before the cache, adopted instead of downloading again
+LEGACY_PATHS = {
+    "gesture_recognizer": MODEL_PATH,
+}
+
+CHUNK_SIZE = 1 << 20
+
+
+def default_cache_dir():
+    """Return the platform's per-user cache directory for this application's models."""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "gesture-media-controller", "models")
+
+
+def file_sha256(path):
+    """Return the hex SHA-256 digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_model_bytes(path):
+    """
+    Read a whole model file into memory.
+
+    BaseOptions(model_asset_buffer=...) only accepts bytes, so this costs one
+    copy of the model; use it only where loading by path is not possible.
+    """
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _write_atomic(dest, write):
+    """Call write(file) on a temporary file next to dest, then move it into place."""
+    directory = os.path.dirname(dest) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".download-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, dest)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class ModelCache:
+    """
+    Fetches, stores and verifies model files.
+    """
+    def __init__(self, cache_dir=MODEL_CACHE_DIR, registry=MODELS, legacy_paths=LEGACY_PATHS):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory for cached models, defaults to default_cache_dir()
+            registry (dict): ModelSpecs by name
+            legacy_paths (dict): Pre-existing model files by name, adopted if present
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.registry = registry
+        self.legacy_paths = legacy_paths
+
+    def path(self, name):
+        """Return where the named model is cached (whether or not it exists yet)."""
+        return os.path.join(self.cache_dir, self.registry[name].filename)
+
+    def fetch(self, name):
+        """
+        Return the path of a verified copy of the named model, downloading it if needed.
+
+        A cached file that fails verification is replaced; nothing is
+        downloaded when a verified copy is already cached, so this works offline.
+
+        Raises:
+            ValueError: If a fresh download does not match the pinned hash
+        """
+        spec = self.registry[name]
+        path = self.path(name)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        if os.path.exists(path):
+            if self.verify(spec, path):
+                return path
+            print(f"Cached model {spec.name} failed verification; downloading it again")
+            self._discard(path)
+        elif self._adopt_legacy(spec, path):
+            return path
+
+        print(f"Downloading {spec.name} model...")
+        _write_atomic(path, lambda f: self._download(spec.url, f))
+        if not self.verify(spec, path, trust_new=True):
+            self._discard(path)
+            raise ValueError(f"Downloaded {spec.name} model does not match its pinned SHA-256")
+        print("Model downloaded successfully.")
+        return path
+
+    def verify(self, spec, path, trust_new=False):
+        """
+        Check a model file against its pinned or recorded hash.
+
+        Args:
+            spec: ModelSpec of the file
+            path (str): File to check
+            trust_new (bool): Record the hash if neither a pinned nor a recorded one exists
+
+        Returns:
+            bool: True if the file is intact
+        """
+        digest = file_sha256(path)
+        if spec.sha256:
+            return digest == spec.sha256.lower()
+
+        sidecar = path + ".sha256"
+        if os.path.exists(sidecar):
+            with open(sidecar, encoding="utf-8") as f:
+                return digest == f.read().strip()
+        if trust_new:
+            _write_atomic(sidecar, lambda f: f.write(digest.encode("ascii")))
+            return True
+        return False
+
+    def _adopt_legacy(self, spec, path):
+        """Copy a model file from before the cache existed into the cache, if it matches the pinned hash."""
+        legacy_path = self.legacy_paths.get(spec.name)
+        if not spec.sha256 or not legacy_path or not os.path.exists(legacy_path):
+            return False
+        with open(legacy_path, "rb") as source:
+            _write_atomic(path, lambda f: shutil.copyfileobj(source, f, CHUNK_SIZE))
+        if self.verify(spec, path):
+            return True
+        print(f"Model at {legacy_path} does not match the pinned SHA-256; downloading it instead")
+        self._discard(path)
+        return False
+
+    @staticmethod
+    def _download(url, f):
+        with urllib.request.urlopen(url, timeout=30) as response:
+            shutil.copyfileobj(response, f, CHUNK_SIZE)
+            # Without a pinned hash the first download is trusted, so it must at least be complete
+            expected = response.headers.get("Content-Length")
+            if expected is not None and f.tell() != int(expected):
+                raise OSError(f"Download incomplete: {f.tell()} of {expected} bytes")
+
+    @staticmethod
+    def _discard(path):
+        for stale in (path, path + ".sha256"):
+            if os.path.exists(stale):
+                os.remove(stale)
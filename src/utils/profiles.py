@@ -0,0 +1,163 @@
+"""
+Action profiles: what gestures, voice phrases and face events do in each media player.
+
+Profiles are declared in ACTION_PROFILES and compiled once when loaded:
+gestures and face events into dicts, voice phrases into a token trie. Looking
+up an input is then a single dict access (or a walk over the words said)
+however many bindings a profile has, and switching profiles only swaps
+which compiled profile is active.
+"""
+import re
+from collections import namedtuple
+
+from ..config import ACTION_PROFILES, ACTION_PROFILE
+
+# An action bound to an input; kind and args are as for ActionDispatcher.submit()
+Binding = namedtuple("Binding", ["kind", "args", "label"])
+
+BINDING_KINDS = ("press", "hotkey", "volume")
+FACE_EVENTS = ("away", "back")
+
+_WORD = re.compile(r"[a-z0-9']+")
+
+
+def tokenize(text):
+    """Split a phrase into lower-case words, ignoring punctuation."""
+    return _WORD.findall(text.lower())
+
+
+class PhraseTrie:
+    """
+    Trie of phrases keyed by word, for finding command phrases in speech.
+
+    Phrases only match whole words, so "back" is not found in "feedback",
+    and where phrases overlap the longest one wins ("previous track" over
+    "previous").
+    """
+    _END = object()  # Key of the value stored where a phrase ends
+
+    def __init__(self):
+        """Initialize an empty trie."""
+        self.root = {}
+        self.phrases = []
+
+    def add(self, phrase, value):
+        """Add a phrase and the value returned when it is found."""
+        words = tokenize(phrase)
+        if not words:
+            raise ValueError(f"Empty voice phrase: {phrase!r}")
+        node = self.root
+        for word in words:
+            node = node.setdefault(word, {})
+        node[self._END] = value
+        self.phrases.append(" ".join(words))
+
+    def find(self, text):
+        """
+        Find the first phrase in a text.
+
+        Args:
+            text (str): Recognized speech
+
+        Returns:
+            The value of the leftmost phrase found (the longest one starting
+            there), or None
+        """
+        words = tokenize(text)
+        for start in range(len(words)):
+            node, found = self.root, None
+            for word in words[start:]:
+                node = node.get(word)
+                if node is None:
+                    break
+                found = node.get(self._END, found)
+            if found is not None:
+                return found
+        return None
+
+
+def compile_binding(profile, action):
+    """Check a declared (kind, args, label) action and return it as a Binding."""
+    binding = Binding(*action)
+    if binding.kind not in BINDING_KINDS:
+        raise ValueError(f"Unknown action kind in profile '{profile}': {binding.kind}")
+    return binding
+
+
+class ActionProfile:
+    """
+    One profile compiled for lookup.
+    """
+    def __init__(self, name, spec):
+        """
+        Compile a profile.
+
+        Args:
+            name (str): Profile name
+            spec (dict): "gestures", "voice" and "face" mappings as in ACTION_PROFILES
+        """
+        self.name = name
+        self.gestures = {gesture: compile_binding(name, action)
+                         for gesture, action in spec.get("gestures", {}).items()}
+        self.voice = PhraseTrie()
+        for phrase, action in spec.get("voice", {}).items():
+            self.voice.add(phrase, compile_binding(name, action))
+        self.face = {}
+        for event, action in spec.get("face", {}).items():
+            if event not in FACE_EVENTS:
+                raise ValueError(f"Unknown face event in profile '{name}': {event}")
+            self.face[event] = compile_binding(name, action)
+
+
+class ActionMapper:
+    """
+    The compiled action profiles, one of which is active.
+
+    Shared by all controllers, so switching the profile switches every
+    input at once. Each lookup reads the active profile once, so a switch
+    from another thread never mixes two profiles within one action.
+    """
+    def __init__(self, profiles=ACTION_PROFILES, active=ACTION_PROFILE):
+        """
+        Compile the profiles.
+
+        Args:
+            profiles (dict): Profile declarations keyed by name
+            active (str): Name of the profile to start with
+        """
+        self.profiles = {name: ActionProfile(name, spec) for name, spec in profiles.items()}
+        self.active = None
+        self.select(active)
+
+    @property
+    def name(self):
+        """Name of the active profile."""
+        return self.active.name
+
+    def select(self, name):
+        """Make the named profile active."""
+        if name not in self.profiles:
+            raise ValueError(f"Unknown action profile: {name}")
+        self.active = self.profiles[name]
+
+    def next(self):
+        """Activate the profile after the active one (wrapping around) and return its name."""
+        names = list(self.profiles)
+        self.select(names[(names.index(self.name) + 1) % len(names)])
+        return self.name
+
+    def gesture(self, gesture_name):
+        """Return the Binding of a gesture in the active profile, or None."""
+        return self.active.gestures.get(gesture_name)
+
+    def voice(self, text):
+        """Return the Binding of the first command phrase in recognized speech, or None."""
+        return self.active.voice.find(text)
+
+    def face(self, event):
+        """Return the Binding of a face event ("away" or "back"), or None."""
+        return self.active.face.get(event)
+
+    def phrases(self):
+        """Return every profile's voice phrases, the vocabulary for offline recognizers."""
+        return sorted({phrase for profile in self.profiles.values() for phrase in profile.voice.phrases})
@@ -0,0 +1,107 @@
+"""
+Overlay rendering for hand skeletons, face boxes and status text.
+
+Controllers add what they want drawn to an Overlay; the overlay is then
+rendered onto the frame in a single pass with batched OpenCV calls.
+"""
+import cv2
+import numpy as np
+
+# Hand skeleton topology as (start, end) landmark indices, built once
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),  # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),  # Index finger
+    (0, 9), (9, 10), (10, 11), (11, 12),  # Middle finger
+    (0, 13), (13, 14), (14, 15), (15, 16),  # Ring finger
+    (0, 17), (17, 18), (18, 19), (19, 20),  # Pinky
+    (5, 9), (9, 13), (13, 17)  # Palm
+], dtype=np.intp)
+NUM_HAND_LANDMARKS = 21
+# Each joint as a zero-length segment (i, i); thick segments render as filled dots
+HAND_JOINTS = np.repeat(np.arange(NUM_HAND_LANDMARKS, dtype=np.intp)[:, None], 2, axis=1)
+
+LANDMARK_COLOR = (0, 255, 0)
+LANDMARK_RADIUS = 5
+CONNECTION_COLOR = (255, 255, 255)
+CONNECTION_THICKNESS = 2
+FACE_BOX_COLOR = (0, 255, 0)
+FACE_BOX_THICKNESS = 2
+
+
+def landmarks_to_array(hand_landmarks):
+    """
+    Convert MediaPipe normalized landmarks to an (N, 2) float32 array of x, y.
+
+    Args:
+        hand_landmarks: Sequence of landmarks with x and y attributes
+    """
+    return np.array([(landmark.x, landmark.y) for landmark in hand_landmarks], dtype=np.float32)
+
+
+class Overlay:
+    """
+    Collects a frame's overlays so they can be drawn in one render pass.
+    """
+    def __init__(self):
+        """Initialize an empty overlay."""
+        self.hands = []
+        self.boxes = []
+        self.texts = []
+
+    def add_hand(self, hand_landmarks):
+        """
+        Add a hand skeleton.
+
+        Args:
+            hand_landmarks: MediaPipe landmarks or an (N, 2) array of normalized x, y
+        """
+        if not isinstance(hand_landmarks, np.ndarray):
+            hand_landmarks = landmarks_to_array(hand_landmarks)
+        self.hands.append(hand_landmarks[:NUM_HAND_LANDMARKS, :2])
+
+    def add_box(self, xmin, ymin, width, height):
+        """Add a box given in coordinates normalized to the frame size."""
+        self.boxes.append((xmin, ymin, xmin + width, ymin + height))
+
+    def add_text(self, text, origin, scale, color, thickness=2):
+        """Add a line of text at a pixel position."""
+        self.texts.append((text, origin, scale, color, thickness))
+
+    def extend(self, other):
+        """Add everything collected by another overlay."""
+        self.hands.extend(other.hands)
+        self.boxes.extend(other.boxes)
+        self.texts.extend(other.texts)
+
+    def render(self, frame):
+        """
+        Draw every collected overlay onto the frame.
+
+        Args:
+            frame: OpenCV BGR image frame, modified in place
+
+        Returns:
+            The same frame, for chaining
+        """
+        height, width = frame.shape[:2]
+        size = np.array([width, height], dtype=np.float32)
+
+        if self.hands:
+            # All hands to pixel coordinates at once: (hands, 21, 2)
+            points = (np.stack(self.hands) * size).astype(np.int32)
+
+            # Every joint of every hand is drawn by a single call
+            joints = points[:, HAND_JOINTS].reshape(-1, 2, 2)
+            cv2.polylines(frame, joints, False, LANDMARK_COLOR, LANDMARK_RADIUS * 2)
+
+            segments = points[:, HAND_CONNECTIONS].reshape(-1, 2, 2)
+            cv2.polylines(frame, segments, False, CONNECTION_COLOR, CONNECTION_THICKNESS)
+
+        for xmin, ymin, xmax, ymax in self.boxes:
+            cv2.rectangle(frame, (int(xmin * width), int(ymin * height)),
+                          (int(xmax * width), int(ymax * height)), FACE_BOX_COLOR, FACE_BOX_THICKNESS)
+
+        for text, origin, scale, color, thickness in self.texts:
+            cv2.putText(frame, text, origin, cv2.FONT_HERSHEY_SIMPLEX, scale, color, thickness)
+
+        return frame
@@ -0,0 +1,81 @@
+"""
+Adaptive scheduling for detectors that do not need to run on every frame.
+"""
+import time
+
+
+class DetectionScheduler:
+    """
+    Decides when a detector should run, adapting its rate to how stable the output is.
+
+    The detector runs at base_hz normally, at boost_hz for a short time after
+    its state changes, and backs off towards min_hz the longer the state has
+    been stable. Between runs callers reuse the last result.
+    """
+    def __init__(self, base_hz, min_hz=None, boost_hz=None, stable_after=5.0, boost_duration=1.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            base_hz (float): Normal detection rate, or None to run on every frame
+            min_hz (float): Lowest rate reached while the state is stable
+            boost_hz (float): Rate used right after a state change
+            stable_after (float): Seconds without change before backing off
+            boost_duration (float): Seconds the boosted rate lasts after a change
+        """
+        self.base_hz = base_hz
+        self.min_hz = min_hz if min_hz is not None else base_hz
+        self.boost_hz = boost_hz if boost_hz is not None else base_hz
+        self.stable_after = stable_after
+        self.boost_duration = boost_duration
+        self.last_run = None
+        self.last_state = None
+        self.last_change = None
+
+    def rate(self, now=None):
+        """
+        Return the detection rate in Hz for the current moment.
+
+        Args:
+            now (float): Monotonic timestamp, defaults to time.monotonic()
+        """
+        if self.base_hz is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if self.last_change is None:
+            return self.boost_hz
+
+        since_change = now - self.last_change
+        if since_change < self.boost_duration:
+            return self.boost_hz
+        if since_change > self.stable_after:
+            # Back off gradually: the rate falls in proportion to how long it has been stable
+            return max(self.min_hz, self.base_hz * self.stable_after / since_change)
+        return self.base_hz
+
+    def should_run(self, now=None):
+        """
+        Return True if enough time has passed since the last run.
+
+        Args:
+            now (float): Monotonic timestamp, defaults to time.monotonic()
+        """
+        rate = self.rate(now)
+        if rate is None or self.last_run is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self.last_run >= 1.0 / rate
+
+    def record(self, state, now=None):
+        """
+        Record that the detector ran and what state it observed.
+
+        Args:
+            state: Hashable detector state, e.g. whether a face is present
+            now (float): Monotonic timestamp, defaults to time.monotonic()
+        """
+        now = time.monotonic() if now is None else now
+        self.last_run = now
+        if state != self.last_state:
+            self.last_state = state
+            self.last_change = now
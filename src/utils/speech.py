@@ -0,0 +1,141 @@
+"""
+Speech recognition backends for voice control.
+
+Each backend turns a speech_recognition AudioData phrase into text. Offline
+backends are restricted to the small command grammar the voice controller
+understands, which keeps decoding fast and avoids the network round trip.
+"""
+import json
+import os
+
+import speech_recognition as sr
+
+from ..config import SPHINX_KEYWORD_SENSITIVITY, VOSK_MODEL_PATH, VOSK_SAMPLE_RATE
+
+
+class SpeechBackend:
+    """
+    Base class for speech recognition backends.
+    """
+    name = "base"
+
+    def __init__(self, recognizer, phrases):
+        """
+        Initialize the backend.
+
+        Args:
+            recognizer: speech_recognition.Recognizer used to drive the engine
+            phrases (list): Command phrases the backend should listen for
+        """
+        self.recognizer = recognizer
+        self.phrases = list(phrases)
+
+    def recognize(self, audio):
+        """
+        Transcribe a phrase.
+
+        Args:
+            audio: speech_recognition.AudioData
+
+        Returns:
+            str: Lower-case transcription
+
+        Raises:
+            speech_recognition.UnknownValueError: If nothing was understood
+        """
+        raise NotImplementedError
+
+
+class GoogleSpeechBackend(SpeechBackend):
+    """
+    Online recognition through the Google Web Speech API.
+    """
+    name = "google"
+
+    def recognize(self, audio):
+        return self.recognizer.recognize_google(audio).lower()
+
+
+class SphinxSpeechBackend(SpeechBackend):
+    """
+    Offline recognition with CMU PocketSphinx in keyword-spotting mode.
+
+    Only the command phrases are searched for, so decoding is much faster
+    than open-vocabulary recognition.
+    """
+    name = "sphinx"
+
+    def __init__(self, recognizer, phrases, sensitivity=SPHINX_KEYWORD_SENSITIVITY):
+        super().__init__(recognizer, phrases)
+        # Imported here only to fail early if PocketSphinx is missing
+        import pocketsphinx  # noqa: F401
+        self.keyword_entries = [(phrase, sensitivity) for phrase in self.phrases]
+
+    def recognize(self, audio):
+        text = self.recognizer.recognize_sphinx(audio, keyword_entries=self.keyword_entries)
+        text = " ".join(text.split()).lower()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class VoskSpeechBackend(SpeechBackend):
+    """
+    Offline recognition with Vosk, constrained to the command grammar.
+
+    speech_recognition's recognize_vosk() cannot take a grammar, so the Vosk
+    recognizer is driven directly with the phrase list plus "[unk]" for
+    out-of-grammar speech.
+    """
+    name = "vosk"
+
+    def __init__(self, recognizer, phrases, model_path=VOSK_MODEL_PATH,
+                 sample_rate=VOSK_SAMPLE_RATE):
+        super().__init__(recognizer, phrases)
+        from vosk import Model, SetLogLevel
+
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Vosk model not found at {model_path}")
+        SetLogLevel(-1)
+        self.model = Model(model_path)
+        self.sample_rate = sample_rate
+        self.grammar = json.dumps(self.phrases + ["[unk]"])
+
+    def recognize(self, audio):
+        from vosk import KaldiRecognizer
+
+        # A fresh recognizer per phrase keeps utterances independent
+        kaldi = KaldiRecognizer(self.model, self.sample_rate, self.grammar)
+        kaldi.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+        text = json.loads(kaldi.FinalResult()).get("text", "")
+        text = text.replace("[unk]", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+SPEECH_BACKENDS = {
+    backend.name: backend
+    for backend in (GoogleSpeechBackend, SphinxSpeechBackend, VoskSpeechBackend)
+}
+
+
+def create_speech_backend(name, recognizer, phrases):
+    """
+    Create a speech backend by name, falling back to Google if it is unavailable.
+
+    Args:
+        name (str): One of SPEECH_BACKENDS
+        recognizer: speech_recognition.Recognizer
+        phrases (list): Command phrases for offline grammars
+
+    Returns:
+        SpeechBackend
+    """
+    if name not in SPEECH_BACKENDS:
+        raise ValueError(f"Unknown speech backend: {name}")
+    try:
+        return SPEECH_BACKENDS[name](recognizer, phrases)
+    except (ImportError, OSError) as e:
+        print(f"Speech backend '{name}' unavailable ({e}); using Google instead")
+        return GoogleSpeechBackend(recognizer, phrases)
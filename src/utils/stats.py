@@ -0,0 +1,88 @@
+"""
+Lightweight latency statistics.
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def percentile(sorted_values, fraction):
+    """
+    Return the value at the given fraction of an already sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): Position between 0.0 and 1.0
+
+    Returns:
+        float or None: Nearest-rank percentile, or None for an empty list
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class LatencyTracker:
+    """
+    Keeps the most recent latency samples per key and summarizes them.
+    """
+    def __init__(self, window=500):
+        """
+        Initialize the tracker.
+
+        Args:
+            window (int): Number of recent samples kept for each key, or None to keep all
+        """
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, key, seconds):
+        """Record one latency sample, in seconds, under the given key."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def clear(self):
+        """Discard every sample."""
+        with self._lock:
+            self._samples.clear()
+
+    @contextmanager
+    def timer(self, key):
+        """Time the body of a with block and record it under the given key."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(key, time.perf_counter() - start)
+
+    def summary(self, key):
+        """
+        Summarize the samples recorded under a key.
+
+        Returns:
+            dict: count, mean, p50, p95, p99 and max in milliseconds (empty if no samples)
+        """
+        with self._lock:
+            values = sorted(self._samples.get(key, ()))
+        if not values:
+            return {}
+        return {
+            "count": len(values),
+            "mean_ms": 1000 * sum(values) / len(values),
+            "p50_ms": 1000 * percentile(values, 0.50),
+            "p95_ms": 1000 * percentile(values, 0.95),
+            "p99_ms": 1000 * percentile(values, 0.99),
+            "max_ms": 1000 * values[-1]
+        }
+
+    def report(self):
+        """Return the summary of every key."""
+        with self._lock:
+            keys = list(self._samples)
+        return {key: self.summary(key) for key in keys}
@@ -0,0 +1,186 @@
+"""
+Hand tracking IDs and control arbitration for multi-hand recognition.
+
+MediaPipe returns the hands of a frame in no particular order. HandTracker
+gives each hand a stable ID by associating it with the nearest track
+centre from the previous frames, and HandArbiter picks the one track whose
+gestures control playback. Only that track runs the gesture filters, so the
+per-frame cost of extra people in view is one distance matrix.
+"""
+import numpy as np
+
+from ..config import (
+    HAND_ARBITRATION, HAND_TRACK_MAX_DISTANCE, HAND_TRACK_TIMEOUT, HAND_SWITCH_MARGIN
+)
+
+ARBITRATION_POLICIES = ("largest", "closest_face", "designated")
+
+
+def hand_boxes(hands):
+    """
+    Return the centre and size of each hand's bounding box.
+
+    Args:
+        hands: Sequence of (N, 2) arrays of normalized landmark x, y
+
+    Returns:
+        tuple: (centers, sizes) as (hands, 2) and (hands,) arrays; size is the box diagonal
+    """
+    if not len(hands):
+        return np.zeros((0, 2)), np.zeros(0)
+    points = np.stack(hands)
+    low, high = points.min(axis=1), points.max(axis=1)
+    return (low + high) / 2, np.hypot(*(high - low).T)
+
+
+class HandTrack:
+    """
+    State of one tracked hand.
+
+    The filters are only created once the hand first takes control, and
+    then kept so the hand resumes where it left off if it regains control.
+    """
+    __slots__ = ("id", "center", "size", "last_seen", "index",
+                 "gesture_filter", "swipe_detector", "volume_filter")
+
+    def __init__(self, track_id, center, size, now):
+        self.id = track_id
+        self.center = center
+        self.size = size
+        self.last_seen = now
+        self.index = None  # Position of the hand in the current result, None when not seen
+        self.gesture_filter = None
+        self.swipe_detector = None
+        self.volume_filter = None
+
+    @property
+    def visible(self):
+        """Whether the hand was found in the latest frame."""
+        return self.index is not None
+
+
+class HandTracker:
+    """
+    Assigns tracking IDs to hands by nearest-centroid association.
+    """
+    def __init__(self, max_distance=HAND_TRACK_MAX_DISTANCE, timeout=HAND_TRACK_TIMEOUT):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_distance (float): Furthest a hand centre may move between frames and keep its ID
+            timeout (float): Seconds a track survives without a matching hand
+        """
+        self.max_distance = max_distance
+        self.timeout = timeout
+        self.tracks = []
+        self._next_id = 1
+
+    def reset(self):
+        """Forget all tracks."""
+        self.tracks = []
+
+    def update(self, centers, sizes, now):
+        """
+        Match this frame's hands to tracks, starting new tracks for new hands.
+
+        Pairs are assigned greedily, closest first, so two hands never
+        share a track. Tracks without a hand keep their state until timeout.
+
+        Args:
+            centers: (hands, 2) array of hand centres
+            sizes: (hands,) array of hand sizes
+            now (float): Frame time in seconds
+
+        Returns:
+            list: The HandTrack of each hand, in the order given
+        """
+        assigned = [None] * len(centers)
+        for track in self.tracks:
+            track.index = None
+
+        if self.tracks and len(centers):
+            previous = np.array([track.center for track in self.tracks])
+            distances = np.linalg.norm(previous[:, None, :] - centers[None, :, :], axis=2)
+            taken = np.zeros(len(self.tracks), dtype=bool)
+            for flat in np.argsort(distances, axis=None):
+                t, h = divmod(int(flat), len(centers))
+                if distances[t, h] > self.max_distance:
+                    break
+                if not taken[t] and assigned[h] is None:
+                    taken[t] = True
+                    assigned[h] = self.tracks[t]
+
+        for h, track in enumerate(assigned):
+            if track is None:
+                track = HandTrack(self._next_id, centers[h], sizes[h], now)
+                self._next_id += 1
+                self.tracks.append(track)
+                assigned[h] = track
+            track.center, track.size, track.last_seen, track.index = centers[h], sizes[h], now, h
+
+        self.tracks = [track for track in self.tracks if now - track.last_seen <= self.timeout]
+        return assigned
+
+
+class HandArbiter:
+    """
+    Chooses which tracked hand controls playback.
+
+    Control only moves to another hand when it scores HAND_SWITCH_MARGIN
+    times better than the current controller, so two similar hands do not
+    take turns from frame to frame.
+    """
+    def __init__(self, policy=HAND_ARBITRATION, margin=HAND_SWITCH_MARGIN):
+        """
+        Initialize the arbiter.
+
+        Args:
+            policy (str): "largest", "closest_face" or "designated"
+            margin (float): Score ratio another hand needs to take control
+        """
+        if policy not in ARBITRATION_POLICIES:
+            raise ValueError(f"Unknown hand arbitration policy: {policy}")
+        self.policy = policy
+        self.margin = margin
+        self.controller_id = None
+
+    def select(self, tracks, faces=()):
+        """
+        Pick the controlling hand among the tracks.
+
+        Args:
+            tracks (list): Live HandTracks from HandTracker
+            faces: Face boxes (xmin, ymin, width, height), normalized, for "closest_face"
+
+        Returns:
+            HandTrack or None: The controlling hand if it is visible this frame
+        """
+        current = next((track for track in tracks if track.id == self.controller_id), None)
+        if self.policy == "designated" and current is not None:
+            # The controller keeps control while its track lives, even if missed for a frame
+            return current if current.visible else None
+
+        visible = [track for track in tracks if track.visible]
+        if not visible:
+            return None
+
+        scores = self._scores(visible, faces)
+        best = int(np.argmax(scores))
+        if current is not None and current.visible:
+            current_score = scores[visible.index(current)]
+            if scores[best] < current_score * self.margin:
+                return current
+
+        self.controller_id = visible[best].id
+        return visible[best]
+
+    def _scores(self, tracks, faces):
+        """Return a positive score per track, higher meaning more likely to control."""
+        if self.policy == "closest_face" and len(faces):
+            # The main viewer is the largest face, i.e. the one nearest the camera
+            xmin, ymin, width, height = max(faces, key=lambda box: box[2] * box[3])
+            face_center = np.array([xmin + width / 2, ymin + height / 2])
+            distances = np.linalg.norm(np.array([track.center for track in tracks]) - face_center, axis=1)
+            return 1.0 / (distances + 0.05)
+        return np.array([track.size for track in tracks])
@@ -0,0 +1,180 @@
+"""
+Hand trajectory history and motion (swipe) gesture detection.
+
+Static poses are classified per frame by MediaPipe; motion gestures are
+detected here from how the hand moves, using a fixed-size history of
+landmark positions and a few vectorised velocity features.
+"""
+import numpy as np
+
+from ..config import (
+    TRAJECTORY_LENGTH, TRAJECTORY_LANDMARKS, SWIPE_WINDOW, SWIPE_MIN_DISTANCE,
+    SWIPE_MIN_SPEED, SWIPE_MIN_CONSISTENCY, SWIPE_MAX_OFF_AXIS, SWIPE_COOLDOWN
+)
+
+# Unit direction of each swipe in normalized image coordinates (y grows downwards)
+SWIPE_DIRECTIONS = {
+    "Swipe_Right": (1.0, 0.0),
+    "Swipe_Left": (-1.0, 0.0),
+    "Swipe_Down": (0.0, 1.0),
+    "Swipe_Up": (0.0, -1.0),
+}
+
+
+class TrajectoryBuffer:
+    """
+    Ring buffer of recent landmark positions with their timestamps.
+
+    Positions are stored in a preallocated (length, landmarks, 2) array, so
+    adding a frame never allocates.
+    """
+    def __init__(self, length=TRAJECTORY_LENGTH, landmarks=TRAJECTORY_LANDMARKS):
+        """
+        Initialize the buffer.
+
+        Args:
+            length (int): Number of frames kept
+            landmarks (tuple): Indices of the hand landmarks to track
+        """
+        self.landmarks = np.array(landmarks, dtype=np.intp)
+        self.positions = np.zeros((length, len(landmarks), 2), dtype=np.float32)
+        self.times = np.zeros(length, dtype=np.float64)
+        self.clear()
+
+    def clear(self):
+        """Forget all history."""
+        self.position = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, hand_landmarks, now):
+        """
+        Record one frame of a hand.
+
+        Args:
+            hand_landmarks: MediaPipe landmarks or an (N, 2) array of normalized x, y
+            now (float): Monotonic timestamp in seconds
+        """
+        row = self.positions[self.position]
+        if isinstance(hand_landmarks, np.ndarray):
+            row[:] = hand_landmarks[self.landmarks, :2]
+        else:
+            for i, index in enumerate(self.landmarks):
+                row[i, 0] = hand_landmarks[index].x
+                row[i, 1] = hand_landmarks[index].y
+        self.times[self.position] = now
+        self.position = (self.position + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+
+    def recent(self, duration, now):
+        """
+        Return the frames recorded in the last duration seconds, oldest first.
+
+        Returns:
+            tuple: (times, positions) arrays
+        """
+        order = (np.arange(self.count) + self.position - self.count) % len(self.times)
+        times = self.times[order]
+        keep = times >= now - duration
+        return times[keep], self.positions[order[keep]]
+
+
+class SwipeDetector:
+    """
+    Detects quick swipes of the whole hand from its trajectory.
+
+    Over the last SWIPE_WINDOW seconds the tracked landmarks are averaged
+    into one hand position per frame. A swipe is reported when that position
+    moved far and fast enough, mostly along one axis, and with most of the
+    frame-to-frame steps in the same direction.
+    """
+    def __init__(self, buffer=None, window=SWIPE_WINDOW, min_distance=SWIPE_MIN_DISTANCE,
+                 min_speed=SWIPE_MIN_SPEED, min_consistency=SWIPE_MIN_CONSISTENCY,
+                 max_off_axis=SWIPE_MAX_OFF_AXIS, cooldown=SWIPE_COOLDOWN):
+        """
+        Initialize the detector.
+
+        Args:
+            buffer: TrajectoryBuffer to record into, created if None
+            window (float): Seconds of history a swipe must fit into
+            min_distance (float): Minimum travel as a fraction of the frame
+            min_speed (float): Minimum average speed in frames per second
+            min_consistency (float): Fraction of steps that must move in the swipe direction
+            max_off_axis (float): Maximum ratio of sideways to forward travel
+            cooldown (float): Seconds after a swipe before another is reported
+        """
+        self.buffer = buffer or TrajectoryBuffer()
+        self.window = window
+        self.min_distance = min_distance
+        self.min_speed = min_speed
+        self.min_consistency = min_consistency
+        self.max_off_axis = max_off_axis
+        self.cooldown = cooldown
+        self.last_swipe_time = float("-inf")
+
+    def reset(self):
+        """Forget the trajectory, e.g. when the hand is lost."""
+        self.buffer.clear()
+
+    def update(self, hand_landmarks, now):
+        """
+        Record a frame and check for a swipe.
+
+        Args:
+            hand_landmarks: MediaPipe landmarks or an (N, 2) array of normalized x, y
+            now (float): Monotonic timestamp in seconds
+
+        Returns:
+            str or None: A SWIPE_DIRECTIONS name if a swipe just completed
+        """
+        self.buffer.add(hand_landmarks, now)
+        if now - self.last_swipe_time < self.cooldown:
+            return None
+
+        swipe = self.classify(*self.buffer.recent(self.window, now))
+        if swipe is not None:
+            self.last_swipe_time = now
+            # Start afresh so the same motion is not reported twice
+            self.buffer.clear()
+        return swipe
+
+    def classify(self, times, positions):
+        """
+        Classify a trajectory segment.
+
+        Args:
+            times: (N,) timestamps, oldest first
+            positions: (N, landmarks, 2) normalized positions
+
+        Returns:
+            str or None: Swipe name, or None if the motion is not a swipe
+        """
+        if len(times) < 3:
+            return None
+        duration = times[-1] - times[0]
+        if duration <= 0:
+            return None
+
+        centers = positions.mean(axis=1)
+        displacement = centers[-1] - centers[0]
+        distance = np.abs(displacement)
+        axis = int(distance.argmax())
+        travel = distance[axis]
+        if travel < self.min_distance or travel / duration < self.min_speed:
+            return None
+        if distance[1 - axis] > self.max_off_axis * travel:
+            return None
+
+        # Most steps along the main axis must agree in sign with the overall motion
+        steps = np.diff(centers[:, axis])
+        if np.mean(np.sign(steps) == np.sign(displacement[axis])) < self.min_consistency:
+            return None
+
+        direction = [0.0, 0.0]
+        direction[axis] = float(np.sign(displacement[axis]))
+        for name, unit in SWIPE_DIRECTIONS.items():
+            if unit == tuple(direction):
+                return name
+        return None
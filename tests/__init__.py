@@ -1,3 +1,3 @@
-"""
-Test package for gesture media controller.
-"""
+"""
+Test package for gesture media controller.
+"""
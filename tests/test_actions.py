@@ -0,0 +1,78 @@
+"""
+Tests for the asynchronous action dispatcher.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils.actions import Action, ActionDispatcher, coalesce
+
+
+def make_action(kind, args, source="gesture", queued_at=0.0):
+    """Build an Action with default label and source."""
+    return Action(kind, args, None, source, queued_at)
+
+
+class TestCoalesce(unittest.TestCase):
+    """Test cases for the coalesce function."""
+    
+    def test_merges_repeated_presses(self):
+        """Test that identical consecutive presses merge into one with a count."""
+        merged = coalesce([make_action("press", "up", queued_at=t) for t in range(5)])
+        self.assertEqual(len(merged), 1)
+        action, count = merged[0]
+        self.assertEqual((action.args, count, action.queued_at), ("up", 5, 0))
+    
+    def test_sums_volume_changes(self):
+        """Test that relative volume changes are summed into one step."""
+        merged = coalesce([make_action("volume", 0.1), make_action("volume", 0.1),
+                           make_action("volume", -0.05)])
+        self.assertEqual(len(merged), 1)
+        self.assertAlmostEqual(merged[0][0].args, 0.15)
+        self.assertEqual(merged[0][1], 3)
+    
+    def test_keeps_last_absolute_volume(self):
+        """Test that only the newest absolute volume level is kept."""
+        merged = coalesce([make_action("set_volume", 0.2, queued_at=1.0),
+                           make_action("set_volume", 0.6, queued_at=2.0)])
+        self.assertEqual(len(merged), 1)
+        self.assertEqual(merged[0][0].args, 0.6)
+        self.assertEqual(merged[0][0].queued_at, 1.0)
+    
+    def test_does_not_merge_different_actions(self):
+        """Test that different keys or sources are kept separate and in order."""
+        actions = [make_action("press", "up"), make_action("press", "down"),
+                   make_action("press", "down", source="voice")]
+        self.assertEqual([a.args for a, _ in coalesce(actions)], ["up", "down", "down"])
+
+
+class TestActionDispatcher(unittest.TestCase):
+    """Test cases for ActionDispatcher class."""
+    
+    @patch('src.utils.actions.pyautogui')
+    def test_executes_and_records(self, mock_pyautogui):
+        """Test that queued actions run on the worker and are recorded."""
+        audio_controller = MagicMock()
+        dispatcher = ActionDispatcher(audio_controller)
+        dispatcher.press("space", label="Toggle Play/Pause", source="gesture")
+        dispatcher.change_volume(0.2, source="voice")
+        dispatcher.stop()
+        
+        mock_pyautogui.press.assert_called_with("space", presses=1, _pause=False)
+        audio_controller.increase_volume.assert_called_with(0.2)
+        self.assertEqual([record.source for record in dispatcher.records], ["gesture", "voice"])
+        for record in dispatcher.records:
+            self.assertGreaterEqual(record.executed_at, record.queued_at)
+    
+    @patch('src.utils.actions.pyautogui')
+    def test_drops_oldest_when_full(self, mock_pyautogui):
+        """Test that a full queue drops its oldest action instead of blocking."""
+        dispatcher = ActionDispatcher(maxsize=2)
+        dispatcher.start = MagicMock()  # Keep the worker from draining the queue
+        for key in ("a", "b", "c"):
+            dispatcher.press(key)
+        self.assertEqual(dispatcher.dropped, 1)
+        self.assertEqual([dispatcher.queue.get_nowait().args for _ in range(2)], ["b", "c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for head-pose attention and face-driven pausing.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from src.controllers import face_controller
+from src.controllers.face_controller import FaceController, FaceResult, NO_FACES
+from src.utils.attention import AttentionTracker, HEAD_MODEL, POSE_LANDMARKS, head_angles, pose_points
+from src.utils.profiles import ActionMapper
+
+FRAME_SIZE = (640, 480)
+
+
+def project_head(yaw, pitch=0.0, mirror=False):
+    """Return a (1, 478, 2) landmark array of the model head turned by yaw and pitch degrees."""
+    width, height = FRAME_SIZE
+    camera = np.array([[width, 0, width / 2], [0, width, height / 2], [0, 0, 1]], dtype=np.float64)
+    rvec = cv2.Rodrigues(cv2.Rodrigues(np.radians([pitch, 0.0, 0.0]))[0] @
+                         cv2.Rodrigues(np.radians([0.0, yaw, 0.0]))[0])[0]
+    pixels, _ = cv2.projectPoints(HEAD_MODEL, rvec, np.array([0.0, 0.0, 1500.0]), camera, None)
+    points = pixels.reshape(-1, 2) / FRAME_SIZE
+    if mirror:
+        points[:, 0] = 1.0 - points[:, 0]
+    landmarks = np.full((1, 478, 2), 0.5)
+    landmarks[0, POSE_LANDMARKS] = points
+    return landmarks
+
+
+class TestHeadPose(unittest.TestCase):
+    """Test cases for head pose estimation."""
+
+    def test_recovers_angles(self):
+        """Test that yaw and pitch of a projected head are recovered."""
+        for yaw, pitch in ((0, 0), (40, 0), (-25, 0), (0, 20)):
+            angles = head_angles(pose_points(project_head(yaw, pitch)), FRAME_SIZE)
+            np.testing.assert_allclose(np.abs(angles[0]), [abs(yaw), abs(pitch)], atol=2.0)
+
+    def test_mirrored_frame(self):
+        """Test that a mirrored frame gives the same amount of turn."""
+        angles = head_angles(pose_points(project_head(35, mirror=True)), FRAME_SIZE)
+        self.assertAlmostEqual(abs(angles[0, 0]), 35, delta=2.0)
+
+
+class TestAttentionTracker(unittest.TestCase):
+    """Test cases for AttentionTracker class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tracker = AttentionTracker(max_yaw=30, max_pitch=25, hysteresis=10,
+                                        pause_after=1.5, resume_after=0.5)
+
+    def test_angle_hysteresis(self):
+        """Test that the limits widen while the viewer is already looking."""
+        self.assertTrue(self.tracker.is_looking(np.array([[35.0, 0.0]])))
+        self.tracker.update(False, 0.0)
+        self.assertFalse(self.tracker.is_looking(np.array([[35.0, 0.0]])))
+        self.assertTrue(self.tracker.is_looking(np.array([[50.0, 0.0], [10.0, 5.0]])))
+
+    def test_confirmation(self):
+        """Test that flickers are ignored and lasting changes are confirmed once."""
+        changes = [self.tracker.update(looking, t / 10) for t, looking in enumerate(
+            [True, False, False, True, False] + [False] * 15 + [True] * 6)]
+        self.assertEqual([t for t, changed in enumerate(changes) if changed], [19, 25])
+        self.assertTrue(self.tracker.attentive)
+
+
+class TestFaceController(unittest.TestCase):
+    """Test cases for FaceController pausing."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        # Detection itself is not exercised, so the MediaPipe solutions are stubbed
+        solutions = patch.object(face_controller.mp, "solutions", MagicMock(), create=True)
+        solutions.start()
+        self.addCleanup(solutions.stop)
+        self.dispatcher = MagicMock()
+        self.controller = FaceController(dispatcher=self.dispatcher, mode="presence")
+        self.frame = np.zeros((48, 64, 3), dtype=np.uint8)
+        self.face = FaceResult(np.array([[0.4, 0.3, 0.2, 0.3]]), None)
+
+    def feed(self, result, start, frames):
+        for i in range(frames):
+            self.controller.handle_result(self.frame, result, timestamp=start + i / 10)
+
+    def test_pause_and_resume_once(self):
+        """Test that one pause and one resume are sent however long the absence lasts."""
+        self.feed(NO_FACES, 0.0, 40)
+        self.assertEqual(self.dispatcher.submit.call_count, 1)
+        self.assertEqual(self.dispatcher.submit.call_args.args[:2], ("press", "space"))
+        self.assertTrue(self.controller.paused_by_face)
+        self.feed(self.face, 4.0, 10)
+        self.assertEqual(self.dispatcher.submit.call_count, 2)
+        self.assertFalse(self.controller.paused_by_face)
+
+    def test_no_resume_without_pause(self):
+        """Test that a returning viewer does not unpause playback paused elsewhere."""
+        self.controller.attention.attentive = False
+        self.feed(self.face, 0.0, 10)
+        self.assertTrue(self.controller.attentive)
+        self.dispatcher.submit.assert_not_called()
+
+    def test_profile_without_face_events(self):
+        """Test that a profile that binds no face events never pauses."""
+        self.controller.action_map = ActionMapper({"quiet": {}}, "quiet")
+        self.feed(NO_FACES, 0.0, 40)
+        self.dispatcher.submit.assert_not_called()
+        self.assertFalse(self.controller.paused_by_face)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,64 +1,176 @@
-"""
-Tests for the audio controller module.
-"""
-import unittest
-from unittest.mock import MagicMock, patch
-
-from gesture_media_controller.utils.audio import AudioController
-
-
-class TestAudioController(unittest.TestCase):
-    """Test cases for AudioController class."""
-    
-    @patch('gesture_media_controller.utils.audio.AudioUtilities')
-    @patch('gesture_media_controller.utils.audio.cast')
-    def setUp(self, mock_cast, mock_audio_utils):
-        """Set up test fixtures."""
-        # Mock the volume interface
-        self.mock_volume = MagicMock()
-        self.mock_volume.GetMasterVolumeLevelScalar.return_value = 0.5
-        mock_cast.return_value = self.mock_volume
-        
-        # Create AudioController instance
-        self.audio_controller = AudioController()
-    
-    def test_get_volume(self):
-        """Test getting the current volume level."""
-        self.mock_volume.GetMasterVolumeLevelScalar.return_value = 0.75
-        volume = self.audio_controller.get_volume()
-        self.assertEqual(volume, 0.75)
-        self.assertEqual(self.audio_controller.current_volume, 0.75)
-    
-    def test_set_volume(self):
-        """Test setting the volume level."""
-        self.audio_controller.set_volume(0.6)
-        self.mock_volume.SetMasterVolumeLevelScalar.assert_called_with(0.6, None)
-        self.assertEqual(self.audio_controller.current_volume, 0.6)
-    
-    def test_set_volume_clamps_values(self):
-        """Test that set_volume clamps values to 0.0-1.0 range."""
-        # Test with value greater than 1.0
-        self.audio_controller.set_volume(1.5)
-        self.mock_volume.SetMasterVolumeLevelScalar.assert_called_with(1.0, None)
-        self.assertEqual(self.audio_controller.current_volume, 1.0)
-        
-        # Test with value less than 0.0
-        self.audio_controller.set_volume(-0.5)
-        self.mock_volume.SetMasterVolumeLevelScalar.assert_called_with(0.0, None)
-        self.assertEqual(self.audio_controller.current_volume, 0.0)
-    
-    def test_increase_volume(self):
-        """Test increasing volume."""
-        self.audio_controller.current_volume = 0.5
-        self.audio_controller.increase_volume(0.2)
-        self.mock_volume.SetMasterVolumeLevelScalar.assert_called_with(0.7, None)
-    
-    def test_decrease_volume(self):
-        """Test decreasing volume."""
-        self.audio_controller.current_volume = 0.5
-        self.audio_controller.decrease_volume(0.2)
-        self.mock_volume.SetMasterVolumeLevelScalar.assert_called_with(0.3, None)
-
-
-if __name__ == '__main__':
-    unittest.main()
+"""
+Tests for the audio controller module.
+"""
+import subprocess
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.utils.audio import (
+    AudioBackend, AudioController, MockAudioBackend, PycawAudioBackend, create_audio_backend
+)
+
+
+class TestAudioController(unittest.TestCase):
+    """Test cases for AudioController class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.backend = MockAudioBackend(level=0.5)
+        self.audio_controller = AudioController(self.backend)
+    
+    def test_get_volume(self):
+        """Test getting the current volume level."""
+        volume = self.audio_controller.get_volume()
+        self.assertEqual(volume, 0.5)
+        self.assertEqual(self.audio_controller.current_volume, 0.5)
+    
+    def test_get_volume_is_cached(self):
+        """Test that repeated reads do not query the backend."""
+        reads = self.backend.reads
+        for _ in range(5):
+            self.audio_controller.get_volume()
+        self.assertEqual(self.backend.reads, reads)
+    
+    def test_external_change_invalidates_cache(self):
+        """Test that a backend change event makes the next read hit the backend."""
+        self.backend.simulate_external_change(0.75)
+        self.assertEqual(self.audio_controller.get_volume(), 0.75)
+        self.assertEqual(self.audio_controller.current_volume, 0.75)
+    
+    def test_set_volume(self):
+        """Test setting the volume level."""
+        self.audio_controller.set_volume(0.6)
+        self.assertTrue(self.audio_controller.flush(timeout=1.0))
+        self.assertEqual(self.backend.writes[-1], 0.6)
+        self.assertEqual(self.audio_controller.current_volume, 0.6)
+    
+    def test_set_volume_clamps_values(self):
+        """Test that set_volume clamps values to 0.0-1.0 range."""
+        # Test with value greater than 1.0
+        self.audio_controller.set_volume(1.5)
+        self.audio_controller.flush(timeout=1.0)
+        self.assertEqual(self.backend.writes[-1], 1.0)
+        self.assertEqual(self.audio_controller.current_volume, 1.0)
+        
+        # Test with value less than 0.0
+        self.audio_controller.set_volume(-0.5)
+        self.audio_controller.flush(timeout=1.0)
+        self.assertEqual(self.backend.writes[-1], 0.0)
+        self.assertEqual(self.audio_controller.current_volume, 0.0)
+    
+    def test_pending_change_is_replaced(self):
+        """Test that a new level replaces an unwritten one instead of queueing."""
+        with self.audio_controller._condition:
+            # Hold the lock so the writer cannot start before both calls
+            self.audio_controller.set_volume(0.2)
+            self.audio_controller.set_volume(0.9)
+        self.audio_controller.flush(timeout=1.0)
+        self.assertEqual(self.backend.writes, [0.9])
+    
+    def test_increase_volume(self):
+        """Test increasing volume."""
+        self.audio_controller.increase_volume(0.2)
+        self.audio_controller.flush(timeout=1.0)
+        self.assertAlmostEqual(self.backend.writes[-1], 0.7)
+    
+    def test_decrease_volume(self):
+        """Test decreasing volume."""
+        self.audio_controller.decrease_volume(0.2)
+        self.audio_controller.flush(timeout=1.0)
+        self.assertAlmostEqual(self.backend.writes[-1], 0.3)
+    
+    def test_steps_accumulate_before_write(self):
+        """Test that consecutive steps build on the pending level."""
+        with self.audio_controller._condition:
+            self.audio_controller.increase_volume(0.1)
+            self.audio_controller.increase_volume(0.1)
+        self.audio_controller.flush(timeout=1.0)
+        self.assertAlmostEqual(self.backend.writes[-1], 0.7)
+
+
+class TestPycawAudioBackend(unittest.TestCase):
+    """Test cases for PycawAudioBackend class."""
+    
+    @patch('src.utils.audio.POINTER')
+    @patch('src.utils.audio.IAudioEndpointVolume')
+    @patch('src.utils.audio.AudioUtilities')
+    @patch('src.utils.audio.cast')
+    def setUp(self, mock_cast, mock_audio_utils, mock_interface, mock_pointer):
+        """Set up test fixtures."""
+        # Mock the volume interface
+        self.mock_volume = MagicMock()
+        self.mock_volume.GetMasterVolumeLevelScalar.return_value = 0.5
+        mock_cast.return_value = self.mock_volume
+        
+        # Mock COM, with no thread initialized yet
+        patcher = patch('src.utils.audio.comtypes')
+        self.mock_comtypes = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(PycawAudioBackend, '_com', threading.local())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        self.backend = PycawAudioBackend()
+    
+    def test_read_volume(self):
+        """Test reading the master volume."""
+        self.mock_volume.GetMasterVolumeLevelScalar.return_value = 0.75
+        self.assertEqual(self.backend.read_volume(), 0.75)
+    
+    def test_write_volume(self):
+        """Test writing the master volume."""
+        self.backend.write_volume(0.6)
+        self.mock_volume.SetMasterVolumeLevelScalar.assert_called_with(0.6, None)
+    
+    def test_com_initialized_per_thread(self):
+        """Test that COM is initialized once on each thread that uses the endpoint."""
+        self.backend.read_volume()
+        self.assertEqual(self.mock_comtypes.CoInitializeEx.call_count, 1)
+        controller = AudioController(self.backend)
+        controller.set_volume(0.3)
+        self.assertTrue(controller.flush(timeout=1.0))
+        self.assertEqual(self.mock_comtypes.CoInitializeEx.call_count, 2)
+
+
+class FailingBackend(AudioBackend):
+    """Backend whose tools are present but cannot read the volume."""
+    name = "pulse"
+    closed = False
+    
+    def read_volume(self):
+        raise subprocess.CalledProcessError(1, ["pactl", "get-sink-volume"])
+    
+    def close(self):
+        FailingBackend.closed = True
+
+
+class TestCreateAudioBackend(unittest.TestCase):
+    """Test cases for create_audio_backend function."""
+    
+    @patch('src.utils.audio.sys.platform', 'linux')
+    def test_auto_skips_unusable_backend(self):
+        """Test that auto selection moves on when a backend cannot read the volume."""
+        backends = {"pulse": FailingBackend, "alsa": MockAudioBackend}
+        with patch.dict('src.utils.audio.AUDIO_BACKENDS', backends):
+            backend = create_audio_backend("auto")
+        self.assertIsInstance(backend, MockAudioBackend)
+        self.assertTrue(FailingBackend.closed)
+    
+    @patch('src.utils.audio.sys.platform', 'linux')
+    def test_auto_falls_back_to_mock(self):
+        """Test that auto selection ends with the mock backend when nothing works."""
+        def unavailable():
+            raise OSError("amixer not found")
+        backends = {"pulse": FailingBackend, "alsa": unavailable}
+        with patch.dict('src.utils.audio.AUDIO_BACKENDS', backends):
+            self.assertIsInstance(create_audio_backend("auto"), MockAudioBackend)
+    
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected."""
+        with self.assertRaises(ValueError):
+            create_audio_backend("oss")
+
+
+if __name__ == '__main__':
+    unittest.main()
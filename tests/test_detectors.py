@@ -0,0 +1,69 @@
+"""
+Tests for running detectors in parallel on a shared frame.
+"""
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from src.pipeline.detectors import DetectorOrchestrator
+
+
+class DelayedDetector:
+    """Detector stand-in that takes a fixed time and records the order results are handled in."""
+    def __init__(self, name, delay, handled):
+        self.name = name
+        self.delay = delay
+        self.handled = handled
+        self.threads = set()
+
+    def detect(self, rgb_frame, timestamp=None):
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        return self.name, timestamp
+
+    def handle_result(self, frame, result, overlay=None, timestamp=None):
+        self.handled.append(self.name)
+        return frame, result
+
+
+class TestDetectorOrchestrator(unittest.TestCase):
+    """Test cases for DetectorOrchestrator class."""
+
+    def setUp(self):
+        """Set up a slow first detector and a fast second one."""
+        self.handled = []
+        self.detectors = {
+            "gesture": DelayedDetector("gesture", 0.05, self.handled),
+            "face": DelayedDetector("face", 0.0, self.handled)
+        }
+        self.orchestrator = DetectorOrchestrator(self.detectors)
+        self.addCleanup(self.orchestrator.shutdown)
+        self.rgb_frame = np.zeros((24, 32, 3), dtype=np.uint8)
+
+    def test_results_applied_in_detector_order(self):
+        """Test that results are applied in detector order, not in the order they finish."""
+        results = self.orchestrator.detect_rgb(self.rgb_frame, ["face", "gesture"], timestamp=2.0)
+        self.assertEqual(results, {"face": ("face", 2.0), "gesture": ("gesture", 2.0)})
+        _, outputs = self.orchestrator.apply(self.rgb_frame, results)
+        self.assertEqual(self.handled, ["gesture", "face"])
+        self.assertEqual(outputs["gesture"], ("gesture", 2.0))
+
+    def test_detectors_run_on_pool_threads(self):
+        """Test that detection runs off the caller's thread."""
+        self.orchestrator.detect_rgb(self.rgb_frame, ["gesture", "face"])
+        threads = self.detectors["gesture"].threads | self.detectors["face"].threads
+        self.assertNotIn(threading.current_thread().name, threads)
+
+    def test_failed_detector_skipped(self):
+        """Test that a failing detector gives no result and is not applied."""
+        self.detectors["face"].detect = lambda rgb_frame, timestamp=None: 1 / 0
+        results = self.orchestrator.detect_rgb(self.rgb_frame, ["gesture", "face"])
+        self.assertEqual(list(results), ["gesture"])
+        self.orchestrator.apply(self.rgb_frame, results)
+        self.assertEqual(self.handled, ["gesture"])
+
+
+if __name__ == '__main__':
+    unittest.main()
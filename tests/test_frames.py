@@ -0,0 +1,121 @@
+"""
+Tests for the pooled frame buffers and inference frame scaling.
+"""
+import unittest
+
+import numpy as np
+
+from src.pipeline.queues import LatestQueue
+from src.pipeline.sources import SyntheticSource
+from src.utils.frames import FramePool, FrameScaler, ResolutionGovernor
+
+
+class TestFramePool(unittest.TestCase):
+    """Test cases for FramePool class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.source = SyntheticSource(size=(64, 48), frames=20)
+        self.pool = FramePool(size=2, frame_scaler=FrameScaler((32, 24)))
+
+    def test_mirrored_and_converted(self):
+        """Test that pooled frames match the mirrored source frame and its RGB copy."""
+        expected = SyntheticSource(size=(64, 48), frames=1).read()[1][:, ::-1]
+        ret, buffer = self.pool.read(self.source)
+        self.assertTrue(ret)
+        np.testing.assert_array_equal(buffer.frame, expected)
+        rgb_frame = self.pool.to_rgb(buffer)
+        self.assertEqual(rgb_frame.shape, (24, 32, 3))
+        self.assertFalse(rgb_frame.flags.writeable)
+
+    def test_buffers_reused(self):
+        """Test that released buffers are reused instead of allocating new ones."""
+        seen = set()
+        for _ in range(10):
+            _, buffer = self.pool.read(self.source)
+            rgb_frame = self.pool.to_rgb(buffer)
+            seen.add((id(buffer.frame), id(rgb_frame)))
+            buffer.release()
+        self.assertEqual(self.pool.allocated, 2)
+        self.assertEqual(len(seen), 1)
+
+    def test_held_buffers_not_reused(self):
+        """Test that a buffer is only reused after its last reference is released."""
+        _, first = self.pool.read(self.source)
+        first.retain()
+        first.release()
+        _, second = self.pool.read(self.source)
+        self.assertIsNot(first.frame, second.frame)
+        self.pool.read(self.source)
+        self.assertEqual(self.pool.allocated, 3)
+        first.release()
+        with self.assertRaises(RuntimeError):
+            first.release()
+
+    def test_dropped_queue_items_released(self):
+        """Test that a drop-oldest queue releases the buffers it discards."""
+        queue = LatestQueue(1, on_drop=lambda buffer: buffer.release())
+        for _ in range(5):
+            queue.put(self.pool.read(self.source)[1])
+        self.assertEqual(self.pool.allocated, 2)
+        self.assertEqual(queue.dropped, 4)
+
+
+class TestFrameScaler(unittest.TestCase):
+    """Test cases for FrameScaler class."""
+
+    def test_aspect_ratio_kept(self):
+        """Test that frames are scaled to fit the resolution without changing their aspect ratio."""
+        scaler = FrameScaler((320, 320))
+        self.assertEqual(scaler.target_size((480, 640, 3)), (320, 240))
+        self.assertEqual(scaler.target_size((120, 160, 3)), (160, 120))
+
+    def test_small_frames_untouched(self):
+        """Test that frames already within the resolution are returned as they are."""
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        self.assertIs(FrameScaler((64, 48)).scale(frame), frame)
+        self.assertEqual(FrameScaler((16, 16)).scale(frame).shape, (12, 16, 3))
+
+
+class TestResolutionGovernor(unittest.TestCase):
+    """Test cases for ResolutionGovernor class."""
+
+    def setUp(self):
+        """Set up a 20 FPS (50 ms) governor that decides after every 5 samples."""
+        self.ladder = [(640, 480), (320, 240), (160, 120)]
+        self.governor = ResolutionGovernor(self.ladder, target_fps=20, settle_frames=5, smoothing=0.5)
+        self.scaler = FrameScaler(governor=self.governor)
+
+    def feed(self, seconds, count, key="inference"):
+        """Feed the same inference time several times; return how often the resolution changed."""
+        return sum(self.governor.update(seconds, key) for _ in range(count))
+
+    def test_steps_down_when_over_budget(self):
+        """Test that a slow detector steps the resolution down one rung per settle period."""
+        self.assertEqual(self.feed(0.08, 4), 0)
+        self.assertEqual(self.feed(0.08, 1), 1)
+        self.assertEqual(self.governor.resolution, (320, 240))
+        self.assertEqual(self.scaler.target_size((480, 640, 3)), (320, 240))
+        self.feed(0.08, 10)
+        self.assertEqual(self.governor.resolution, (160, 120))
+        self.assertEqual(self.feed(0.08, 5), 0)  # Already at the bottom
+
+    def test_steps_up_with_headroom(self):
+        """Test that the resolution only steps up when the predicted cost fits the budget with headroom."""
+        self.governor.index = 2
+        # 11 ms at 160x120 predicts 44 ms at 320x240: within budget, not within headroom
+        self.assertEqual(self.feed(0.011, 10), 0)
+        # 9 ms predicts 36 ms, below 80% of 50 ms
+        self.feed(0.009, 5)
+        self.assertEqual(self.governor.resolution, (320, 240))
+
+    def test_slowest_stage_decides(self):
+        """Test that one slow detector holds the resolution down despite a fast one."""
+        for _ in range(3):  # Samples of every stage count towards the settle period
+            self.governor.update(0.01, "face")
+            self.governor.update(0.09, "gesture")
+        self.assertEqual(self.governor.resolution, (320, 240))
+
+
+if __name__ == '__main__':
+    unittest.main()
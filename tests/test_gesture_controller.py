@@ -0,0 +1,230 @@
+"""
+Tests for the gesture controller's recognition modes and volume control.
+"""
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from mediapipe.tasks.python import vision
+from mediapipe.tasks.python.components.containers.category import Category
+from mediapipe.tasks.python.components.containers.landmark import NormalizedLandmark
+
+from src.controllers.gesture_controller import GestureController
+from src.config import PINCH_HOLD_TIME, VOLUME_UPDATE_INTERVAL
+from src.utils.actions import ActionDispatcher
+from src.utils.filters import OneEuroFilter
+from src.utils.metrics import metrics
+from src.utils.renderer import Overlay
+
+
+class TestStreamingModes(unittest.TestCase):
+    """Test cases for the VIDEO and LIVE_STREAM running modes."""
+
+    def setUp(self):
+        """Set up a live stream controller with a stand-in recognizer."""
+        self.controller = GestureController(None, running_mode="live_stream", inference=False,
+                                            dispatcher=ActionDispatcher(dry_run=True))
+        self.controller.recognizer = MagicMock()
+        self.rgb_frame = np.zeros((24, 32, 3), dtype=np.uint8)
+
+    def test_timestamps_strictly_increase(self):
+        """Test that repeated or backward frame times still give increasing timestamps."""
+        stamps = [self.controller._next_timestamp_ms(t) for t in (1.0, 1.0, 0.5, 2.0)]
+        self.assertEqual(stamps, [1000, 1001, 1002, 2000])
+
+    def test_live_stream_returns_cached_result(self):
+        """Test that a frame is queued and the newest delivered result returned without waiting."""
+        first = self.controller.detect(self.rgb_frame, timestamp=1.0)
+        self.assertEqual(first.hand_landmarks, [])
+        self.controller.recognizer.recognize_async.assert_called_once()
+        self.assertEqual(self.controller.recognizer.recognize_async.call_args.args[1], 1000)
+
+        delivered = vision.GestureRecognizerResult([], [], [[]], [])
+        self.controller._on_result(delivered, None, 1000)
+        self.assertIs(self.controller.detect(self.rgb_frame, timestamp=1.1), delivered)
+        self.controller.recognizer.recognize.assert_not_called()
+
+    def test_live_stream_result_handled_once(self):
+        """Test that a cached result returned for several frames is handled once, then only redrawn."""
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        points = [(0.4 + i / 100, 0.5) for i in range(21)]
+        delivered = hand_result(points)
+        self.controller._on_result(delivered, None, 1000)
+        with patch.object(self.controller.hand_tracker, "update",
+                          wraps=self.controller.hand_tracker.update) as update:
+            overlays = []
+            for timestamp in (1.0, 1.1):
+                overlays.append(Overlay())
+                result = self.controller.detect(self.rgb_frame, timestamp=timestamp)
+                self.controller.handle_result(frame, result, overlays[-1], timestamp)
+            self.assertEqual(update.call_count, 1)
+            self.assertEqual(overlays[0].texts, overlays[1].texts)
+            self.assertEqual(len(overlays[1].hands), 1)
+
+            self.controller._on_result(hand_result(points), None, 1100)
+            result = self.controller.detect(self.rgb_frame, timestamp=1.2)
+            self.controller.handle_result(frame, result, Overlay(), 1.2)
+            self.assertEqual(update.call_count, 2)
+
+    def test_unknown_mode(self):
+        """Test that an unknown running mode is rejected."""
+        with self.assertRaises(ValueError):
+            GestureController(None, running_mode="batch", inference=False)
+
+
+def hand_result(points, score=0.9):
+    """Build a one-hand recognition result with landmarks at the given (x, y) points."""
+    landmarks = [NormalizedLandmark(x=x, y=y, z=0.0) for x, y in points]
+    return vision.GestureRecognizerResult(
+        [[Category(score=score, category_name="Open_Palm")]],
+        [[Category(score=score, category_name="Right")]],
+        [landmarks], []
+    )
+
+
+class TestRoiTracking(unittest.TestCase):
+    """Test cases for recognizing on a crop around the last hand."""
+
+    def setUp(self):
+        """Set up an image mode controller with ROI tracking and a stand-in recognizer."""
+        self.controller = GestureController(None, running_mode="image", roi_tracking=True, num_hands=1,
+                                            inference=False, dispatcher=ActionDispatcher(dry_run=True))
+        self.controller.recognizer = MagicMock()
+        self.rgb_frame = np.zeros((100, 200, 3), dtype=np.uint8)
+
+    def test_roi_from_result(self):
+        """Test that the crop is a padded square around the hand, kept inside the frame."""
+        roi = self.controller._roi_from_result(hand_result([(0.4, 0.4), (0.5, 0.6)]), self.rgb_frame.shape)
+        # A 20 px hand padded to a 44 px square centred on (90, 50)
+        np.testing.assert_allclose(roi, (0.34, 0.28, 0.56, 0.72))
+        roi = self.controller._roi_from_result(hand_result([(0.95, 0.4), (1.0, 0.6)]), self.rgb_frame.shape)
+        self.assertAlmostEqual(roi[2], 1.0)
+        self.assertIsNone(self.controller._roi_from_result(vision.GestureRecognizerResult([], [], [], []),
+                                                           self.rgb_frame.shape))
+
+    def test_crop_landmarks_mapped_to_frame(self):
+        """Test that landmarks found in the crop are returned in full-frame coordinates."""
+        self.controller.recognizer.recognize.return_value = hand_result([(0.5, 0.5), (0.2, 0.8)])
+        result = self.controller._recognize_roi(self.rgb_frame, (0.25, 0.25, 0.75, 0.75))
+
+        crop = self.controller.recognizer.recognize.call_args.args[0]
+        self.assertEqual((crop.height, crop.width), (50, 100))
+        points = [(lm.x, lm.y) for lm in result.hand_landmarks[0]]
+        np.testing.assert_allclose(points, [(0.5, 0.5), (0.35, 0.65)])
+        self.assertEqual(result.gestures[0][0].category_name, "Open_Palm")
+        self.assertIsNotNone(self.controller.roi)
+
+    def test_hand_leaving_crop_falls_back(self):
+        """Test that a hand at the crop edge or found without confidence drops the crop."""
+        self.controller.recognizer.recognize.return_value = hand_result([(0.01, 0.5), (0.2, 0.8)])
+        self.assertIsNone(self.controller._recognize_roi(self.rgb_frame, (0.25, 0.25, 0.75, 0.75)))
+        self.assertIsNone(self.controller.roi)
+
+        self.controller.recognizer.recognize.return_value = hand_result([(0.5, 0.5)], score=0.3)
+        self.assertIsNone(self.controller._recognize_roi(self.rgb_frame, (0.25, 0.25, 0.75, 0.75)))
+
+    def test_detect_uses_crop_then_full_frame(self):
+        """Test that detect() tries the crop first and searches the whole frame when it fails."""
+        full = hand_result([(0.4, 0.4), (0.5, 0.6)])
+        self.controller.recognizer.recognize.return_value = full
+        self.assertIs(self.controller.detect(self.rgb_frame), full)
+        np.testing.assert_allclose(self.controller.roi, (0.34, 0.28, 0.56, 0.72))
+
+        self.controller.recognizer.recognize.side_effect = [vision.GestureRecognizerResult([], [], [], []), full]
+        self.assertIs(self.controller.detect(self.rgb_frame), full)
+        shapes = [(call.args[0].height, call.args[0].width)
+                  for call in self.controller.recognizer.recognize.call_args_list]
+        self.assertEqual(shapes, [(100, 200), (44, 44), (100, 200)])
+
+
+class TestProcessFrame(unittest.TestCase):
+    """Test cases for processing a whole frame."""
+
+    def test_timed_once_without_overlay(self):
+        """Test that a frame drawn immediately is recorded once in process_seconds."""
+        controller = GestureController(None, inference=False, dispatcher=ActionDispatcher(dry_run=True))
+        controller.recognizer = MagicMock()
+        controller.recognizer.recognize.return_value = vision.GestureRecognizerResult([], [], [], [])
+        with patch.object(metrics, "enabled", True):
+            before = metrics.summary("process_seconds", controller="gesture").get("count", 0)
+            frame, gesture_name = controller.process_frame(np.zeros((24, 32, 3), dtype=np.uint8))
+            after = metrics.summary("process_seconds", controller="gesture").get("count", 0)
+        self.assertEqual(after - before, 1)
+        self.assertIsNone(gesture_name)
+        self.assertEqual(frame.shape, (24, 32, 3))
+
+
+def hand_pose(spread, folded=True):
+    """
+    Build 21 landmarks of an upright hand with a palm 0.3 tall.
+
+    Args:
+        spread (float): Distance between the thumb and index fingertips
+        folded (bool): Fold the middle, ring and little fingers into the palm
+    """
+    points = [(0.5, 0.6)] * 21
+    points[0] = (0.5, 0.9)  # Wrist
+    points[9] = (0.5, 0.6)  # Middle finger knuckle
+    points[4] = (0.4, 0.4)  # Thumb tip
+    points[8] = (0.4 + spread, 0.4)  # Index fingertip
+    for tip, pip in ((12, 10), (16, 14), (20, 18)):
+        points[pip] = (0.5, 0.5)
+        points[tip] = (0.5, 0.7) if folded else (0.5, 0.3)
+    return [NormalizedLandmark(x=x, y=y, z=0.0) for x, y in points]
+
+
+class TestContinuousVolume(unittest.TestCase):
+    """Test cases for setting the volume with the thumb-index pinch."""
+
+    def setUp(self):
+        """Set up a continuous volume controller that records volume changes."""
+        self.dispatcher = MagicMock()
+        self.controller = GestureController(None, volume_mode="continuous", inference=False,
+                                            dispatcher=self.dispatcher)
+        # No smoothing, so levels follow the pinch exactly
+        self.volume_filter = OneEuroFilter(min_cutoff=1e6)
+
+    def test_distance_relative_to_palm(self):
+        """Test that the pinch distance, relative to the palm size, maps onto 0-100%."""
+        self.assertEqual(self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.03), 1.0), 0.0)
+        level = self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.2475), 2.0)
+        self.assertAlmostEqual(level, 0.5, places=3)
+        level = self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.6), 3.0)
+        self.assertAlmostEqual(level, 1.0, places=3)
+        self.assertEqual(len(self.dispatcher.set_volume.call_args_list), 3)
+
+    def test_rate_limit_and_deadband(self):
+        """Test that updates closer than the interval, or smaller than the deadband, are not sent."""
+        self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.2), 1.0)
+        self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.3), 1.0 + VOLUME_UPDATE_INTERVAL / 2)
+        self.assertEqual(self.dispatcher.set_volume.call_count, 1)
+        self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.3), 1.1)
+        self.controller._update_continuous_volume(self.volume_filter, hand_pose(0.3001), 1.2)
+        self.assertEqual(self.dispatcher.set_volume.call_count, 2)
+
+    def test_pinch_must_be_held(self):
+        """Test that the pinch pose only engages after being held, and a relaxed hand never does."""
+        relaxed = hand_pose(0.2, folded=False)
+        self.assertFalse(self.controller._pinch_engaged("None", relaxed, 0.0))
+        self.assertFalse(self.controller._pinch_engaged("None", relaxed, 5.0))
+
+        pinch = hand_pose(0.2)
+        self.assertFalse(self.controller._pinch_engaged("None", pinch, 10.0))
+        self.assertFalse(self.controller._pinch_engaged("None", pinch, 10.0 + PINCH_HOLD_TIME / 2))
+        self.assertTrue(self.controller._pinch_engaged("None", pinch, 10.0 + PINCH_HOLD_TIME))
+
+        # Letting go, or a canned gesture, starts the hold again
+        self.assertFalse(self.controller._pinch_engaged("Victory", pinch, 11.0))
+        self.assertFalse(self.controller._pinch_engaged("None", pinch, 11.1))
+
+    def test_volume_key_gestures_ignored(self):
+        """Test that gestures bound to volume keys do nothing in continuous mode."""
+        self.controller._execute_gesture_action("Pointing_Up")
+        self.controller._execute_gesture_action("Closed_Fist")
+        self.dispatcher.submit.assert_not_called()
+        self.controller._execute_gesture_action("Open_Palm")
+        self.dispatcher.submit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Tests for temporal gesture filtering.
+"""
+import unittest
+
+from src.utils.filters import GestureFilter, OneEuroFilter
+
+CATEGORIES = ("None", "Closed_Fist", "Open_Palm", "Pointing_Up",
+              "Thumb_Down", "Thumb_Up", "Victory", "ILoveYou")
+FRAME = 1 / 30
+
+
+def run(gesture_filter, frames, start=0.0):
+    """Feed (scores, count) runs at 30 FPS and return (time, fired) for each firing."""
+    fired = []
+    now = start
+    for scores, count in frames:
+        for _ in range(count):
+            result = gesture_filter.update(scores, now)
+            if result is not None:
+                fired.append((now, result))
+            now += FRAME
+    return fired
+
+
+class TestGestureFilter(unittest.TestCase):
+    """Test cases for GestureFilter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.filter = GestureFilter(CATEGORIES, cooldowns={"Open_Palm": 1.5},
+                                    default_cooldown=0.7, one_shot=("Open_Palm",))
+
+    def test_fires_quickly_on_stable_gesture(self):
+        """Test that a confident gesture fires within a few frames."""
+        fired = run(self.filter, [({"Thumb_Up": 0.9}, 10)])
+        self.assertEqual(fired[0][1], "Thumb_Up")
+        self.assertLess(fired[0][0], 0.2)
+
+    def test_ignores_single_frame_spikes(self):
+        """Test that isolated misclassifications never fire."""
+        noisy = [({"None": 0.8}, 5), ({"Victory": 0.9}, 1)] * 10
+        self.assertEqual(run(self.filter, noisy), [])
+
+    def test_fresh_filter_ignores_first_spike(self):
+        """Test that a single spike on a new or just reset filter does not fire."""
+        self.assertIsNone(self.filter.update({"Thumb_Up": 0.7, "None": 0.2}, 10.0))
+        self.assertIsNone(self.filter.active_name)
+        run(self.filter, [({"Thumb_Up": 0.9}, 10)])
+        self.filter.reset()
+        self.assertIsNone(self.filter.update({"Victory": 1.0}, 20.0))
+        self.assertEqual(run(self.filter, [({"None": 0.9}, 5)], start=20.0 + FRAME), [])
+
+    def test_hysteresis_holds_through_dips(self):
+        """Test that a score wobbling between the thresholds keeps the gesture active."""
+        run(self.filter, [({"Thumb_Up": 0.9}, 10)])
+        run(self.filter, [({"Thumb_Up": 0.5}, 1), ({"Thumb_Up": 0.7}, 1)] * 10, start=1.0)
+        self.assertEqual(self.filter.active_name, "Thumb_Up")
+        run(self.filter, [({"None": 0.9}, 10)], start=2.0)
+        self.assertIsNone(self.filter.active_name)
+
+    def test_repeats_after_cooldown(self):
+        """Test that a held gesture repeats at its cooldown."""
+        fired = run(self.filter, [({"Thumb_Down": 0.9}, 60)])
+        self.assertEqual(len(fired), 3)
+        self.assertGreaterEqual(fired[1][0] - fired[0][0], 0.7)
+
+    def test_one_shot_requires_release(self):
+        """Test that a held toggle fires once, and again only after a release and cooldown."""
+        fired = run(self.filter, [({"Open_Palm": 0.9}, 90)])
+        self.assertEqual(len(fired), 1)
+        fired = run(self.filter, [({"None": 0.9}, 15), ({"Open_Palm": 0.9}, 30)], start=3.0)
+        self.assertEqual([name for _, name in fired], ["Open_Palm"])
+
+    def test_one_shot_cooldown(self):
+        """Test that a quick release and repeat of a toggle does not fire twice."""
+        fired = run(self.filter, [({"Open_Palm": 0.9}, 10), ({"None": 0.9}, 5), ({"Open_Palm": 0.9}, 10)])
+        self.assertEqual(len(fired), 1)
+
+    def test_none_category_never_fires(self):
+        """Test that the ignored "None" category is never activated."""
+        self.assertEqual(run(self.filter, [({"None": 0.99}, 60)]), [])
+        self.assertIsNone(self.filter.active_name)
+
+    def test_no_hand_decays(self):
+        """Test that frames without a hand release the active gesture."""
+        run(self.filter, [({"Victory": 0.9}, 10)])
+        run(self.filter, [(None, 10)], start=1.0)
+        self.assertIsNone(self.filter.active_name)
+
+    def test_majority_vote(self):
+        """Test majority voting over the window."""
+        gesture_filter = GestureFilter(CATEGORIES, window=10, method="majority")
+        noisy = [({"Thumb_Up": 0.9}, 3), ({"None": 0.9}, 1)] * 5
+        fired = run(gesture_filter, noisy)
+        self.assertEqual({name for _, name in fired}, {"Thumb_Up"})
+        gesture_filter.reset()
+        self.assertEqual(run(gesture_filter, [({"Victory": 0.9}, 1), ({"None": 0.9}, 3)] * 5, start=2.0), [])
+
+    def test_invalid_settings(self):
+        """Test that bad settings are rejected."""
+        with self.assertRaises(ValueError):
+            GestureFilter(CATEGORIES, method="median")
+        with self.assertRaises(ValueError):
+            GestureFilter(CATEGORIES, enter_threshold=0.3, exit_threshold=0.5)
+
+
+class TestOneEuroFilter(unittest.TestCase):
+    """Test cases for OneEuroFilter class."""
+
+    def test_first_sample_passes_through(self):
+        """Test that the first sample, and the first after a reset, are returned unchanged."""
+        one_euro = OneEuroFilter(min_cutoff=1.0, beta=0.5)
+        self.assertEqual(one_euro(0.3, 0.0), 0.3)
+        one_euro(0.9, FRAME)
+        one_euro.reset()
+        self.assertEqual(one_euro(0.7, 1.0), 0.7)
+
+    def test_jitter_smoothed(self):
+        """Test that jitter around a still value is strongly attenuated."""
+        one_euro = OneEuroFilter(min_cutoff=1.0, beta=0.5)
+        outputs = [one_euro(0.5 + (0.02 if i % 2 else -0.02), i * FRAME) for i in range(60)]
+        self.assertLess(max(abs(value - 0.5) for value in outputs[30:]), 0.01)
+
+    def test_fast_moves_followed(self):
+        """Test that a higher beta follows a fast move with less lag."""
+        slow, fast = OneEuroFilter(min_cutoff=1.0, beta=0.0), OneEuroFilter(min_cutoff=1.0, beta=5.0)
+        for i in range(10):
+            slow(0.0, i * FRAME)
+            fast(0.0, i * FRAME)
+        for i in range(10, 15):
+            slow_value, fast_value = slow(1.0, i * FRAME), fast(1.0, i * FRAME)
+        self.assertGreater(fast_value, slow_value)
+        self.assertGreater(fast_value, 0.8)
+
+    def test_repeated_timestamp_ignored(self):
+        """Test that a sample without time progress leaves the output unchanged."""
+        one_euro = OneEuroFilter()
+        one_euro(0.2, 1.0)
+        self.assertEqual(one_euro(0.9, 1.0), 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
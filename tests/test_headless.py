@@ -0,0 +1,63 @@
+"""
+Tests for headless runs that write their results to stdout.
+"""
+import io
+import json
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+import main
+from src.pipeline.headless import HeadlessRunner
+from src.pipeline.sources import SyntheticSource
+from src.utils.actions import ActionDispatcher
+from src.utils.frames import FrameScaler
+
+
+class PlayDetector:
+    """Detector stand-in that requests an action on every frame."""
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    def process_frame(self, frame, overlay=None, timestamp=None, rgb_frame=None):
+        self.dispatcher.press("space", label="Toggle Play/Pause", source="gesture")
+        return frame, "Open_Palm"
+
+
+class HeadlessMediaController:
+    """MediaController stand-in that logs like the real one and runs headless."""
+    def __init__(self, mode=None, source=None, headless=False, output=None, metrics_enabled=False):
+        print("Audio control ready (0.00s)")
+        self.output = output
+        self.dispatcher = ActionDispatcher(dry_run=True)
+        self.frame_scaler = FrameScaler()
+        self.orchestrator = None
+        self.detectors = {"gesture": PlayDetector(self.dispatcher)}
+
+    def active_detectors(self):
+        return ["gesture"]
+
+    def run(self):
+        HeadlessRunner(self, self.output).run(SyntheticSource(size=(32, 24), frames=20))
+        self.dispatcher.stop()
+
+
+class TestHeadlessStdout(unittest.TestCase):
+    """Test cases for writing headless results to stdout."""
+
+    def test_stdout_holds_only_records(self):
+        """Test that every stdout line is a JSON record while status messages go to stderr."""
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with patch("main.MediaController", HeadlessMediaController), \
+                redirect_stdout(stdout), redirect_stderr(stderr):
+            main.run(["--headless", "--output", "-"])
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([record["frame"] for record in records], list(range(20)))
+        self.assertEqual(records[0]["actions"][0]["label"], "Toggle Play/Pause")
+        self.assertIn("Audio control ready", stderr.getvalue())
+        self.assertIn("Action: Toggle Play/Pause", stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for lazy controller construction.
+"""
+import threading
+import unittest
+
+from src.utils.lazy import LazyController
+
+
+class Controller:
+    """Minimal controller used as the lazily built object."""
+    def __init__(self):
+        self.calls = 0
+
+    def process(self):
+        self.calls += 1
+        return "processed"
+
+
+class TestLazyController(unittest.TestCase):
+    """Test cases for LazyController class."""
+
+    def test_not_built_until_used(self):
+        """Test that the factory only runs on first use, and only once."""
+        built = []
+        lazy = LazyController("test", lambda: built.append(1) or Controller())
+        self.assertFalse(lazy.ready)
+        self.assertEqual(built, [])
+
+        self.assertEqual(lazy.process(), "processed")
+        self.assertEqual(lazy.calls, 1)
+        lazy.process()
+        self.assertEqual(built, [1])
+        self.assertTrue(lazy.ready)
+
+    def test_warm_up_does_not_block(self):
+        """Test that warm_up() returns while the factory is still running."""
+        release = threading.Event()
+
+        def factory():
+            release.wait(timeout=5)
+            return Controller()
+
+        lazy = LazyController("test", factory)
+        lazy.warm_up()
+        self.assertTrue(lazy.loading)
+        self.assertFalse(lazy.ready)
+        release.set()
+        self.assertIsInstance(lazy.get(), Controller)
+        self.assertTrue(lazy.ready)
+        self.assertGreaterEqual(lazy.load_seconds, 0)
+
+    def test_concurrent_use_builds_once(self):
+        """Test that several threads asking at once share one build."""
+        built = []
+        lazy = LazyController("test", lambda: built.append(1) or Controller())
+        threads = [threading.Thread(target=lazy.get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(built, [1])
+
+    def test_failure(self):
+        """Test that a failing factory is reported and not retried."""
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            raise OSError("no microphone")
+
+        lazy = LazyController("voice", factory)
+        with self.assertRaises(RuntimeError):
+            lazy.get()
+        with self.assertRaises(RuntimeError):
+            lazy.process()
+        self.assertTrue(lazy.failed)
+        self.assertFalse(lazy.ready)
+        self.assertEqual(attempts, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for hot-path instrumentation and the Prometheus exporters.
+"""
+import os
+import tempfile
+import unittest
+import urllib.request
+
+from src.utils.metrics import Metrics, FpsMeter, MetricsFileExporter, MetricsServer
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for Metrics class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.metrics = Metrics(enabled=True, prefix="test_")
+
+    def test_disabled_records_nothing(self):
+        """Test that a disabled registry ignores every call."""
+        metrics = Metrics(enabled=False)
+
+        @metrics.timed("work_seconds")
+        def work():
+            return 42
+
+        self.assertEqual(work(), 42)
+        metrics.inc("frames_total")
+        metrics.set("fps", 30)
+        with metrics.timer("capture_seconds"):
+            pass
+        self.assertEqual(metrics.render_prometheus(), "\n")
+
+    def test_counters_and_gauges(self):
+        """Test that counters accumulate per label set and gauges keep the last value."""
+        self.metrics.inc("actions_total", source="gesture")
+        self.metrics.inc("actions_total", 2, source="gesture")
+        self.metrics.inc("actions_total", source="voice")
+        self.metrics.set("fps", 25.0)
+        self.metrics.set("fps", 30.0)
+        self.assertEqual(self.metrics.value("actions_total", source="gesture"), 3)
+        self.assertEqual(self.metrics.value("actions_total", source="voice"), 1)
+        self.assertEqual(self.metrics.value("fps"), 30.0)
+
+    def test_timed_decorator(self):
+        """Test that decorated calls are timed even when they raise."""
+        @self.metrics.timed("process_seconds", controller="face")
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            fail()
+        self.assertEqual(self.metrics.summary("process_seconds", controller="face")["count"], 1)
+
+    def test_prometheus_format(self):
+        """Test the text exposition format of each metric type."""
+        self.metrics.inc("frames_total")
+        self.metrics.set("fps", 30.0)
+        for ms in range(1, 101):
+            self.metrics.observe("inference_seconds", ms / 1000, detector="gesture")
+
+        lines = self.metrics.render_prometheus().splitlines()
+        self.assertIn("# TYPE test_frames_total counter", lines)
+        self.assertIn("test_frames_total 1", lines)
+        self.assertIn("# TYPE test_fps gauge", lines)
+        self.assertIn("# TYPE test_inference_seconds summary", lines)
+        self.assertIn('test_inference_seconds{detector="gesture",quantile="0.5"} 0.051000', lines)
+        self.assertIn('test_inference_seconds_count{detector="gesture"} 100', lines)
+        self.assertIn('test_inference_seconds_sum{detector="gesture"} 5.050000', lines)
+
+
+class TestFpsMeter(unittest.TestCase):
+    """Test cases for FpsMeter class."""
+
+    def test_steady_rate(self):
+        """Test that a steady frame interval gives its frame rate."""
+        meter = FpsMeter()
+        self.assertEqual(meter.fps, 0.0)
+        for i in range(10):
+            meter.tick(i / 20)
+        self.assertAlmostEqual(meter.fps, 20.0)
+
+
+class TestExporters(unittest.TestCase):
+    """Test cases for the file and HTTP exporters."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.metrics = Metrics(enabled=True, prefix="test_")
+        self.metrics.inc("frames_total", 7)
+
+    def test_file_exporter(self):
+        """Test that the file exporter writes the current metrics."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            MetricsFileExporter(self.metrics, path).write()
+            with open(path, encoding="utf-8") as f:
+                self.assertIn("test_frames_total 7", f.read())
+
+    def test_http_server(self):
+        """Test that /metrics is served and other paths are not."""
+        server = MetricsServer(self.metrics, host="127.0.0.1", port=0)
+        server.start()
+        try:
+            host, port = server.address
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                self.assertIn("test_frames_total 7", response.read().decode("utf-8"))
+            with self.assertRaises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://{host}:{port}/other", timeout=5)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Tests for the model registry and cache.
+"""
+import hashlib
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from src.utils.models import ModelCache, ModelSpec, read_model_bytes
+
+MODEL_BYTES = b"model weights" * 100
+
+
+class TestModelCache(unittest.TestCase):
+    """Test cases for ModelCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = self.temp_dir.name
+        self.source = os.path.join(root, "source.task")
+        with open(self.source, "wb") as f:
+            f.write(MODEL_BYTES)
+        self.cache_dir = os.path.join(root, "cache")
+        self.spec = ModelSpec("test", Path(self.source).as_uri(), "test.task", None)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    def cache(self, spec=None, legacy_paths=None):
+        return ModelCache(self.cache_dir, {"test": spec or self.spec}, legacy_paths or {})
+
+    def test_download_records_hash(self):
+        """Test that the first download is cached with a sidecar hash."""
+        path = self.cache().fetch("test")
+        self.assertEqual(read_model_bytes(path), MODEL_BYTES)
+        with open(path + ".sha256", encoding="utf-8") as f:
+            self.assertEqual(f.read(), hashlib.sha256(MODEL_BYTES).hexdigest())
+        self.assertEqual(sorted(os.listdir(self.cache_dir)), ["test.task", "test.task.sha256"])
+
+    def test_offline_start(self):
+        """Test that a verified cached model is used without downloading."""
+        cache = self.cache()
+        path = cache.fetch("test")
+        with patch.object(ModelCache, "_download", side_effect=OSError("offline")):
+            self.assertEqual(cache.fetch("test"), path)
+
+    def test_corrupt_cache_is_replaced(self):
+        """Test that a cached file that no longer matches its hash is downloaded again."""
+        cache = self.cache()
+        path = cache.fetch("test")
+        with open(path, "wb") as f:
+            f.write(b"truncated")
+        self.assertEqual(read_model_bytes(cache.fetch("test")), MODEL_BYTES)
+
+    def test_pinned_hash_mismatch(self):
+        """Test that a download not matching the pinned hash is rejected and removed."""
+        spec = self.spec._replace(sha256="0" * 64)
+        with self.assertRaises(ValueError):
+            self.cache(spec).fetch("test")
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_failed_download_leaves_nothing(self):
+        """Test that an interrupted download never leaves a file behind."""
+        with patch.object(ModelCache, "_download", side_effect=OSError("connection reset")):
+            with self.assertRaises(OSError):
+                self.cache().fetch("test")
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_legacy_file_adopted(self):
+        """Test that a model at the old relative path matching the pinned hash is copied instead of downloaded."""
+        spec = self.spec._replace(url="http://invalid.invalid/model.task",
+                                  sha256=hashlib.sha256(MODEL_BYTES).hexdigest())
+        path = self.cache(spec, {"test": self.source}).fetch("test")
+        self.assertEqual(read_model_bytes(path), MODEL_BYTES)
+
+    def test_legacy_file_needs_pinned_hash(self):
+        """Test that an unverifiable or truncated old model is never adopted."""
+        legacy = os.path.join(self.temp_dir.name, "legacy.task")
+        with open(legacy, "wb") as f:
+            f.write(MODEL_BYTES[:50])
+        path = self.cache(legacy_paths={"test": legacy}).fetch("test")
+        self.assertEqual(read_model_bytes(path), MODEL_BYTES)
+
+        os.remove(path)
+        spec = self.spec._replace(sha256=hashlib.sha256(MODEL_BYTES).hexdigest())
+        path = self.cache(spec, {"test": legacy}).fetch("test")
+        self.assertEqual(read_model_bytes(path), MODEL_BYTES)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+"""
+Tests for detector worker processes and the shared memory frame ring.
+"""
+import os
+import time
+import unittest
+
+import numpy as np
+from mediapipe.tasks.python import vision
+from mediapipe.tasks.python.components.containers.category import Category
+from mediapipe.tasks.python.components.containers.landmark import NormalizedLandmark
+
+from src.controllers.gesture_controller import GestureController
+from src.pipeline.processes import ProcessOrchestrator, SharedFrameRing, read_slot
+
+
+class MeanDetector:
+    """Worker-side stand-in that reports the mean of each frame channel."""
+    def detect(self, rgb_frame, timestamp=None):
+        if rgb_frame[0, 0, 0] == 255:
+            raise ValueError("bad frame")
+        if rgb_frame[0, 0, 0] == 1:
+            time.sleep(0.5)  # A frame that takes longer than the orchestrator waits
+        return rgb_frame.mean(axis=(0, 1)), timestamp
+
+    @staticmethod
+    def pack_result(result):
+        return result
+
+
+def create_mean_detector():
+    return MeanDetector()
+
+
+def create_broken_detector():
+    raise RuntimeError("no model")
+
+
+def create_exiting_detector():
+    os._exit(3)  # Dies without reporting, like a crash in native model code
+
+
+class MeanHandler:
+    """Main-side stand-in that records the results it is given."""
+    def unpack_result(self, packed):
+        return packed
+
+    def handle_result(self, frame, result, overlay=None, timestamp=None):
+        return frame, result
+
+
+class TestSharedFrameRing(unittest.TestCase):
+    """Test cases for SharedFrameRing class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.ring = SharedFrameRing(slots=2)
+        self.attached = {}
+        self.addCleanup(self.ring.close)
+
+    def tearDown(self):
+        for memory in self.attached.values():
+            memory.close()
+
+    def test_round_trip(self):
+        """Test that frames read back from their slots unchanged."""
+        frames = [np.full((24, 32, 3), i, dtype=np.uint8) for i in range(2)]
+        slots = [self.ring.write(frame, timestamp=i / 10) for i, frame in enumerate(frames)]
+        self.assertEqual([slot.offset for slot in slots], [0, frames[0].nbytes])
+        np.testing.assert_array_equal(read_slot(slots[0], self.attached), frames[0])
+        np.testing.assert_array_equal(read_slot(slots[1], self.attached), frames[1])
+        self.assertFalse(read_slot(slots[1], self.attached).flags.writeable)
+
+    def test_slots_reused_only_when_released(self):
+        """Test that a slot is not overwritten until every reader has released its frame."""
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        first = self.ring.write(frame, readers=2)
+        second = self.ring.write(frame)
+        self.assertIsNone(self.ring.write(frame))
+        self.ring.release(first.frame_id)
+        self.assertIsNone(self.ring.write(frame))
+        self.ring.release(first.frame_id)
+        self.ring.release(first.frame_id)  # Extra answers are ignored
+        third = self.ring.write(frame)
+        self.assertEqual(third.offset, first.offset)
+        self.assertEqual(self.ring.free, 0)
+        self.ring.release(second.frame_id)
+        self.assertEqual(self.ring.free, 1)
+
+    def test_grows_for_larger_frames(self):
+        """Test that a larger frame replaces the block once it is unused, and readers follow it."""
+        first = self.ring.write(np.zeros((24, 32, 3), dtype=np.uint8))
+        read_slot(first, self.attached)
+        larger = np.full((48, 64, 3), 7, dtype=np.uint8)
+        self.assertIsNone(self.ring.write(larger))
+        self.ring.release(first.frame_id)
+        second = self.ring.write(larger)
+        self.assertNotEqual(first.memory, second.memory)
+        np.testing.assert_array_equal(read_slot(second, self.attached), larger)
+        self.assertEqual(list(self.attached), [second.memory])
+
+
+class TestProcessOrchestrator(unittest.TestCase):
+    """Test cases for ProcessOrchestrator class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.orchestrator = ProcessOrchestrator(
+            {"mean": MeanHandler(), "broken": MeanHandler()},
+            {"mean": create_mean_detector, "broken": create_broken_detector},
+            timeout=10.0
+        )
+        self.addCleanup(self.orchestrator.shutdown)
+
+    def test_results_from_worker(self):
+        """Test that a worker detects on the shared frame and results are applied."""
+        self.orchestrator.wait_until_ready(["mean"])
+        rgb_frame = np.dstack([np.full((24, 32), value, dtype=np.uint8) for value in (10, 20, 30)])
+        results = self.orchestrator.detect_rgb(rgb_frame, ["mean"], timestamp=1.5)
+        means, timestamp = results["mean"]
+        np.testing.assert_allclose(means, [10, 20, 30])
+        self.assertEqual(timestamp, 1.5)
+        _, outputs = self.orchestrator.apply(rgb_frame, results)
+        self.assertIs(outputs["mean"], results["mean"])
+
+    def test_failures_are_skipped(self):
+        """Test that failed detectors and frames give no result without stopping the others."""
+        self.orchestrator.wait_until_ready(["mean", "broken"])
+        self.assertIsNotNone(self.orchestrator.workers["broken"].error)
+        bad_frame = np.full((24, 32, 3), 255, dtype=np.uint8)
+        self.assertEqual(self.orchestrator.detect_rgb(bad_frame, ["mean", "broken"]), {})
+        good_frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        self.assertEqual(list(self.orchestrator.detect_rgb(good_frame, ["mean", "broken"])), ["mean"])
+
+    def test_busy_worker_skipped(self):
+        """Test that a worker still busy with a timed-out frame gets no new frames until it answers."""
+        self.orchestrator.wait_until_ready(["mean"])
+        self.orchestrator.timeout = 0.1
+        slow_frame = np.ones((24, 32, 3), dtype=np.uint8)
+        self.assertEqual(self.orchestrator.detect_rgb(slow_frame, ["mean"]), {})
+        worker = self.orchestrator.workers["mean"]
+        self.assertTrue(worker.busy)
+        frame = np.zeros((24, 32, 3), dtype=np.uint8)
+        self.assertEqual(self.orchestrator.detect_rgb(frame, ["mean"]), {})
+        self.assertEqual(self.orchestrator.ring.free, self.orchestrator.ring.slots - 1)
+
+        # Once the late answer arrives its slot is free and frames flow again
+        time.sleep(0.6)
+        self.orchestrator.timeout = 10.0
+        self.assertIn("mean", self.orchestrator.detect_rgb(frame, ["mean"]))
+        self.assertFalse(worker.busy)
+        self.assertEqual(self.orchestrator.ring.free, self.orchestrator.ring.slots)
+
+    def test_dead_worker_releases_slots(self):
+        """Test that the frames held by a worker that died are released and it is skipped."""
+        self.orchestrator.wait_until_ready(["mean"])
+        self.orchestrator.timeout = 0.1
+        self.orchestrator.detect_rgb(np.ones((24, 32, 3), dtype=np.uint8), ["mean"])
+        worker = self.orchestrator.workers["mean"]
+        worker.process.terminate()
+        worker.process.join(5.0)
+        self.assertEqual(self.orchestrator.detect_rgb(np.zeros((24, 32, 3), dtype=np.uint8), ["mean"]), {})
+        self.assertIsNotNone(worker.error)
+        self.assertEqual(self.orchestrator.ring.free, self.orchestrator.ring.slots)
+
+    def test_worker_exiting_while_loading(self):
+        """Test that waiting for a worker that dies before reporting marks it failed instead of hanging."""
+        self.orchestrator.factories = dict(self.orchestrator.factories, mean=create_exiting_detector)
+        self.orchestrator.wait_until_ready(["mean"])
+        worker = self.orchestrator.workers["mean"]
+        self.assertFalse(worker.ready)
+        self.assertIn("code 3", worker.error)
+        self.assertEqual(self.orchestrator.detect_rgb(np.zeros((24, 32, 3), dtype=np.uint8), ["mean"]), {})
+
+    def test_not_ready_skipped(self):
+        """Test that a detector whose worker is still starting is skipped, not waited for."""
+        results = self.orchestrator.detect_rgb(np.zeros((24, 32, 3), dtype=np.uint8), ["mean"])
+        self.assertIn("mean", self.orchestrator.workers)
+        self.assertLessEqual(set(results), {"mean"})
+
+
+class TestGestureResultPacking(unittest.TestCase):
+    """Test cases for sending gesture results between processes."""
+
+    def test_round_trip(self):
+        """Test that a packed result unpacks to the same gestures and landmarks."""
+        landmarks = [[NormalizedLandmark(x=i / 21, y=0.5, z=-0.1) for i in range(21)] for _ in range(2)]
+        result = vision.GestureRecognizerResult(
+            [[Category(score=0.9, category_name="Open_Palm")], [Category(score=0.6, category_name="None")]],
+            [[Category(score=0.99, category_name="Left")], [Category(score=0.97, category_name="Right")]],
+            landmarks, []
+        )
+        unpacked = GestureController.unpack_result(GestureController.pack_result(result))
+        self.assertEqual(unpacked.gestures[1][0].category_name, "None")
+        self.assertAlmostEqual(unpacked.gestures[0][0].score, 0.9, places=6)
+        self.assertEqual(unpacked.handedness[1][0].category_name, "Right")
+        self.assertAlmostEqual(unpacked.hand_landmarks[1][20].x, 20 / 21, places=6)
+
+    def test_no_hands(self):
+        """Test that an empty result survives packing."""
+        packed = GestureController.pack_result(vision.GestureRecognizerResult([], [], [], []))
+        self.assertEqual(packed[2].shape, (0, 21, 3))
+        self.assertEqual(GestureController.unpack_result(packed).hand_landmarks, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for action profiles and voice phrase matching.
+"""
+import unittest
+
+from src.config import ACTION_PROFILES
+from src.utils.profiles import ActionMapper, Binding, PhraseTrie
+
+
+class TestPhraseTrie(unittest.TestCase):
+    """Test cases for PhraseTrie class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.trie = PhraseTrie()
+        for phrase in ("back", "previous", "previous track", "volume up"):
+            self.trie.add(phrase, phrase)
+
+    def test_whole_words_only(self):
+        """Test that phrases inside longer words are not matched."""
+        self.assertIsNone(self.trie.find("thanks for the feedback"))
+        self.assertEqual(self.trie.find("go back a bit"), "back")
+
+    def test_longest_phrase_wins(self):
+        """Test that the longest phrase starting at a word is preferred."""
+        self.assertEqual(self.trie.find("Previous track, please"), "previous track")
+        self.assertEqual(self.trie.find("previous one"), "previous")
+
+    def test_phrase_must_be_contiguous(self):
+        """Test that a phrase's words must follow each other."""
+        self.assertIsNone(self.trie.find("volume is up"))
+        self.assertEqual(self.trie.find("turn the volume up"), "volume up")
+
+    def test_empty_phrase(self):
+        """Test that a phrase without words is rejected."""
+        with self.assertRaises(ValueError):
+            self.trie.add(" ?! ", None)
+
+
+class TestActionMapper(unittest.TestCase):
+    """Test cases for ActionMapper class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mapper = ActionMapper(ACTION_PROFILES, "vlc")
+
+    def test_lookups(self):
+        """Test gesture, voice and face lookups in the active profile."""
+        self.assertEqual(self.mapper.gesture("Victory"), Binding("hotkey", ("shift", "s"), "Screenshot"))
+        self.assertIsNone(self.mapper.gesture("None"))
+        self.assertEqual(self.mapper.voice("turn the volume down").args, -0.2)
+        self.assertEqual(self.mapper.face("away").args, "space")
+
+    def test_switch_profiles(self):
+        """Test that switching profiles changes every binding and wraps around."""
+        self.assertEqual(self.mapper.next(), "mpv")
+        self.assertEqual(self.mapper.gesture("Swipe_Up").args, ">")
+        self.assertEqual(self.mapper.next(), "browser")
+        self.assertEqual(self.mapper.voice("pause").args, "k")
+        self.assertEqual(self.mapper.next(), "vlc")
+
+    def test_phrases_cover_every_profile(self):
+        """Test that the recognizer vocabulary holds the phrases of all profiles."""
+        phrases = self.mapper.phrases()
+        self.assertIn("next video", phrases)
+        self.assertIn("previous track", phrases)
+        self.assertEqual(len(phrases), len(set(phrases)))
+
+    def test_invalid_profiles(self):
+        """Test that unknown profiles, action kinds and face events are rejected."""
+        with self.assertRaises(ValueError):
+            ActionMapper(ACTION_PROFILES, "winamp")
+        with self.assertRaises(ValueError):
+            ActionMapper({"bad": {"gestures": {"Victory": ("click", "left", "Click")}}}, "bad")
+        with self.assertRaises(ValueError):
+            ActionMapper({"bad": {"face": {"asleep": ("press", "space", "Pause")}}}, "bad")
+
+
+if __name__ == '__main__':
+    unittest.main()
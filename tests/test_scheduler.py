@@ -0,0 +1,56 @@
+"""
+Tests for the adaptive detection scheduler.
+"""
+import unittest
+
+from src.utils.scheduler import DetectionScheduler
+
+
+class TestDetectionScheduler(unittest.TestCase):
+    """Test cases for DetectionScheduler class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.scheduler = DetectionScheduler(5, min_hz=1, boost_hz=15,
+                                            stable_after=5.0, boost_duration=1.0)
+    
+    def test_runs_first_frame(self):
+        """Test that the detector always runs before any result exists."""
+        self.assertTrue(self.scheduler.should_run(now=0.0))
+    
+    def test_boosted_after_change(self):
+        """Test that the rate is boosted right after the state changes."""
+        self.scheduler.record(True, now=0.0)
+        self.assertEqual(self.scheduler.rate(now=0.5), 15)
+        self.assertFalse(self.scheduler.should_run(now=0.05))
+        self.assertTrue(self.scheduler.should_run(now=0.07))
+    
+    def test_base_rate_when_settled(self):
+        """Test that the base rate applies after the boost window."""
+        self.scheduler.record(True, now=0.0)
+        self.scheduler.record(True, now=2.0)
+        self.assertEqual(self.scheduler.rate(now=2.0), 5)
+        self.assertFalse(self.scheduler.should_run(now=2.1))
+        self.assertTrue(self.scheduler.should_run(now=2.2))
+    
+    def test_backs_off_while_stable(self):
+        """Test that the rate decays towards min_hz while the state is stable."""
+        self.scheduler.record(True, now=0.0)
+        self.assertAlmostEqual(self.scheduler.rate(now=10.0), 2.5)
+        self.assertEqual(self.scheduler.rate(now=100.0), 1)
+    
+    def test_change_resets_backoff(self):
+        """Test that a state change restores the boosted rate."""
+        self.scheduler.record(True, now=0.0)
+        self.scheduler.record(False, now=60.0)
+        self.assertEqual(self.scheduler.rate(now=60.1), 15)
+    
+    def test_disabled_runs_every_frame(self):
+        """Test that a None base rate runs the detector on every call."""
+        scheduler = DetectionScheduler(None)
+        scheduler.record(True, now=0.0)
+        self.assertTrue(scheduler.should_run(now=0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
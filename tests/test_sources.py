@@ -0,0 +1,119 @@
+"""
+Tests for frame sources and the headless runner.
+"""
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import cv2
+import numpy as np
+
+from src.pipeline.headless import HeadlessRunner
+from src.pipeline.sources import ImageDirectorySource, SyntheticSource, open_source, open_sources
+from src.utils.actions import ActionDispatcher
+from src.utils.frames import FrameScaler
+
+
+def read_all(source):
+    """Read every frame of a source and return (frames, timestamps)."""
+    frames, timestamps = [], []
+    while source.isOpened():
+        ret, frame = source.read()
+        if not ret:
+            break
+        frames.append(frame)
+        timestamps.append(source.timestamp)
+    return frames, timestamps
+
+
+class TestFrameSources(unittest.TestCase):
+    """Test cases for the frame sources."""
+
+    def test_synthetic_frames(self):
+        """Test that synthetic frames have the requested size, count and media timestamps."""
+        frames, timestamps = read_all(SyntheticSource(size=(64, 48), frames=5, fps=10))
+        self.assertEqual(len(frames), 5)
+        self.assertEqual(frames[0].shape, (48, 64, 3))
+        self.assertEqual(timestamps, [0.0, 0.1, 0.2, 0.3, 0.4])
+        self.assertFalse(np.array_equal(frames[0], frames[1]))
+
+    def test_image_directory_in_name_order(self):
+        """Test that images are read in file name order and other files are skipped."""
+        with tempfile.TemporaryDirectory() as directory:
+            for i in (2, 0, 1):
+                cv2.imwrite(os.path.join(directory, f"frame_{i}.png"), np.full((4, 4, 3), i * 50, np.uint8))
+            open(os.path.join(directory, "notes.txt"), "w").close()
+
+            frames, timestamps = read_all(ImageDirectorySource(directory, fps=2))
+        self.assertEqual([int(frame[0, 0, 0]) for frame in frames], [0, 50, 100])
+        self.assertEqual(timestamps, [0.0, 0.5, 1.0])
+
+    def test_open_source(self):
+        """Test that source descriptions pick the right source type."""
+        self.assertIsInstance(open_source("synthetic"), SyntheticSource)
+        with tempfile.TemporaryDirectory() as directory:
+            self.assertIsInstance(open_source(directory), ImageDirectorySource)
+            with self.assertRaises(FileNotFoundError):
+                open_source(os.path.join(directory, "missing.mp4"))
+
+    def test_open_sources(self):
+        """Test that named sources are opened together and a missing one fails them all."""
+        with tempfile.TemporaryDirectory() as directory:
+            sources = open_sources({"hands": "synthetic", "room": directory})
+            self.assertEqual(list(sources), ["hands", "room"])
+            self.assertIsInstance(sources["room"], ImageDirectorySource)
+            with self.assertRaises(FileNotFoundError):
+                open_sources({"hands": "synthetic", "room": os.path.join(directory, "missing.mp4")})
+
+
+class TestHeadlessRunner(unittest.TestCase):
+    """Test cases for HeadlessRunner class."""
+
+    def setUp(self):
+        """Set up a media controller stand-in with one gesture detector."""
+        self.dispatcher = ActionDispatcher(dry_run=True)
+        self.gesture = MagicMock()
+        self.media = MagicMock(orchestrator=None, dispatcher=self.dispatcher,
+                               detectors={"gesture": self.gesture}, frame_scaler=FrameScaler())
+        self.media.active_detectors.return_value = ["gesture"]
+
+        def process_frame(frame, overlay, timestamp=None, rgb_frame=None):
+            if timestamp == 0.2:
+                self.dispatcher.press("space", label="Toggle Play/Pause", source="gesture")
+                return frame, "Open_Palm"
+            return frame, None
+        self.gesture.process_frame.side_effect = process_frame
+
+    def tearDown(self):
+        self.dispatcher.stop()
+
+    def test_writes_one_record_per_frame(self):
+        """Test that every frame is logged with its gesture and actions."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "run.jsonl")
+            summary = HeadlessRunner(self.media, path).run(SyntheticSource(size=(32, 24), frames=4, fps=10))
+            with open(path, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f]
+
+        self.assertEqual(summary["frames"], 4)
+        self.assertEqual([record["frame"] for record in records], [0, 1, 2, 3])
+        self.assertEqual(records[2]["gesture"], "Open_Palm")
+        self.assertEqual(records[2]["actions"], [
+            {"kind": "press", "args": "space", "label": "Toggle Play/Pause", "source": "gesture"}
+        ])
+        self.assertEqual(records[3]["actions"], [])
+        self.assertIsNone(records[0]["face"])
+
+    def test_dry_run_does_not_press_keys(self):
+        """Test that a dry-run dispatcher records actions without performing them."""
+        with patch('src.utils.actions.pyautogui') as mock_pyautogui:
+            HeadlessRunner(self.media).run(SyntheticSource(size=(32, 24), frames=4, fps=10))
+            self.dispatcher.stop()
+        mock_pyautogui.press.assert_not_called()
+        self.assertEqual([record.label for record in self.dispatcher.records], ["Toggle Play/Pause"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for speech recognition backends and their fallback.
+"""
+import json
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import speech_recognition as sr
+
+from src.utils.speech import (
+    GoogleSpeechBackend, SphinxSpeechBackend, VoskSpeechBackend, create_speech_backend
+)
+
+PHRASES = ["play", "volume up"]
+
+
+class TestCreateSpeechBackend(unittest.TestCase):
+    """Test cases for create_speech_backend function."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.recognizer = MagicMock()
+
+    def test_unknown_backend(self):
+        """Test that an unknown backend name is rejected rather than replaced."""
+        with self.assertRaises(ValueError):
+            create_speech_backend("whisper", self.recognizer, PHRASES)
+
+    def test_missing_package_falls_back(self):
+        """Test that a backend whose package is missing falls back to Google."""
+        with patch.dict(sys.modules, {"pocketsphinx": None}):
+            backend = create_speech_backend("sphinx", self.recognizer, PHRASES)
+        self.assertIsInstance(backend, GoogleSpeechBackend)
+        self.assertEqual(backend.phrases, PHRASES)
+
+    def test_missing_model_falls_back(self):
+        """Test that a Vosk backend without its model on disk falls back to Google."""
+        vosk = MagicMock()
+        with patch.dict(sys.modules, {"vosk": vosk}), patch("os.path.isdir", return_value=False):
+            backend = create_speech_backend("vosk", self.recognizer, PHRASES)
+        self.assertIsInstance(backend, GoogleSpeechBackend)
+        vosk.Model.assert_not_called()
+
+    def test_available_backend_used(self):
+        """Test that an available offline backend is used with the command grammar."""
+        with patch.dict(sys.modules, {"pocketsphinx": MagicMock()}):
+            backend = create_speech_backend("sphinx", self.recognizer, PHRASES)
+        self.assertIsInstance(backend, SphinxSpeechBackend)
+        self.assertEqual([phrase for phrase, _ in backend.keyword_entries], PHRASES)
+
+
+class TestSpeechBackends(unittest.TestCase):
+    """Test cases for transcribing with the offline backends."""
+
+    def test_sphinx_empty_is_unknown(self):
+        """Test that an empty keyword-spotting result counts as not understood."""
+        recognizer = MagicMock()
+        with patch.dict(sys.modules, {"pocketsphinx": MagicMock()}):
+            backend = SphinxSpeechBackend(recognizer, PHRASES)
+        recognizer.recognize_sphinx.return_value = "  Volume   Up "
+        self.assertEqual(backend.recognize(MagicMock()), "volume up")
+        recognizer.recognize_sphinx.return_value = "   "
+        with self.assertRaises(sr.UnknownValueError):
+            backend.recognize(MagicMock())
+
+    def test_vosk_grammar_and_unknown(self):
+        """Test that Vosk is given the phrases as its grammar and out-of-grammar speech is dropped."""
+        vosk = MagicMock()
+        with tempfile.TemporaryDirectory() as directory, patch.dict(sys.modules, {"vosk": vosk}):
+            backend = VoskSpeechBackend(MagicMock(), PHRASES, model_path=directory)
+            self.assertEqual(json.loads(backend.grammar), PHRASES + ["[unk]"])
+            vosk.KaldiRecognizer.return_value.FinalResult.return_value = '{"text": "[unk] play"}'
+            self.assertEqual(backend.recognize(MagicMock()), "play")
+            vosk.KaldiRecognizer.return_value.FinalResult.return_value = '{"text": "[unk]"}'
+            with self.assertRaises(sr.UnknownValueError):
+                backend.recognize(MagicMock())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Tests for latency statistics.
+"""
+import unittest
+
+from src.utils.stats import LatencyTracker, percentile
+
+
+class TestLatencyTracker(unittest.TestCase):
+    """Test cases for LatencyTracker class."""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles of a sorted list."""
+        values = list(range(101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summary(self):
+        """Test that summaries are reported in milliseconds."""
+        tracker = LatencyTracker()
+        for ms in range(1, 101):
+            tracker.record("gesture", ms / 1000)
+        summary = tracker.summary("gesture")
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["p50_ms"], 51)
+        self.assertAlmostEqual(summary["p99_ms"], 99)
+        self.assertAlmostEqual(summary["max_ms"], 100)
+        self.assertEqual(tracker.summary("face"), {})
+
+    def test_window(self):
+        """Test that only the most recent samples are kept, unless the window is None."""
+        bounded, unbounded = LatencyTracker(window=10), LatencyTracker(window=None)
+        for i in range(50):
+            bounded.record("key", i)
+            unbounded.record("key", i)
+        self.assertEqual(bounded.summary("key")["count"], 10)
+        self.assertEqual(unbounded.summary("key")["count"], 50)
+
+    def test_timer_and_clear(self):
+        """Test that timed blocks are recorded and clear() discards them."""
+        tracker = LatencyTracker()
+        with tracker.timer("draw"):
+            pass
+        self.assertEqual(tracker.summary("draw")["count"], 1)
+        tracker.clear()
+        self.assertEqual(tracker.report(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
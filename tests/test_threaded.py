@@ -0,0 +1,120 @@
+"""
+Tests for the threaded pipeline with several frame sources.
+"""
+import threading
+import time
+import unittest
+from argparse import Namespace
+from unittest.mock import MagicMock
+
+from benchmarks.bench_pipeline import bench_mode
+from src.pipeline.sources import SyntheticSource
+from src.pipeline.threaded import FramePacket, ThreadedPipeline
+from src.utils.frames import FrameScaler
+
+
+class ShapeDetector:
+    """Detector stand-in that records the shapes of the frames it sees."""
+    def __init__(self):
+        self.detected = set()
+        self.handled = set()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def detect(self, rgb_frame, timestamp=None):
+        with self.lock:
+            self.detected.add(rgb_frame.shape)
+        return rgb_frame.shape
+
+    def handle_result(self, frame, result, overlay=None, timestamp=None):
+        self.handled.add(frame.shape)
+        self.calls.append(timestamp)
+        overlay.add_text(str(result), (0, 0), 1, (0, 0, 0))
+        return frame, result
+
+
+class TestMultiSourcePipeline(unittest.TestCase):
+    """Test cases for routing detectors to their own sources."""
+
+    def setUp(self):
+        """Set up a media controller stand-in with two detectors on two sources."""
+        self.gesture = ShapeDetector()
+        self.face = ShapeDetector()
+        self.media = MagicMock(detectors={"gesture": self.gesture, "face": self.face},
+                               detector_sources={"gesture": "hands", "face": "room"},
+                               frame_scaler=FrameScaler(), governor=None)
+        self.media.is_active.side_effect = lambda name: name != "voice"
+        # Displaying takes a while, so the detector threads get to run
+        self.media.render.side_effect = lambda frame, overlay: time.sleep(0.005) or True
+
+    def test_detectors_follow_their_sources(self):
+        """Test that each detector only sees and draws on frames of its own source."""
+        sources = {
+            "hands": SyntheticSource(size=(64, 48), frames=40),
+            "room": SyntheticSource(size=(32, 24), frames=40)
+        }
+        ThreadedPipeline(self.media).run(sources)
+
+        self.assertEqual(self.gesture.detected, {(48, 64, 3)})
+        self.assertEqual(self.face.detected, {(24, 32, 3)})
+        self.assertLessEqual(self.gesture.handled, {(48, 64, 3)})
+        self.assertLessEqual(self.face.handled, {(24, 32, 3)})
+        shown = {call.args[0] for call in self.media.show_source.call_args_list}
+        self.assertLessEqual(shown, {"room"})
+        self.assertGreater(self.media.render.call_count, 0)
+
+    def test_single_source(self):
+        """Test that a single source feeds every detector, as before."""
+        ThreadedPipeline(self.media).run(SyntheticSource(size=(32, 24), frames=10))
+        self.assertEqual(self.gesture.detected, {(24, 32, 3)})
+        self.assertEqual(self.face.detected, {(24, 32, 3)})
+        self.media.show_source.assert_not_called()
+
+    def test_sources_have_own_scalers(self):
+        """Test that each source converts into its own buffer at the shared resolution."""
+        self.media.frame_scaler = FrameScaler((32, 24))
+        pipeline = ThreadedPipeline(self.media)
+        pipeline.run({
+            "hands": SyntheticSource(size=(64, 48), frames=5),
+            "room": SyntheticSource(size=(32, 24), frames=5)
+        })
+        scalers = [pool.frame_scaler for pool in pipeline.pools.values()]
+        self.assertIsNot(scalers[0], scalers[1])
+        self.assertNotIn(self.media.frame_scaler, scalers)
+        self.assertEqual([scaler.resolution for scaler in scalers], [(32, 24), (32, 24)])
+        self.assertEqual(self.gesture.detected, {(24, 32, 3)})
+
+    def test_results_applied_once(self):
+        """Test that a result is handled once, with its frame time, and only redrawn afterwards."""
+        pipeline = ThreadedPipeline(self.media)
+        pipeline.detector_sources = {"gesture": "hands", "face": "room"}
+        frame = MagicMock(shape=(48, 64, 3))
+        packets = [FramePacket("hands", seq, seq / 10, frame, None, None) for seq in (1, 2, 3)]
+
+        results = {"gesture": (1, 0.1, "open")}
+        _, first = pipeline._apply_results(packets[0], results)
+        _, second = pipeline._apply_results(packets[1], results)
+        self.assertEqual(self.gesture.calls, [0.1])
+        self.assertEqual(first.texts, second.texts)
+
+        results = {"gesture": (2, 0.2, "fist")}
+        _, third = pipeline._apply_results(packets[2], results)
+        self.assertEqual(self.gesture.calls, [0.1, 0.2])
+        self.assertEqual(third.texts[0][0], "fist")
+        self.assertEqual(self.face.calls, [])
+
+
+class TestThreadedBenchmark(unittest.TestCase):
+    """Test cases for running the threaded pipeline under the benchmark harness."""
+
+    def test_threaded_mode(self):
+        """Test that threaded mode runs with the timed scaler and reports its conversions."""
+        args = Namespace(display=False, warmup=0, allocations=False, frames=10, no_pool=False)
+        results = bench_mode("threaded", "synthetic", {"gesture": ShapeDetector()}, FrameScaler((32, 24)), args)
+        self.assertGreater(results["frames"], 0)
+        self.assertIn("convert", results["stages"])
+        self.assertIn("gesture", results["stages"])
+
+
+if __name__ == '__main__':
+    unittest.main()
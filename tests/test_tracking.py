@@ -0,0 +1,107 @@
+"""
+Tests for hand tracking IDs and control arbitration.
+"""
+import unittest
+
+import numpy as np
+
+from src.utils.tracking import HandTracker, HandArbiter, hand_boxes
+
+
+def square_hand(x, y, size):
+    """Return corner landmarks of a square hand centred on (x, y)."""
+    half = size / 2
+    return np.array([(x - half, y - half), (x + half, y + half)], dtype=np.float32)
+
+
+class TestHandTracker(unittest.TestCase):
+    """Test cases for HandTracker class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tracker = HandTracker(max_distance=0.2, timeout=0.5)
+
+    def update(self, hands, now):
+        return [track.id for track in self.tracker.update(*hand_boxes(hands), now)]
+
+    def test_hand_boxes(self):
+        """Test the centre and diagonal of each hand's bounding box."""
+        centers, sizes = hand_boxes([square_hand(0.5, 0.4, 0.3)])
+        np.testing.assert_allclose(centers, [[0.5, 0.4]], atol=1e-6)
+        np.testing.assert_allclose(sizes, [0.3 * np.sqrt(2)], atol=1e-6)
+
+    def test_ids_follow_hands(self):
+        """Test that IDs stay with their hands when the result order changes."""
+        left, right = square_hand(0.2, 0.5, 0.1), square_hand(0.8, 0.5, 0.1)
+        first = self.update([left, right], 0.0)
+        moved_left, moved_right = square_hand(0.25, 0.5, 0.1), square_hand(0.75, 0.5, 0.1)
+        self.assertEqual(self.update([moved_right, moved_left], 0.033), first[::-1])
+
+    def test_new_hand_far_away(self):
+        """Test that a hand too far from every track starts a new one."""
+        first = self.update([square_hand(0.2, 0.5, 0.1)], 0.0)
+        second = self.update([square_hand(0.8, 0.5, 0.1)], 0.033)
+        self.assertNotEqual(first, second)
+
+    def test_track_survives_brief_loss(self):
+        """Test that a hand missed for less than the timeout keeps its ID."""
+        first = self.update([square_hand(0.5, 0.5, 0.1)], 0.0)
+        self.update([], 0.2)
+        self.assertFalse(self.tracker.tracks[0].visible)
+        self.assertEqual(self.update([square_hand(0.5, 0.5, 0.1)], 0.4), first)
+        self.update([], 1.0)
+        self.assertEqual(self.tracker.tracks, [])
+
+
+class TestHandArbiter(unittest.TestCase):
+    """Test cases for HandArbiter class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.tracker = HandTracker(max_distance=0.2, timeout=0.5)
+
+    def select(self, arbiter, hands, now, faces=()):
+        self.tracker.update(*hand_boxes(hands), now)
+        track = arbiter.select(self.tracker.tracks, faces)
+        return None if track is None else track.index
+
+    def test_largest(self):
+        """Test that the biggest hand controls, with a margin before switching."""
+        arbiter = HandArbiter("largest", margin=1.25)
+        self.assertEqual(self.select(arbiter, [square_hand(0.2, 0.5, 0.1), square_hand(0.8, 0.5, 0.2)], 0.0), 1)
+        # Slightly larger is not enough to take over
+        self.assertEqual(self.select(arbiter, [square_hand(0.2, 0.5, 0.22), square_hand(0.8, 0.5, 0.2)], 0.1), 1)
+        self.assertEqual(self.select(arbiter, [square_hand(0.2, 0.5, 0.3), square_hand(0.8, 0.5, 0.2)], 0.2), 0)
+
+    def test_closest_face(self):
+        """Test that the hand nearest the largest face controls."""
+        arbiter = HandArbiter("closest_face")
+        hands = [square_hand(0.2, 0.5, 0.2), square_hand(0.7, 0.5, 0.1)]
+        faces = [(0.1, 0.1, 0.05, 0.05), (0.6, 0.2, 0.2, 0.2)]
+        self.assertEqual(self.select(arbiter, hands, 0.0, faces), 1)
+
+    def test_closest_face_without_faces(self):
+        """Test that "closest_face" falls back to the largest hand."""
+        arbiter = HandArbiter("closest_face")
+        hands = [square_hand(0.2, 0.5, 0.2), square_hand(0.7, 0.5, 0.1)]
+        self.assertEqual(self.select(arbiter, hands, 0.0), 0)
+
+    def test_designated(self):
+        """Test that the designated hand keeps control until it leaves."""
+        arbiter = HandArbiter("designated")
+        self.assertEqual(self.select(arbiter, [square_hand(0.2, 0.5, 0.1)], 0.0), 0)
+        bigger = square_hand(0.8, 0.5, 0.4)
+        self.assertEqual(self.select(arbiter, [bigger, square_hand(0.2, 0.5, 0.1)], 0.1), 1)
+        # Missed for a frame: nobody controls rather than the other hand
+        self.assertIsNone(self.select(arbiter, [bigger], 0.2))
+        # Gone for longer than the timeout: control passes on
+        self.assertEqual(self.select(arbiter, [bigger], 1.0), 0)
+
+    def test_unknown_policy(self):
+        """Test that an unknown policy is rejected."""
+        with self.assertRaises(ValueError):
+            HandArbiter("loudest")
+
+
+if __name__ == '__main__':
+    unittest.main()
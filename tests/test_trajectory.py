@@ -0,0 +1,104 @@
+"""
+Tests for trajectory-based swipe detection.
+"""
+import unittest
+
+import numpy as np
+
+from src.utils.trajectory import TrajectoryBuffer, SwipeDetector
+
+FRAME = 1 / 30
+
+
+def hand_at(x, y):
+    """Return 21 landmarks clustered around (x, y)."""
+    offsets = np.linspace(-0.05, 0.05, 21, dtype=np.float32)
+    return np.stack([x + offsets, y + offsets[::-1]], axis=1)
+
+
+def run(detector, path, start=0.0):
+    """Feed (x, y) hand centres at 30 FPS and return the swipes reported."""
+    swipes = []
+    for i, (x, y) in enumerate(path):
+        swipe = detector.update(hand_at(x, y), start + i * FRAME)
+        if swipe is not None:
+            swipes.append(swipe)
+    return swipes
+
+
+class TestTrajectoryBuffer(unittest.TestCase):
+    """Test cases for TrajectoryBuffer class."""
+
+    def test_recent_is_chronological_after_wrap(self):
+        """Test that recent() returns frames oldest first once the ring wraps."""
+        buffer = TrajectoryBuffer(length=4, landmarks=(0,))
+        for i in range(6):
+            buffer.add(hand_at(i / 10, 0.5), i * 1.0)
+        times, positions = buffer.recent(10.0, 5.0)
+        np.testing.assert_array_equal(times, [2.0, 3.0, 4.0, 5.0])
+        self.assertAlmostEqual(positions[-1, 0, 0], 0.45, places=5)
+
+    def test_recent_limits_duration(self):
+        """Test that only frames inside the window are returned."""
+        buffer = TrajectoryBuffer(length=8)
+        for i in range(8):
+            buffer.add(hand_at(0.5, 0.5), i * 0.1)
+        times, _ = buffer.recent(0.25, 0.7)
+        self.assertEqual(len(times), 3)
+
+
+class TestSwipeDetector(unittest.TestCase):
+    """Test cases for SwipeDetector class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.detector = SwipeDetector(window=0.3, min_distance=0.25, min_speed=1.0,
+                                      min_consistency=0.7, max_off_axis=0.5, cooldown=0.5)
+
+    def test_detects_each_direction(self):
+        """Test that fast straight motions are classified by direction."""
+        line = np.linspace(0.2, 0.8, 8)
+        cases = {
+            "Swipe_Right": [(x, 0.5) for x in line],
+            "Swipe_Left": [(x, 0.5) for x in line[::-1]],
+            "Swipe_Down": [(0.5, y) for y in line],
+            "Swipe_Up": [(0.5, y) for y in line[::-1]],
+        }
+        for expected, path in cases.items():
+            detector = SwipeDetector()
+            self.assertEqual(run(detector, path), [expected])
+
+    def test_slow_motion_is_not_a_swipe(self):
+        """Test that drifting slowly across the frame is ignored."""
+        path = [(x, 0.5) for x in np.linspace(0.2, 0.8, 90)]
+        self.assertEqual(run(self.detector, path), [])
+
+    def test_short_motion_is_not_a_swipe(self):
+        """Test that small fast movements are ignored."""
+        path = [(x, 0.5) for x in np.linspace(0.45, 0.55, 4)]
+        self.assertEqual(run(self.detector, path), [])
+
+    def test_diagonal_is_rejected(self):
+        """Test that motion without a dominant axis is ignored."""
+        path = [(v, v) for v in np.linspace(0.2, 0.8, 8)]
+        self.assertEqual(run(self.detector, path), [])
+
+    def test_jitter_is_rejected(self):
+        """Test that back-and-forth shaking with net travel is not a swipe."""
+        xs = [0.3, 0.7, 0.35, 0.75, 0.4, 0.8, 0.45, 0.85]
+        self.assertEqual(run(self.detector, [(x, 0.5) for x in xs]), [])
+
+    def test_one_swipe_per_motion(self):
+        """Test that a long swipe is reported once."""
+        path = [(x, 0.5) for x in np.linspace(0.1, 0.9, 12)]
+        self.assertEqual(run(self.detector, path), ["Swipe_Right"])
+
+    def test_reset_clears_history(self):
+        """Test that losing the hand breaks up a trajectory."""
+        run(self.detector, [(x, 0.5) for x in np.linspace(0.2, 0.5, 4)])
+        self.detector.reset()
+        self.assertEqual(run(self.detector, [(0.6, 0.5), (0.65, 0.5)], start=4 * FRAME), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
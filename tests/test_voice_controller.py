@@ -0,0 +1,78 @@
+"""
+Tests for the voice controller's background listener.
+"""
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import speech_recognition as sr
+
+from src.controllers.voice_controller import VoiceController
+from src.utils.actions import ActionDispatcher
+
+
+def listener_threads():
+    """Return the live voice listener threads."""
+    return [thread for thread in threading.enumerate() if thread.name == "voice-listen" and thread.is_alive()]
+
+
+class TestVoiceListener(unittest.TestCase):
+    """Test cases for starting, stopping and restarting the listener threads."""
+
+    def setUp(self):
+        """Set up a controller whose microphone and recognizer are stand-ins."""
+        with patch("src.controllers.voice_controller.sr.Microphone"):
+            self.voice = VoiceController(None, dispatcher=ActionDispatcher(dry_run=True))
+        self.voice.recognizer = MagicMock()
+        self.release = threading.Event()
+
+        def listen(source, timeout=None, phrase_time_limit=None):
+            # Blocks like a phrase being recorded, until released
+            self.release.wait(0.2)
+            raise sr.WaitTimeoutError()
+        self.voice.recognizer.listen.side_effect = listen
+        self.addCleanup(self.voice.stop)
+        self.addCleanup(self.release.set)  # Runs first, so stop() does not wait
+
+    def test_stop_waits_for_listen(self):
+        """Test that stop() outlasts a listen() that is still recording."""
+        self.voice.start()
+        time.sleep(0.05)
+        self.voice.stop()
+        self.assertFalse(self.voice.running)
+        self.assertEqual(listener_threads(), [])
+        self.assertEqual(self.voice._threads, {})
+
+    def test_blocked_listener_not_duplicated(self):
+        """Test that a listener still blocked after stop() is reused on restart, not doubled."""
+        def listen(source, timeout=None, phrase_time_limit=None):
+            self.release.wait()
+            raise sr.WaitTimeoutError()
+        self.voice.recognizer.listen.side_effect = listen
+        self.voice.start()
+        with patch("src.controllers.voice_controller.STOP_TIMEOUT", 0.05):
+            self.voice.stop()
+        self.assertIn("voice-listen", self.voice._threads)
+        self.voice.start()
+        self.assertTrue(self.voice.running)
+        self.assertEqual(len(listener_threads()), 1)
+
+    def test_dead_listener_restarted(self):
+        """Test that a listener that died is reported as not running and restarted after the delay."""
+        self.voice.mic.__enter__.side_effect = OSError("no microphone")
+        self.voice.start()
+        self.voice._threads["voice-listen"].join(1.0)
+        self.assertFalse(self.voice.running)
+
+        self.voice.mic.__enter__.side_effect = None
+        self.voice.listen_for_commands()  # Within the restart delay: not yet
+        self.assertFalse(self.voice._threads["voice-listen"].is_alive())
+        with patch("src.controllers.voice_controller.VOICE_RESTART_DELAY", 0.0):
+            self.voice.listen_for_commands()
+        self.assertTrue(self.voice.running)
+        self.assertEqual(len(listener_threads()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()